@@ -23,44 +23,32 @@ import folium
 from streamlit_folium import folium_static
 from folium.plugins import MarkerCluster
 
+import streamlit.components.v1 as components
+
+from zomato import anomalies, storage
+from zomato.density import CAMADAS, render_density_html
+from zomato.mapa import render_map_html
+from zomato.ui import load_aggregates, load_dataset, load_quality_report, load_storage
+from zomato.validation import QUARANTINE_PATH
+
 st.set_page_config(
     page_title='Home', 
     page_icon='🏠', 
     )   
 
-df = pd.read_csv('dataset/zomato.csv')
+# Banco SQLite (ZOMATO_DB): filtros e mapa viram consultas e o DataFrame não fica em memória;
+# None = tudo em pandas
+pool = load_storage()
+if pool is None:
+    # Dados tratados e agregações por país/cidade (calculados uma única vez)
+    df, agregados = load_dataset()
+else:
+    agregados = load_aggregates()
 
+# Colunas usadas pelo mapa e pela camada de densidade
+COLUNAS_MAPA = ['restaurant_name', 'city', 'latitude', 'longitude', 'aggregate_rating', 'votes']
 
 
-# Funções de tratamento
-def country_name(country_id):
-    """
-    Converte o código do país em seu nome correspondente.
-
-    Parameters
-    ----------
-    country_id : int
-        Código numérico que identifica o país.
-
-    Returns
-    -------
-    str
-        Nome do país correspondente ao código. Retorna "Unknown" se o código não for encontrado.
-
-    Examples
-    --------
-    >>> country_name(1)
-    'India'
-    >>> country_name(999)
-    'Unknown'
-    """
-    COUNTRIES = {
-        1: "India", 14: "Australia", 30: "Brazil", 37: "Canada", 94: "Indonesia", 
-        148: "New Zeland", 162: "Philippines", 166: "Qatar", 184: "Singapure", 
-        189: "South Africa", 191: "Sri Lanka", 208: "Turkey", 214: "United Arab Emirates", 
-        215: "England", 216: "United States of America",
-    }
-    return COUNTRIES.get(country_id, "Unknown")
 def format_number(num):
     """
     Formata um número para uma string mais legível usando sufixos K e M.
@@ -91,133 +79,6 @@ def format_number(num):
     else:
         return str(num)  # Retorna como string se for menor que mil
 
-def create_price_type(price_range):
-    """
-    Converte o valor numérico da faixa de preço em uma categoria descritiva.
-
-    Parameters
-    ----------
-    price_range : int
-        Valor numérico de 1 a 4 representando a faixa de preço.
-
-    Returns
-    -------
-    str
-        Categoria de preço correspondente:
-        - 1: "cheap"
-        - 2: "normal"
-        - 3: "expensive"
-        - 4: "gourmet"
-
-    Examples
-    --------
-    >>> create_price_type(1)
-    'cheap'
-    >>> create_price_type(4)
-    'gourmet'
-    """
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-def color_name(color_code):
-    """
-    Converte o código hexadecimal da cor em um nome descritivo.
-
-    Parameters
-    ----------
-    color_code : str
-        Código hexadecimal da cor (sem o #).
-
-    Returns
-    -------
-    str
-        Nome descritivo da cor. Retorna "unknown" se o código não for encontrado.
-
-    Examples
-    --------
-    >>> color_name("3F7E00")
-    'darkgreen'
-    >>> color_name("INVALID")
-    'unknown'
-    """
-    COLORS = {
-        "3F7E00": "darkgreen", "5BA829": "green", "9ACD32": "lightgreen",
-        "CDD614": "orange", "FFBA00": "red", "CBCBC8": "darkred", "FF7800": "darkred",
-    }
-    return COLORS.get(color_code, "unknown")
-
-def rename_columns(dataframe):
-    """
-    Renomeia as colunas do DataFrame para o formato snake_case.
-
-    Parameters
-    ----------
-    dataframe : pandas.DataFrame
-        DataFrame cujas colunas serão renomeadas.
-
-    Returns
-    -------
-    pandas.DataFrame
-        Cópia do DataFrame com as colunas renomeadas em formato snake_case.
-
-    Examples
-    --------
-    >>> df = pd.DataFrame(columns=['First Name', 'Last Name'])
-    >>> rename_columns(df).columns
-    Index(['first_name', 'last_name'], dtype='object')
-    """
-    df = dataframe.copy()
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
-    return df
-
-# 1. Remoção de duplicatas
-df = df.drop_duplicates(subset='Restaurant ID')
-
-
-# 2. Tratamento de valores nulos
-df['Cuisines'] = df['Cuisines'].fillna('Not Informed')
-df['Rating text'] = df['Rating text'].fillna('Not Rated')
-df['Average Cost for two'] = df['Average Cost for two'].fillna(0)
-
-# 3. Conversão de tipos
-df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
-df['Average Cost for two'] = pd.to_numeric(df['Average Cost for two'], errors='coerce')
-df['Aggregate rating'] = pd.to_numeric(df['Aggregate rating'], errors='coerce')
-
-# 4. Substituição de códigos por nomes
-df['country_name'] = df['Country Code'].apply(country_name)
-df['Price Category'] = df['Price range'].apply(create_price_type)
-df['Color Name'] = df['Rating color'].apply(color_name)
-
-
-# 5. Tratamento da coluna Cuisines (pegando apenas a primeira culinária)
-df['Cuisines'] = df['Cuisines'].apply(lambda x: str(x).split(',')[0].strip())
-
-# 6. Renomeação das colunas para snake_case
-df = rename_columns(df)
-# Após renomeação, ajuste o nome da coluna 'country_name' para 'country'
-df.rename(columns={'country_name': 'country'}, inplace=True)
-
-# 7. Remoção de colunas redundantes ou desnecessárias
-colunas_para_remover = ['country_code', 'rating_color', 'switch_to_order_menu']
-df = df.drop(columns=colunas_para_remover)
-
-# 8. Ordenação do dataframe
-df = df.sort_values('restaurant_id')
-
-# 9. Reset do índice
-df = df.reset_index(drop=True)
-
-# Verificação dos dados tratados
-#print("Shape após tratamento:", df.shape)
-#print("\nInformações do DataFrame:")
-#print(df.info())
 
 
 
@@ -239,7 +100,8 @@ st.sidebar.markdown('## Food Experience')
 st.sidebar.markdown("""---""")
 
 
-options = ['Todos os Países'] + sorted(df['country'].unique())
+paises = storage.distinct(pool, 'country') if pool is not None else sorted(df['country'].unique())
+options = ['Todos os Países'] + paises
 # Filtro de seleção de país na barra lateral
 paises_selectbox = st.sidebar.selectbox(
     'Selecione o País',
@@ -247,6 +109,29 @@ paises_selectbox = st.sidebar.selectbox(
     index=0  # "Todos" será a primeira opção
 )
 
+# Aviso de qualidade dos dados: linhas enviadas para a quarentena na carga
+relatorio_qualidade = load_quality_report()
+violacoes = relatorio_qualidade[relatorio_qualidade['violations'] > 0]
+if not violacoes.empty:
+    with st.sidebar.expander(f"⚠️ {int(violacoes['violations'].sum())} violações de qualidade"):
+        for regra in violacoes.itertuples():
+            st.markdown(f"- {regra.description}: **{regra.violations}**")
+        st.caption(f'Linhas inválidas gravadas em {QUARANTINE_PATH}')
+
+# Restaurantes marcados na carga por zomato.anomalies (ficam fora dos rankings das páginas)
+if pool is not None:
+    por_combinacao = storage.anomaly_counts(pool)
+    resumo_anomalias = anomalies.summarize(por_combinacao['anomaly_flags'], por_combinacao['restaurants'])
+    n_anomalias = storage.count_anomalies(pool)
+else:
+    resumo_anomalias = anomalies.summarize(df['anomaly_flags'])
+    n_anomalias = int((df['anomaly_flags'] > 0).sum())
+resumo_anomalias = resumo_anomalias[resumo_anomalias['restaurants'] > 0]
+if not resumo_anomalias.empty:
+    with st.sidebar.expander(f"🔎 {n_anomalias} restaurantes com anomalias"):
+        for anomalia in resumo_anomalias.itertuples():
+            st.markdown(f"- {anomalia.description}: **{anomalia.restaurants}**")
+
 
 
 #==================================
@@ -263,28 +148,28 @@ with st.container():
     
     with col1:
         #Restaurantes cadastrados.
-        restaurantes_cadastrados = int(df['restaurant_id'].nunique())
+        restaurantes_cadastrados = int(agregados['total']['restaurants'].iloc[0])
         col1.metric('Restaurantes', restaurantes_cadastrados)
         
     with col2:
         #Países cadastrados.
-        paises_cadastrados = int(df['country'].nunique())
+        paises_cadastrados = len(agregados['country'])
         col2.metric('Países', paises_cadastrados)
         
     with col3:
         #Cidades cadastradas.
-        cidades_cadastradas = int(df['city'].nunique())
+        cidades_cadastradas = int(agregados['total']['n_cities'].iloc[0])
         col3.metric('Cidades', cidades_cadastradas)
         
     with col4:
         # Avaliações feitas.
-        avaliacoes_zomato = df['votes'].sum()
+        avaliacoes_zomato = agregados['total']['votes_sum'].iloc[0]
         formatted_votes = format_number(int(avaliacoes_zomato))
         col4.metric('Avaliações', formatted_votes)
         
     with col5:
         #Tipos de culinárias.
-        tipos_culinarias = int(df['cuisines'].nunique())
+        tipos_culinarias = int(agregados['total']['n_cuisines'].iloc[0])
         col5.metric('Tipos de culinárias', tipos_culinarias)
         
 with st.container():
@@ -292,39 +177,61 @@ with st.container():
     st.markdown("### Country Maps")
     
     # Filtra o DataFrame para o país selecionado no selectbox
-    if paises_selectbox == 'Todos os Países':
+    if pool is not None:
+        # Só as linhas e colunas do mapa são lidas do banco
+        df_pais = storage.select(pool, COLUNAS_MAPA,
+                                 None if paises_selectbox == 'Todos os Países' else paises_selectbox)
+    elif paises_selectbox == 'Todos os Países':
         df_pais = df  # Se "Todos os Países" estiver selecionado, use todo o DataFrame
     else:
         df_pais = df.loc[df['country'] == paises_selectbox, :]
 
-    # Contagem de restaurantes no país selecionado
-    total_restaurantes = df_pais.shape[0]
-
-    # Inicia o mapa centralizado no país selecionado (média das localizações)
-    if not df_pais.empty:
-        central_location = [df_pais['latitude'].mean(), df_pais['longitude'].mean()]
-        mapa = folium.Map(location=central_location, zoom_start=5)
-
-        # Cluster de marcadores para agrupar os pontos dos restaurantes
-        marker_cluster = MarkerCluster().add_to(mapa)
-        
-        # Adiciona marcadores para cada restaurante no país filtrado
-        for index, location_info in df_pais.iterrows():
-            folium.Marker(
-                location=[location_info['latitude'], location_info['longitude']],
-                popup=f"{location_info['restaurant_name']}",
-                icon=folium.Icon(color='blue', icon='info-sign')
-            ).add_to(marker_cluster)
-
-        # Adiciona marcador central com a contagem de restaurantes no país
-        folium.Marker(
-            location=central_location,
-            popup=f"Total de restaurantes em {paises_selectbox}: {total_restaurantes}",
-            icon=folium.Icon(color='red', icon='info-sign')
-        ).add_to(mapa)
+    # Camada do mapa: restaurantes individuais ou densidade estimada por kernel
+    camada_mapa = st.radio(
+        'Camada do mapa',
+        options=['Restaurantes'] + list(CAMADAS),
+        format_func=lambda camada: CAMADAS.get(camada, camada),
+        horizontal=True,
+        key='home_camada'
+    )
+    if camada_mapa != 'Restaurantes' and not df_pais.empty:
+        col_banda, col_cidade = st.columns([1, 1])
+        with col_banda:
+            banda_km = st.slider('Largura de banda (km)', min_value=0.5, max_value=50.0, value=2.0, step=0.5,
+                                 key='home_banda')
+        with col_cidade:
+            cidade_mapa = st.selectbox(
+                'Cidade',
+                options=['Todas as Cidades'] + sorted(df_pais['city'].dropna().unique().tolist()),
+                key='home_cidade'
+            )
+        if cidade_mapa != 'Todas as Cidades':
+            df_pais = df_pais.loc[df_pais['city'] == cidade_mapa, :]
+
+    if not df_pais.empty and camada_mapa != 'Restaurantes':
+        # Densidade calculada em grade no servidor e sobreposta como imagem
+        html_mapa, relatorio_mapa = render_density_html(
+            df_pais, chave=(paises_selectbox, cidade_mapa), camada=camada_mapa, bandwidth_km=banda_km
+        )
+        components.html(html_mapa, width=1024, height=600)
+        legenda = (f"{relatorio_mapa['total']} restaurantes, kernel gaussiano de {banda_km:g} km. "
+                   f"Pico de {relatorio_mapa['max_density']:.2f} restaurantes por km².")
+        if 'rating_range' in relatorio_mapa:
+            nota_min, nota_max = relatorio_mapa['rating_range']
+            legenda += f" Nota média suavizada entre {nota_min:.2f} e {nota_max:.2f}."
+        st.caption(legenda)
+    # Mapa limitado a MAP_BUDGET_BYTES: acima do limite usa amostra estratificada ou hexágonos
+    elif not df_pais.empty:
+        html_mapa, relatorio_mapa = render_map_html(df_pais, paises_selectbox, chave=paises_selectbox)
 
         # Exibe o mapa no Streamlit
-        folium_static(mapa, width=1024, height=600)
+        components.html(html_mapa, width=1024, height=600)
+        if relatorio_mapa['mode'] == 'sample':
+            st.caption(f"Exibindo {relatorio_mapa['shown']} de {relatorio_mapa['total']} restaurantes "
+                       f"({relatorio_mapa['omitted']} omitidos): amostra por cidade com as maiores notas e mais votos.")
+        elif relatorio_mapa['mode'] == 'hexbin':
+            st.caption(f"{relatorio_mapa['total']} restaurantes agregados em hexágonos "
+                       f"(muitos pontos para exibir individualmente).")
     else:
         st.write("Nenhum restaurante encontrado para o país selecionado.")
 
@@ -0,0 +1,48 @@
+"""
+Benchmark da detecção de anomalias: custo por linha em tamanhos crescentes.
+
+Trata datasets sintéticos de 1/4, 1/2 e todas as linhas pedidas e mede
+`zomato.anomalies.flag_anomalies` em cada um. O custo por linha deve ficar
+estável (custo linear). As coordenadas das linhas sintéticas, que repetem as
+da amostra, ganham um deslocamento aleatório de até ~1 km; só uma fração
+`--duplicates` mantém a posição exata de outra linha da mesma marca, como
+anúncios duplicados.
+
+Uso:
+    python -m benchmarks.bench_anomalies --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from zomato import anomalies, parallel, pipeline, synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do maior dataset sintético')
+    parser.add_argument('--duplicates', type=float, default=0.01, help='fração de anúncios duplicados')
+    parser.add_argument('--seed', type=int, default=0, help='semente do deslocamento das coordenadas')
+    args = parser.parse_args()
+
+    amostra = pipeline.read_raw()
+    for linhas in (args.rows // 4, args.rows // 2, args.rows):
+        raw = synthetic.scale_raw(amostra, linhas, seed=args.seed)
+        rng = np.random.default_rng(args.seed)
+        deslocadas = rng.random(len(raw)) >= args.duplicates
+        for coluna in ['Latitude', 'Longitude']:
+            raw.loc[deslocadas, coluna] += rng.uniform(-1e-2, 1e-2, size=int(deslocadas.sum()))
+        df, _ = parallel.clean_and_aggregate(raw)
+
+        inicio = time.perf_counter()
+        flags = anomalies.flag_anomalies(df)
+        segundos = time.perf_counter() - inicio
+
+        resumo = anomalies.summarize(flags)['restaurants']
+        print(f'{len(df):>10,} linhas: {segundos:6.2f}s ({segundos / len(df) * 1e9:5.0f} ns por linha) | '
+              + ', '.join(f'{nome} {quantidade:,}' for nome, quantidade in resumo.items()))
+
+
+if __name__ == '__main__':
+    main()
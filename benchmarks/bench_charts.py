@@ -0,0 +1,80 @@
+"""
+Benchmark da construção de figuras: Plotly Express + update_* x zomato.charts.
+
+Monta o mesmo gráfico de barras das páginas (top 6 países) repetidas vezes
+com o código antigo (`px.bar` seguido de `update_traces`/`update_layout`) e
+com `zomato.charts.bar_chart`, e confere que as propriedades visuais das
+duas figuras coincidem.
+
+Uso:
+    python -m benchmarks.bench_charts --repeat 200
+"""
+import argparse
+import time
+
+import plotly.express as px
+
+from zomato import charts, parallel
+
+
+def figura_antiga(dados):
+    """Reproduz o bloco copiado nas páginas antes de zomato.charts."""
+    fig = px.bar(dados, x='País', y='Quantidade de Restaurantes', text='Quantidade de Restaurantes',
+                 title='Quantidade de Restaurantes Registrados por País')
+    fig.update_traces(marker_color='blue', marker_line_color='black', marker_line_width=1.5,
+                      textposition='outside')
+    fig.update_layout(
+        plot_bgcolor='rgb(22,31,44)',
+        paper_bgcolor='rgb(22,31,44)',
+        font=dict(color='white'),
+        title_font=dict(size=18, color='white', family="Arial"),
+        xaxis=dict(title='', color='white', showgrid=False),
+        yaxis=dict(title='', color='white', showgrid=False)
+    )
+    return fig
+
+
+def figura_nova(dados):
+    return charts.bar_chart(dados, x='País', y='Quantidade de Restaurantes',
+                            text='Quantidade de Restaurantes',
+                            title='Quantidade de Restaurantes Registrados por País')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200, help='figuras montadas por medição')
+    args = parser.parse_args()
+
+    _, agregados, _ = parallel.load_data(validate=False)
+    dados = agregados['country']['restaurants'].reset_index()
+    dados.columns = ['País', 'Quantidade de Restaurantes']
+    dados = dados.sort_values('Quantidade de Restaurantes', ascending=False).head(6)
+
+    tempos = {}
+    for nome, funcao in [('px + update_*', figura_antiga), ('zomato.charts', figura_nova)]:
+        inicio = time.perf_counter()
+        for _ in range(args.repeat):
+            # to_dict() é o que o st.plotly_chart faz com a figura
+            funcao(dados).to_dict()
+        tempos[nome] = (time.perf_counter() - inicio) / args.repeat * 1000
+        print(f'{nome:15s} {tempos[nome]:7.2f} ms por figura')
+    print(f"speedup: {tempos['px + update_*'] / tempos['zomato.charts']:.1f}x")
+
+    antiga, nova = figura_antiga(dados).to_dict(), figura_nova(dados).to_dict()
+    propriedades = [
+        ('plot_bgcolor',), ('paper_bgcolor',), ('font', 'color'), ('title', 'text'),
+        ('title', 'font', 'size'), ('xaxis', 'showgrid'), ('yaxis', 'showgrid'),
+    ]
+    for caminho in propriedades:
+        a, b = antiga['layout'], nova['layout']
+        for chave in caminho:
+            a, b = a.get(chave), b.get(chave)
+        assert a == b, (caminho, a, b)
+    assert list(antiga['data'][0]['y']) == list(nova['data'][0]['y'])
+    for chave in ('color', 'line'):
+        assert antiga['data'][0]['marker'][chave] == nova['data'][0]['marker'][chave]
+    print('visual idêntico: sim')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark das distribuições por buckets contra filtro + quantil do pandas.
+
+Trata um dataset sintético com o número de linhas pedido, monta as
+contagens de `zomato.distributions` e, para combinações aleatórias de
+filtros (países e faixas de preço), compara o tempo e o resultado de:
+- filtrar o DataFrame e calcular mediana e p90 com o pandas
+- somar as contagens dos grupos e ler os quantis dos buckets
+
+O erro relativo dos quantis deve ficar abaixo de sqrt(GAMMA) - 1 nas
+métricas com buckets logarítmicos e ser zero na nota.
+
+Uso:
+    python -m benchmarks.bench_distributions --rows 1000000 --queries 50
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from zomato import distributions, parallel, pipeline, synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--queries', type=int, default=50, help='combinações de filtros testadas')
+    parser.add_argument('--seed', type=int, default=0, help='semente dos filtros')
+    args = parser.parse_args()
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    df, _ = parallel.clean_and_aggregate(raw)
+
+    inicio = time.perf_counter()
+    dist = distributions.build_distributions(df)
+    montagem = time.perf_counter() - inicio
+
+    rng = random.Random(args.seed)
+    paises = sorted(df['country'].unique())
+    tempos = {'pandas': 0.0, 'buckets': 0.0}
+    erros = {metrica: 0.0 for metrica in distributions.METRICAS}
+    for _ in range(args.queries):
+        filtro_paises = rng.sample(paises, k=rng.randint(1, 4))
+        filtro_faixas = rng.sample(distributions.PRICE_CATEGORIES, k=rng.randint(1, 4))
+        for metrica in distributions.METRICAS:
+            inicio = time.perf_counter()
+            filtrado = df.loc[df['country'].isin(filtro_paises)
+                              & df['price_category'].isin(filtro_faixas), metrica]
+            exatos = filtrado.quantile([0.5, 0.9], interpolation='lower').to_numpy()
+            tempos['pandas'] += time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            selecao = distributions.select_groups(dist, filtro_paises, None, filtro_faixas)
+            contagens = distributions.histogram(dist, metrica, selecao)
+            valores = dist[metrica]['values']
+            aproximados = np.array([distributions.quantile(contagens, valores, q) for q in (0.5, 0.9)])
+            tempos['buckets'] += time.perf_counter() - inicio
+
+            if len(filtrado):
+                relativo = np.abs(aproximados - exatos) / np.maximum(np.abs(exatos), 1)
+                erros[metrica] = max(erros[metrica], float(relativo.max()))
+
+    consultas = args.queries * len(distributions.METRICAS)
+    print(f'Linhas: {args.rows:,} | grupos: {len(dist["groups"]):,} | montagem {montagem:.2f}s')
+    for nome, segundos in tempos.items():
+        print(f'{nome:8s} {segundos / consultas * 1000:8.2f} ms por consulta')
+    print(f'speedup: {tempos["pandas"] / tempos["buckets"]:.1f}x')
+    for metrica, erro in erros.items():
+        print(f'erro relativo máximo {metrica:22s} {erro * 100:6.2f}%')
+
+
+if __name__ == '__main__':
+    main()
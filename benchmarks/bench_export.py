@@ -0,0 +1,68 @@
+"""
+Benchmark de memória da exportação em blocos contra a exportação direta.
+
+Trata um dataset sintético com o número de linhas pedido e exporta todas
+as linhas ("Todos os Países") de duas formas, medindo o tempo e o pico de
+memória alocada (`tracemalloc`):
+- direta: `df.iloc[posicoes][colunas].to_csv(...)` / `.to_parquet(...)`
+- em blocos: `zomato.export.export`
+
+Uso:
+    python -m benchmarks.bench_export --rows 1000000 --format csv parquet
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from zomato import export, parallel, pipeline, synthetic
+
+
+def _medir(funcao):
+    """Executa `funcao` e retorna (segundos, pico de memória em MB)."""
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--format', nargs='+', default=['csv', 'parquet'], choices=list(export.FORMATOS),
+                        help='formatos medidos')
+    args = parser.parse_args()
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    df, _ = parallel.clean_and_aggregate(raw)
+    del raw
+    posicoes = export.filter_positions(df)
+    colunas = export.EXPORT_COLUMNS
+
+    print(f'Linhas exportadas: {len(posicoes):,}')
+    with tempfile.TemporaryDirectory() as pasta:
+        for formato in args.format:
+            destino = os.path.join(pasta, f'saida.{formato}')
+
+            def direta():
+                recorte = df.iloc[posicoes][colunas]
+                if formato == 'csv':
+                    recorte.to_csv(destino, index=False)
+                elif formato == 'parquet':
+                    recorte.to_parquet(destino, index=False)
+                else:
+                    recorte.to_excel(destino, index=False)
+
+            for nome, funcao in (('direta', direta),
+                                 ('em blocos', lambda: export.export(df, posicoes, formato, destino))):
+                segundos, pico = _medir(funcao)
+                tamanho = os.path.getsize(destino) / 1024 ** 2
+                print(f'{formato:8s} {nome:10s} {segundos:7.2f}s  pico {pico:8.1f} MB  arquivo {tamanho:7.1f} MB')
+
+
+if __name__ == '__main__':
+    main()
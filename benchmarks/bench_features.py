@@ -0,0 +1,52 @@
+"""
+Benchmark da matriz de características por país: montagem e comparação.
+
+Para datasets sintéticos de 1/4, 1/2 e todas as linhas pedidas, mede a
+montagem da matriz (`zomato.features.build_country_features`, custo linear,
+feita uma vez na carga) e o tempo médio de uma comparação
+(`zomato.features.compare_countries` com todos os grupos) para seleções
+sorteadas de países. A comparação só fatia a matriz, então o tempo deve
+ficar igual em todos os tamanhos.
+
+Uso:
+    python -m benchmarks.bench_features --rows 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from zomato import features, parallel, pipeline, synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do maior dataset sintético')
+    parser.add_argument('--selections', type=int, default=200, help='seleções de países sorteadas')
+    parser.add_argument('--seed', type=int, default=0, help='semente das seleções')
+    args = parser.parse_args()
+
+    amostra = pipeline.read_raw()
+    for linhas in (args.rows // 4, args.rows // 2, args.rows):
+        df, _ = parallel.clean_and_aggregate(synthetic.scale_raw(amostra, linhas, seed=args.seed))
+
+        inicio = time.perf_counter()
+        caracteristicas = features.build_country_features(df)
+        montagem = time.perf_counter() - inicio
+
+        paises = caracteristicas['matrix'].index.to_numpy()
+        rng = np.random.default_rng(args.seed)
+        selecoes = [list(rng.choice(paises, size=rng.integers(1, len(paises) + 1), replace=False))
+                    for _ in range(args.selections)]
+        inicio = time.perf_counter()
+        for selecao in selecoes:
+            for grupo in features.GRUPOS:
+                features.compare_countries(caracteristicas, selecao, grupo)
+        comparacao = (time.perf_counter() - inicio) / len(selecoes)
+
+        print(f'{len(df):>10,} linhas: montagem {montagem:6.2f}s | '
+              f'comparação {comparacao * 1e3:6.2f} ms por seleção')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark do pipeline de tratamento: modo de referência x modo paralelo.
+
+Gera um dataset sintético com o número de linhas pedido, executa
+`zomato.pipeline.clean_data` (referência) e `zomato.parallel.clean_and_aggregate`
+com 1 e N processos, e confere se os resultados são idênticos.
+
+Também mede, separadamente, a etapa que sempre roda no processo principal
+(`zomato.pipeline.finalize`: ordenação, marcas e anomalias) e mostra o
+speedup máximo possível com N processos para a parte restante (lei de
+Amdahl). Com mais processos que núcleos (`os.cpu_count()`), o modo paralelo
+só acrescenta o custo de criar os processos e copiar as partições. O pool
+é usado mesmo abaixo de `zomato.parallel.MIN_PARALLEL_ROWS`, para medir se
+o limite está bem ajustado para a máquina.
+
+Uso:
+    python -m benchmarks.bench_pipeline --rows 2000000 --workers 8
+"""
+import argparse
+import os
+import time
+
+from zomato import parallel, pipeline, synthetic
+
+
+def cronometrar(funcao, *args, **kwargs):
+    """Executa `funcao` e retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='processos do modo paralelo')
+    args = parser.parse_args()
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    print(f'Linhas: {len(raw):,} | processos: {args.workers}')
+
+    referencia, t_ref = cronometrar(pipeline.clean_data, raw.copy())
+    (serial, agregados_serial), t_serial = cronometrar(parallel.clean_and_aggregate, raw, workers=1)
+    (paralelo, agregados_paralelo), t_paralelo = cronometrar(
+        parallel.clean_and_aggregate, raw, workers=args.workers, min_rows=0)
+
+    # Etapa serial: a mesma chamada de `clean_and_aggregate` sobre as partições já tratadas
+    _, t_finalize = cronometrar(pipeline.finalize, serial.drop(columns=['brand_id', 'anomaly_flags']))
+    fracao_serial = min(t_finalize / t_serial, 1.0)
+    limite = 1 / (fracao_serial + (1 - fracao_serial) / args.workers)
+
+    print(f'referência (clean_data):       {t_ref:8.2f}s')
+    print(f'particionado, 1 processo:      {t_serial:8.2f}s')
+    print(f'  etapa serial (finalize):     {t_finalize:8.2f}s  ({fracao_serial:.0%} do total)')
+    print(f'particionado, {args.workers:2d} processos:    {t_paralelo:8.2f}s  '
+          f'(speedup {t_serial / t_paralelo:.1f}x, máximo {limite:.1f}x)')
+    if len(raw) < parallel.MIN_PARALLEL_ROWS:
+        print(f'abaixo de {parallel.MIN_PARALLEL_ROWS:,} linhas o dashboard usa um processo só')
+    if args.workers > (os.cpu_count() or 1):
+        print(f'aviso: {args.workers} processos para {os.cpu_count()} núcleos; o speedup não é representativo')
+
+    iguais = referencia.equals(serial) and serial.equals(paralelo)
+    iguais = iguais and all(agregados_serial[n].equals(agregados_paralelo[n]) for n in parallel.NIVEIS)
+    print('resultados idênticos:', 'sim' if iguais else 'NÃO')
+    if not iguais:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark do pré-cálculo dos restaurantes semelhantes.
+
+Trata um dataset sintético com o número de linhas pedido e mede o tempo de
+`zomato.similarity.build_similarity_index` (os `TOP_K` vizinhos de todos os
+restaurantes). Com `--check N`, compara os vizinhos de N restaurantes
+sorteados com uma busca força bruta (distância a todos da mesma cidade).
+
+Uso:
+    python -m benchmarks.bench_similarity --rows 1000000 --check 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from zomato import parallel, pipeline, similarity, synthetic
+
+
+def _forca_bruta(df, indice, posicoes, k):
+    """Fração dos restaurantes em `posicoes` com as mesmas distâncias da busca completa."""
+    linhas, codigos, _ = similarity.cuisine_vectors(df)
+    atributos = {
+        'price_range': df['price_range'].to_numpy(dtype='int64'),
+        'rating': df['aggregate_rating'].to_numpy(dtype='float64'),
+        'cost': similarity._cost_percentile(df),
+        'latitude': df['latitude'].to_numpy(dtype='float64'),
+        'longitude': df['longitude'].to_numpy(dtype='float64'),
+    }
+    cidade = df.groupby(['country', 'city'], sort=False).ngroup().to_numpy()
+    iguais = 0
+    for posicao in posicoes:
+        linhas_cidade = np.flatnonzero(cidade == cidade[posicao])
+        local = np.full(len(df), -1)
+        local[linhas_cidade] = np.arange(len(linhas_cidade))
+        entradas = local[linhas] >= 0
+        matriz = similarity.city_features(
+            linhas_cidade, (local[linhas[entradas]], codigos[entradas]), atributos
+        ).astype('float64')
+        alvo = matriz[local[posicao]]
+        d2 = ((matriz - alvo) ** 2).sum(axis=1)
+        d2[local[posicao]] = np.inf
+        esperado = np.sort(d2)[:min(k, len(linhas_cidade) - 1)]
+        obtido = indice['distances'][posicao][:len(esperado)]
+        iguais += np.allclose(obtido, esperado, rtol=1e-3, atol=1e-3)
+    return iguais / len(posicoes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--k', type=int, default=similarity.TOP_K, help='vizinhos por restaurante')
+    parser.add_argument('--check', type=int, default=0, help='restaurantes conferidos por força bruta')
+    args = parser.parse_args()
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    df, _ = parallel.clean_and_aggregate(raw)
+    del raw
+    cidades = df.groupby(['country', 'city']).size()
+    print(f'{len(df):,} restaurantes em {len(cidades):,} cidades (maior: {cidades.max():,})')
+
+    inicio = time.perf_counter()
+    indice = similarity.build_similarity_index(df, k=args.k)
+    segundos = time.perf_counter() - inicio
+    print(f'{args.k} vizinhos por restaurante em {segundos:.1f}s '
+          f'({indice["neighbors"].nbytes / 1024 ** 2:.1f} MB de posições)')
+
+    if args.check:
+        posicoes = np.random.default_rng(0).choice(len(df), size=min(args.check, len(df)), replace=False)
+        print(f'Iguais à força bruta: {_forca_bruta(df, indice, posicoes, args.k):.1%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark das consultas no SQLite contra os filtros em pandas.
+
+Trata um dataset sintético com o número de linhas pedido, grava o banco de
+`zomato.storage` e, para combinações aleatórias dos filtros da página de
+culinárias (país, culinárias, chave de ordenação, página), compara o tempo
+e o resultado de:
+- filtrar o DataFrame em memória (`nlargest` e `zomato.paging`)
+- consultar o banco pelo pool de conexões somente leitura
+
+As consultas também rodam em várias threads ao mesmo tempo, como sessões
+do Streamlit dividindo o mesmo pool. Por fim, um processo novo que só abre
+o banco (sem carregar o DataFrame) mede o pico de memória das consultas
+(lido de /proc, só no Linux).
+
+Uso:
+    python -m benchmarks.bench_storage --rows 1000000 --queries 200 --threads 4
+"""
+import argparse
+import ast
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from zomato import paging, parallel, pipeline, storage, synthetic
+
+COLUNAS = ['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two', 'aggregate_rating', 'votes']
+
+
+def _filtros(df, quantidade, seed):
+    """Combinações aleatórias de (país, culinárias, chave, crescente, página)."""
+    rng = random.Random(seed)
+    paises = [None] + sorted(df['country'].unique())
+    culinarias = df['cuisines'].value_counts().index[:40].tolist()
+    return [
+        (rng.choice(paises), rng.sample(culinarias, k=rng.randint(0, 4)), rng.choice(list(paging.SORT_KEYS)),
+         rng.random() < 0.5, rng.randint(1, 20))
+        for _ in range(quantidade)
+    ]
+
+
+def _consultar(pool, filtro):
+    """Uma visão da página no banco: ranking, contagem e página da tabela."""
+    pais, culinarias, chave, crescente, pagina = filtro
+    storage.top_restaurants(pool, COLUNAS, 10, pais)
+    total = storage.count(pool, pais, culinarias)
+    pagina = min(pagina, paging.n_pages(total, 50))
+    return storage.get_page(pool, COLUNAS, chave, pagina, 50, pais, culinarias, crescente)
+
+
+def _memoria_consultas(db_path, filtros):
+    """Executado em um processo novo: pico de RSS (MB) só com o banco aberto."""
+    pool = storage.get_pool(db_path)
+    for filtro in filtros:
+        _consultar(pool, filtro)
+    # VmHWM recomeça no exec; o ru_maxrss herdaria o pico do processo pai
+    with open('/proc/self/status') as arquivo:
+        pico = next(linha for linha in arquivo if linha.startswith('VmHWM'))
+    print(int(pico.split()[1]) / 1024)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--queries', type=int, default=200, help='combinações de filtros testadas')
+    parser.add_argument('--threads', type=int, default=4, help='threads consultando ao mesmo tempo')
+    parser.add_argument('--seed', type=int, default=0, help='semente dos filtros')
+    parser.add_argument('--db', default=None, help='banco gravado (padrão: arquivo temporário)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        _memoria_consultas(args.db, [ast.literal_eval(linha) for linha in sys.stdin])
+        return
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    df, _ = parallel.clean_and_aggregate(raw)
+    db_path = args.db or os.path.join(tempfile.mkdtemp(), 'zomato.sqlite')
+
+    inicio = time.perf_counter()
+    storage.ingest(db_path=db_path, df=df)
+    gravacao = time.perf_counter() - inicio
+    pool = storage.get_pool(db_path)
+    indice = paging.build_sort_index(df)
+    filtros = _filtros(df, args.queries, args.seed)
+
+    tempos = {'pandas': 0.0, 'sqlite': 0.0}
+    diferentes = 0
+    for filtro in filtros:
+        pais, culinarias, chave, crescente, pagina = filtro
+        inicio = time.perf_counter()
+        recorte = df if pais is None else df[df['country'] == pais]
+        recorte.nlargest(10, 'aggregate_rating')[COLUNAS]
+        ordem = paging.filtered_order(indice, chave, pais, culinarias, crescente)
+        esperado = paging.get_page(df, ordem, min(pagina, paging.n_pages(len(ordem), 50)), 50, COLUNAS)
+        tempos['pandas'] += time.perf_counter() - inicio
+        # Sem o cache de `filtered_order`, cada filtro novo paga a seleção
+        indice['cache'].clear()
+
+        inicio = time.perf_counter()
+        obtido = _consultar(pool, filtro)
+        tempos['sqlite'] += time.perf_counter() - inicio
+        if not (esperado.index.equals(obtido.index)
+                and (esperado['restaurant_name'].to_numpy() == obtido['restaurant_name'].to_numpy()).all()):
+            diferentes += 1
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        list(executor.map(lambda filtro: _consultar(pool, filtro), filtros))
+    concorrente = time.perf_counter() - inicio
+
+    filho = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_storage', '--child', '--db', db_path],
+        input='\n'.join(repr(filtro) for filtro in filtros), capture_output=True, text=True, check=True
+    )
+
+    print(f'Linhas: {len(df):,} | gravação do banco {gravacao:.1f}s '
+          f'({os.path.getsize(db_path) / 1024 ** 2:.0f} MB)')
+    for nome, segundos in tempos.items():
+        print(f'{nome:8s} {segundos / args.queries * 1000:8.2f} ms por visão')
+    print(f'{args.threads} threads: {args.queries / concorrente:.0f} visões/s')
+    print(f'resultados diferentes do pandas: {diferentes} de {args.queries}')
+    print(f'pico de RSS de um processo só com o banco: {float(filho.stdout):.0f} MB '
+          f'(DataFrame em memória: {df.memory_usage(deep=True).sum() / 1024 ** 2:.0f} MB)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Benchmark do custo da validação de qualidade na carga dos dados.
+
+Grava um CSV sintético com o número de linhas pedido (com alguns valores
+corrompidos) e compara o tempo de `zomato.parallel.load_data` com e sem a
+etapa de validação.
+
+Uso:
+    python -m benchmarks.bench_validation --rows 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from zomato import parallel, pipeline, synthetic
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000, help='linhas do dataset sintético')
+    parser.add_argument('--repeat', type=int, default=3, help='repetições de cada medição')
+    args = parser.parse_args()
+
+    raw = synthetic.scale_raw(pipeline.read_raw(), args.rows)
+    # Corrompe 0,1% das linhas para que a quarentena não fique vazia
+    corrompidas = raw.sample(frac=0.001, random_state=0).index
+    raw.loc[corrompidas, 'Latitude'] = 123.0
+
+    with tempfile.TemporaryDirectory() as pasta:
+        csv = os.path.join(pasta, 'zomato.csv')
+        raw.to_csv(csv, index=False)
+        quarentena = os.path.join(pasta, 'quarantine.parquet')
+
+        tempos = {}
+        for validar in (False, True):
+            melhores = []
+            for _ in range(args.repeat):
+                inicio = time.perf_counter()
+                _, _, relatorio = parallel.load_data(csv, validate=validar, quarantine_path=quarentena)
+                melhores.append(time.perf_counter() - inicio)
+            tempos[validar] = min(melhores)
+
+    print(f'Linhas: {args.rows:,}')
+    print(f'carga sem validação: {tempos[False]:8.2f}s')
+    print(f'carga com validação: {tempos[True]:8.2f}s '
+          f'(+{(tempos[True] / tempos[False] - 1) * 100:.1f}%)')
+    print(relatorio[['violations']].to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,489 @@
+"""
+Testes diferenciais: caminhos rápidos x código de referência.
+
+Executa lado a lado o tratamento e os cálculos originais das páginas
+(`benchmarks.reference`) e cada caminho otimizado do pacote, sobre:
+- o CSV de amostra
+- a amostra com casos de borda
+- um dataset sintético (`zomato.synthetic`) com casos de borda
+
+Os casos de borda são sorteados com a semente dada: nulos em culinária,
+avaliações, preço, nota, cidade e código do país; avaliações não
+numéricas; códigos de país, cor e faixa de preço desconhecidos; culinárias com espaços e primeira
+culinária vazia; e restaurantes com `Restaurant ID` repetido e conteúdo
+diferente, em qualquer posição do arquivo (vale a primeira linha). Os
+filtros das páginas são sorteados incluindo os vazios: país sem
+restaurantes, nenhuma culinária e culinária inexistente.
+
+Caminhos verificados:
+- `zomato.pipeline.clean_data` e `zomato.parallel.clean_and_aggregate`
+  (1 e N processos): colunas originais idênticas às da referência
+- `zomato.parallel.load_data` com validação: o CSV gravado, sem as linhas
+  que `zomato.validation` manda para a quarentena, tratado pela referência
+- agregados de `zomato.parallel`: métricas do Home, rankings de países
+  (com o `.round(2)` da página) e culinárias distintas por cidade
+- `zomato.paging`: tabela paginada contra filtro + `sort_values` estável
+- `zomato.storage`: as mesmas consultas no banco SQLite, inclusive os
+  rankings sem as anomalias (a referência recebe só as linhas com
+  `anomaly_flags == 0`, como a página com "Ocultar anomalias")
+- `zomato.density`: a grade de densidade integra à quantidade de
+  restaurantes dentro do enquadramento, em qualquer largura de banda
+
+Os rankings exibidos com `.head(k)` são comparados nos k primeiros, e os
+rankings de restaurantes (`nlargest`) linha a linha; empates podem vir em
+qualquer ordem, já que a referência ordena com `sort_values` não estável
+(no corte do `.head`, os rótulos obtidos precisam estar entre os empatados
+da referência). Para cada verificação são
+impressos o tempo da referência, o do caminho rápido e a razão entre eles.
+Os tempos comparam só etapas equivalentes: o tratamento da referência
+(passos 1 a 9) é medido contra os mesmos passos do pipeline, e os caminhos
+que também identificam redes e anomalias (passos 10 e 11) ou calculam
+agregados, sem equivalente na referência, ficam sem tempo de referência.
+Qualquer diferença encerra com código 1.
+
+Uso:
+    python -m benchmarks.differential --rows 200000 --filters 100 --workers 4
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import reference
+from zomato import density, paging, parallel, pipeline, sketches, storage, synthetic, validation
+
+TODOS = 'Todos os Países'
+
+# Colunas das tabelas da página de culinárias
+COLUNAS_MELHORES = ['cuisines', 'restaurant_name', 'aggregate_rating']
+COLUNAS_RANKING = ['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two', 'aggregate_rating']
+COLUNAS_TABELA = ['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two', 'aggregate_rating',
+                  'votes']
+
+
+#==================================
+# Casos de borda
+#==================================
+def inject_edge_cases(raw, seed=0, fraction=0.02):
+    """
+    Acrescenta casos de borda aos dados brutos.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos.
+    seed : int, optional
+        Semente do sorteio.
+    fraction : float, optional
+        Fração das linhas alterada por cada tipo de caso.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados brutos com os casos de borda, em ordem embaralhada.
+    """
+    rng = np.random.default_rng(seed)
+    df = raw.copy()
+
+    def sortear():
+        return rng.random(len(df)) < fraction
+
+    for coluna in ['Cuisines', 'Votes', 'Average Cost for two', 'Rating text', 'Aggregate rating', 'City']:
+        df.loc[sortear(), coluna] = np.nan
+    df['Votes'] = df['Votes'].astype(object)
+    df.loc[sortear(), 'Votes'] = 'n/a'
+    df.loc[sortear(), 'Country Code'] = 999
+    df.loc[sortear(), 'Country Code'] = np.nan
+    df.loc[sortear(), 'Rating color'] = 'ABCDEF'
+    df.loc[sortear(), 'Price range'] = 7
+    df.loc[sortear(), 'Cuisines'] = ' , Italian'
+    df.loc[sortear(), 'Cuisines'] = 'Italian ,  Pizza'
+
+    # Duplicatas com outro conteúdo; depois do embaralhamento algumas vêm antes do original
+    copias = df.sample(frac=fraction, random_state=seed)
+    copias['Restaurant Name'] = copias['Restaurant Name'] + ' (duplicata)'
+    copias['Aggregate rating'] = 4.9
+    copias['Country Code'] = 1
+    df = pd.concat([df, copias])
+    return df.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def random_filters(df, quantidade, seed):
+    """Filtros da página de culinárias, inclusive os que não selecionam nada."""
+    rng = random.Random(seed)
+    paises = [TODOS] + sorted(df['country'].unique()) + ['Atlantis']
+    culinarias = df['cuisines'].value_counts().index[:40].tolist()
+    filtros = []
+    for _ in range(quantidade):
+        escolhidas = rng.sample(culinarias, k=rng.randint(0, 4))
+        if rng.random() < 0.1:
+            escolhidas.append('Nenhuma')
+        filtros.append({
+            'pais': rng.choice(paises), 'culinarias': escolhidas, 'quantidade': rng.randint(1, 20),
+            'chave': rng.choice(list(paging.SORT_KEYS)), 'crescente': rng.random() < 0.5,
+            'pagina': rng.randint(1, 5), 'tamanho': rng.choice([25, 50, 100]),
+        })
+    return filtros
+
+
+#==================================
+# Comparações
+#==================================
+def cronometrar(funcao, *args, **kwargs):
+    """Executa `funcao` e retorna (resultado, segundos)."""
+    inicio = time.perf_counter()
+    resultado = funcao(*args, **kwargs)
+    return resultado, time.perf_counter() - inicio
+
+
+def diff_frames(esperado, obtido):
+    """Descrição da diferença entre dois DataFrames (None se iguais em índice e valores)."""
+    esperado = pd.DataFrame() if esperado is None else esperado
+    if esperado.empty and obtido.empty:
+        return None
+    if len(esperado) != len(obtido):
+        return f'{len(esperado)} linhas esperadas, {len(obtido)} obtidas'
+    if not np.array_equal(esperado.index.to_numpy(), obtido.index.to_numpy()):
+        return 'índices diferentes'
+    for coluna in esperado.columns:
+        a, b = esperado[coluna].to_numpy(), obtido[coluna].to_numpy()
+        iguais = (a == b) | (pd.isna(a) & pd.isna(b))
+        if not iguais.all():
+            linha = int(np.argmin(iguais))
+            return f'{coluna}: {a[linha]!r} != {b[linha]!r} na linha {linha}'
+    return None
+
+
+def diff_ranked_frames(esperado, obtido, chave):
+    """
+    Como `diff_frames`, mas linhas empatadas em `chave` podem vir em qualquer ordem.
+
+    Quando pede todas as linhas do filtro, o `nlargest` da referência usa
+    `sort_values` sem ordenação estável, e a ordem dos empates depende da
+    ordenação do numpy; as linhas selecionadas, no entanto, são sempre as
+    mesmas.
+    """
+    esperado = pd.DataFrame() if esperado is None else esperado
+    if esperado.empty and obtido.empty:
+        return None
+    if len(esperado) != len(obtido):
+        return f'{len(esperado)} linhas esperadas, {len(obtido)} obtidas'
+    if not np.array_equal(esperado[chave].to_numpy(dtype='float64'), obtido[chave].to_numpy(dtype='float64'),
+                          equal_nan=True):
+        return f'{chave}: {esperado[chave].tolist()} != {obtido[chave].tolist()}'
+
+    def canonica(frame):
+        # O índice não entra: a posição de cada linha no DataFrame, quando importa, vem como coluna
+        return frame.sort_values(list(frame.columns), kind='stable').sort_values(
+            chave, ascending=False, kind='stable').reset_index(drop=True)
+
+    return diff_frames(canonica(esperado), canonica(obtido))
+
+
+def diff_rankings(esperado, obtido, k):
+    """
+    Descrição da diferença entre os k primeiros de dois rankings (None se iguais).
+
+    Parameters
+    ----------
+    esperado, obtido : pandas.Series
+        Valor por rótulo, em qualquer ordem.
+    k : int
+        Tamanho do `.head` exibido.
+    """
+    topo_e = esperado.sort_values(ascending=False).head(k)
+    topo_o = obtido.sort_values(ascending=False).head(k)
+    if len(topo_e) != len(topo_o) or not np.array_equal(topo_e.to_numpy(dtype='float64'),
+                                                        topo_o.to_numpy(dtype='float64'), equal_nan=True):
+        return f'valores {topo_e.tolist()} != {topo_o.tolist()}'
+    if topo_e.empty:
+        return None
+    corte = topo_e.iloc[-1]
+
+    def pares(serie):
+        acima = serie[serie > corte]
+        return sorted(zip(acima.index, acima.to_numpy(dtype='float64')))
+
+    if pares(esperado) != pares(obtido):
+        return f'rótulos {topo_e.index.tolist()} != {topo_o.index.tolist()}'
+    if not set(topo_o.index[topo_o == corte]) <= set(esperado.index[esperado == corte]):
+        return f'empates no corte {topo_e.index.tolist()} != {topo_o.index.tolist()}'
+    return None
+
+
+class Relatorio:
+    """Resultados das verificações: conjunto, verificação, caminho, tempos e diferença."""
+
+    def __init__(self):
+        self.linhas = []
+
+    def add(self, conjunto, verificacao, caminho, t_referencia, t_caminho, diferenca):
+        """Registra uma verificação; `t_referencia` None = sem etapa equivalente na referência."""
+        t_referencia = np.nan if t_referencia is None else t_referencia
+        self.linhas.append({
+            'conjunto': conjunto, 'verificação': verificacao, 'caminho': caminho,
+            'referência (ms)': t_referencia * 1000, 'caminho (ms)': t_caminho * 1000,
+            'speedup': t_referencia / t_caminho if t_caminho > 0 else np.inf,
+            'ok': diferenca is None, 'diferença': diferenca or '',
+        })
+
+    def table(self):
+        return pd.DataFrame(self.linhas)
+
+
+#==================================
+# Verificações
+#==================================
+def _passos_da_referencia(raw):
+    """Passos 1 a 9 do pipeline, os mesmos de `reference.clean` (sem redes e anomalias)."""
+    df = pipeline.clean_rows(pipeline.drop_duplicate_restaurants(raw))
+    return df.sort_values('restaurant_id').reset_index(drop=True)
+
+
+def check_cleaning(relatorio, conjunto, raw, workers):
+    """Tratamento e agregados; retorna (referência, df tratado, agregados)."""
+    esperado, t_ref = cronometrar(reference.clean, raw)
+    colunas = list(esperado.columns)
+
+    obtido, t = cronometrar(_passos_da_referencia, raw.copy())
+    relatorio.add(conjunto, 'tratamento (passos 1 a 9)', 'pipeline.clean_rows', t_ref, t,
+                  diff_frames(esperado, obtido[colunas]))
+
+    completo, t = cronometrar(pipeline.clean_data, raw.copy())
+    relatorio.add(conjunto, 'tratamento + redes e anomalias', 'pipeline.clean_data', None, t,
+                  diff_frames(esperado, completo[colunas]))
+
+    # min_rows=0 força o pool mesmo nos datasets pequenos; o DataFrame inteiro
+    # (com brand_id e anomaly_flags) é comparado com o de clean_data, que não
+    # passa pelo módulo paralelo
+    for n in sorted({1, workers}):
+        (df, agregados), t = cronometrar(parallel.clean_and_aggregate, raw, workers=n, min_rows=0)
+        diferenca = diff_frames(esperado, df[colunas]) or diff_frames(completo, df)
+        relatorio.add(conjunto, 'tratamento + agregados', f'parallel ({n} processo{"s" if n > 1 else ""})',
+                      None, t, diferenca)
+    return esperado, df, agregados
+
+
+def check_validated_load(relatorio, conjunto, raw, workers):
+    """Carga com validação: CSV -> quarentena -> tratamento, contra a referência sobre as linhas válidas."""
+    pasta = tempfile.mkdtemp()
+    csv_path = os.path.join(pasta, 'zomato.csv')
+    quarentena_path = os.path.join(pasta, 'quarantine.parquet')
+    raw.to_csv(csv_path, index=False)
+
+    lido = pipeline.read_raw(csv_path)
+    validas = lido[~validation.check(lido).any(axis=1).to_numpy()]
+    esperado = reference.clean(validas)
+    colunas = list(esperado.columns)
+
+    (df, _, violacoes), t = cronometrar(parallel.load_data, csv_path, workers=workers, validate=True,
+                                        quarantine_path=quarentena_path)
+    diferenca = diff_frames(esperado, df[colunas])
+    quarentena = len(pd.read_parquet(quarentena_path))
+    if diferenca is None and len(validas) + quarentena != len(lido):
+        diferenca = f'{len(validas)} válidas + {quarentena} em quarentena != {len(lido)} lidas'
+    # O caminho também identifica redes e anomalias e calcula os agregados: sem tempo de referência
+    relatorio.add(conjunto, f'carga validada ({quarentena} linhas em quarentena)',
+                  f'parallel.load_data ({workers} processo{"s" if workers > 1 else ""})', None, t, diferenca)
+
+
+def check_aggregates(relatorio, conjunto, esperado, agregados):
+    """Métricas do Home e rankings de países/cidades a partir dos agregados."""
+    metricas, t_ref = cronometrar(reference.home_metrics, esperado)
+    inicio = time.perf_counter()
+    total = agregados['total'].iloc[0]
+    obtidas = {
+        'restaurants': int(total['restaurants']), 'countries': len(agregados['country']),
+        'cities': int(total['n_cities']), 'votes': total['votes_sum'], 'cuisines': int(total['n_cuisines']),
+    }
+    t = time.perf_counter() - inicio
+    diferentes = {chave: (metricas[chave], obtidas[chave]) for chave in metricas if metricas[chave] != obtidas[chave]}
+    relatorio.add(conjunto, 'métricas do Home', 'agregados', t_ref, t, str(diferentes) if diferentes else None)
+
+    rankings, t_ref = cronometrar(reference.country_rankings, esperado)
+    inicio = time.perf_counter()
+    paises = agregados['country']
+    obtidos = {
+        'restaurants': paises['restaurants'], 'cities': paises['n_cities'],
+        'votes_mean': paises['votes_mean'].round(2), 'cost_mean': paises['cost_mean'].round(2),
+    }
+    t = (time.perf_counter() - inicio) / len(obtidos)
+    for nome, ranking in rankings.items():
+        relatorio.add(conjunto, f'países: {nome} (top 6)', 'agregados', t_ref / len(rankings), t,
+                      diff_rankings(ranking, obtidos[nome], 6))
+
+    culinarias, t_ref = cronometrar(reference.city_cuisine_counts, esperado)
+    inicio = time.perf_counter()
+    por_cidade = agregados['city'].groupby(level='city', sort=True).agg(
+        {'cuisines': sketches.merge_all, 'cuisines_not_informed': 'sum'})
+    obtidas = por_cidade['cuisines'].map(sketches.DistinctSketch.count) - (por_cidade['cuisines_not_informed'] > 0)
+    t = time.perf_counter() - inicio
+    relatorio.add(conjunto, 'cidades: culinárias distintas (top 10)', 'agregados', t_ref, t,
+                  diff_rankings(culinarias, obtidas, 10))
+
+
+def _pagina_referencia(df, filtro):
+    """Página da tabela: filtro + ordenação estável decrescente (crescente = ordem inversa)."""
+    mascara = np.ones(len(df), dtype=bool)
+    if filtro['pais'] != TODOS:
+        mascara &= (df['country'] == filtro['pais']).to_numpy()
+    if filtro['culinarias']:
+        mascara &= df['cuisines'].isin(filtro['culinarias']).to_numpy()
+    ordem = df[mascara].sort_values(filtro['chave'], ascending=False, kind='stable')
+    if filtro['crescente']:
+        ordem = ordem.iloc[::-1]
+    pagina = min(filtro['pagina'], paging.n_pages(len(ordem), filtro['tamanho']))
+    inicio = (pagina - 1) * filtro['tamanho']
+    linhas = ordem.iloc[inicio:inicio + filtro['tamanho']][COLUNAS_TABELA]
+    return len(ordem), pagina, linhas.set_axis(pd.RangeIndex(inicio + 1, inicio + 1 + len(linhas)), axis=0)
+
+
+def check_cuisine_views(relatorio, conjunto, esperado, df, filtros):
+    """Rankings e tabela paginada da página de culinárias, em pandas e no SQLite."""
+    db_path = os.path.join(tempfile.mkdtemp(), 'zomato.sqlite')
+    storage.ingest(db_path=db_path, df=df)
+    pool = storage.get_pool(db_path)
+    indice = paging.build_sort_index(df)
+
+    # Com "Ocultar anomalias" a página ranqueia só as linhas sem `anomaly_flags`; as posições são as mesmas
+    variantes = {'': (esperado, False), '_sem_anomalias': (esperado[df['anomaly_flags'].to_numpy() == 0], True)}
+
+    tempos = {nome: [0.0, 0.0] for nome in ['melhores', 'melhores_sem_anomalias', 'ranking',
+                                            'ranking_sem_anomalias', 'tabela', 'tabela_sqlite']}
+    diferencas = {nome: None for nome in tempos}
+    # Filtros em que a própria referência falha (culinária só com notas nulas: o idxmax retorna NaN)
+    falhas_referencia = {sufixo: 0 for sufixo in variantes}
+
+    def registrar(nome, t_ref, t, diferenca, filtro):
+        tempos[nome][0] += t_ref
+        tempos[nome][1] += t
+        if diferenca and diferencas[nome] is None:
+            diferencas[nome] = f'{diferenca} ({filtro})'
+
+    for filtro in filtros:
+        pais = None if filtro['pais'] == TODOS else filtro['pais']
+
+        for sufixo, (linhas_ranking, sem_anomalias) in variantes.items():
+            try:
+                melhores, t_ref = cronometrar(reference.best_by_cuisine, linhas_ranking, filtro['pais'],
+                                              filtro['culinarias'])
+            except KeyError:
+                falhas_referencia[sufixo] += 1
+            else:
+                if filtro['culinarias']:
+                    obtido, t = cronometrar(storage.best_by_cuisine, pool, COLUNAS_MELHORES, 5, pais,
+                                            filtro['culinarias'], exclude_anomalies=sem_anomalias)
+                    if melhores is not None:
+                        melhores = melhores[COLUNAS_MELHORES].reset_index(drop=True)
+                    registrar(f'melhores{sufixo}', t_ref, t,
+                              diff_ranked_frames(melhores, obtido, 'aggregate_rating'), filtro)
+
+            ranking, t_ref = cronometrar(reference.best_overall, linhas_ranking, filtro['pais'],
+                                         filtro['quantidade'])
+            obtido, t = cronometrar(storage.top_restaurants, pool, COLUNAS_RANKING, filtro['quantidade'], pais,
+                                    exclude_anomalies=sem_anomalias)
+            ranking = ranking[COLUNAS_RANKING].rename_axis('position').reset_index()
+            obtido = obtido.rename_axis('position').reset_index()
+            registrar(f'ranking{sufixo}', t_ref, t, diff_ranked_frames(ranking, obtido, 'aggregate_rating'),
+                      filtro)
+
+        (total, pagina, linhas), t_ref = cronometrar(_pagina_referencia, esperado, filtro)
+        inicio = time.perf_counter()
+        ordem = paging.filtered_order(indice, filtro['chave'], pais, filtro['culinarias'], filtro['crescente'])
+        obtido = paging.get_page(df, ordem, pagina, filtro['tamanho'], COLUNAS_TABELA)
+        t = time.perf_counter() - inicio
+        # Sem o cache de `filtered_order`, cada filtro paga a seleção
+        indice['cache'].clear()
+        diferenca = f'total {total} != {len(ordem)}' if total != len(ordem) else diff_frames(linhas, obtido)
+        registrar('tabela', t_ref, t, diferenca, filtro)
+
+        inicio = time.perf_counter()
+        quantidade = storage.count(pool, pais, filtro['culinarias'])
+        obtido = storage.get_page(pool, COLUNAS_TABELA, filtro['chave'], pagina, filtro['tamanho'], pais,
+                                  filtro['culinarias'], filtro['crescente'])
+        t = time.perf_counter() - inicio
+        diferenca = f'total {total} != {quantidade}' if total != quantidade else diff_frames(linhas, obtido)
+        registrar('tabela_sqlite', t_ref, t, diferenca, filtro)
+
+    pool.close()
+    n = len(filtros)
+    nomes = {
+        'melhores': (f'culinárias: melhor de cada culinária ({falhas_referencia[""]} com erro na referência)',
+                     'storage'),
+        'melhores_sem_anomalias': (
+            f'culinárias: melhor de cada culinária sem anomalias '
+            f'({falhas_referencia["_sem_anomalias"]} com erro na referência)', 'storage'),
+        'ranking': ('culinárias: top restaurantes', 'storage'),
+        'ranking_sem_anomalias': ('culinárias: top restaurantes sem anomalias', 'storage'),
+        'tabela': ('culinárias: tabela paginada', 'paging'),
+        'tabela_sqlite': ('culinárias: tabela paginada', 'storage'),
+    }
+    for nome, (verificacao, caminho) in nomes.items():
+        t_ref, t = tempos[nome]
+        relatorio.add(conjunto, f'{verificacao} ({n} filtros)', caminho, t_ref, t, diferencas[nome])
+
+
+def check_density(relatorio, conjunto, df):
+    """Densidade do mapa do Home: soma da grade x área = restaurantes no enquadramento."""
+    latitude = df['latitude'].to_numpy()
+    longitude = df['longitude'].to_numpy()
+    for banda_km in (0.5, 2.0, 50.0):
+        (grade, (lat_min, lat_max, lon_min, lon_max), area), t = cronometrar(
+            density.density_grid, latitude, longitude, banda_km)
+        inicio = time.perf_counter()
+        dentro = int(((latitude >= lat_min) & (latitude <= lat_max)
+                      & (longitude >= lon_min) & (longitude <= lon_max)).sum())
+        t_ref = time.perf_counter() - inicio
+        integral = float(grade.sum() * area)
+        diferenca = None if np.isclose(integral, dentro, rtol=1e-9) else f'integral {integral:,.2f} != {dentro:,}'
+        relatorio.add(conjunto, f'densidade: integral da grade ({banda_km:g} km)', 'density', t_ref, t, diferenca)
+
+
+def run_dataset(relatorio, conjunto, raw, workers, filtros, seed):
+    """Todas as verificações sobre um conjunto de dados brutos."""
+    esperado, df, agregados = check_cleaning(relatorio, conjunto, raw, workers)
+    check_validated_load(relatorio, conjunto, raw, workers)
+    check_aggregates(relatorio, conjunto, esperado, agregados)
+    check_cuisine_views(relatorio, conjunto, esperado, df, random_filters(esperado, filtros, seed))
+    check_density(relatorio, conjunto, df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=200_000, help='linhas do dataset sintético')
+    parser.add_argument('--filters', type=int, default=100, help='filtros sorteados por conjunto')
+    parser.add_argument('--workers', type=int, default=2, help='processos do modo paralelo')
+    parser.add_argument('--seed', type=int, default=0, help='semente dos casos de borda e dos filtros')
+    args = parser.parse_args()
+    # O código de referência atribui colunas em recortes, como no dashboard original
+    warnings.simplefilter('ignore', pd.errors.SettingWithCopyWarning)
+
+    amostra = pipeline.read_raw()
+    conjuntos = {
+        'amostra': amostra,
+        'amostra + bordas': inject_edge_cases(amostra, args.seed),
+        f'sintético {args.rows:,} + bordas': inject_edge_cases(
+            synthetic.scale_raw(amostra, args.rows, seed=args.seed), args.seed),
+    }
+    relatorio = Relatorio()
+    for conjunto, raw in conjuntos.items():
+        run_dataset(relatorio, conjunto, raw, args.workers, args.filters, args.seed)
+
+    tabela = relatorio.table()
+    with pd.option_context('display.width', 200, 'display.max_colwidth', 80, 'display.max_rows', None):
+        print(tabela.drop(columns='diferença').to_string(index=False, float_format=lambda valor: f'{valor:.2f}'))
+    falhas = tabela[~tabela['ok']]
+    print(f'\n{len(tabela) - len(falhas)} de {len(tabela)} verificações idênticas à referência')
+    for _, falha in falhas.iterrows():
+        print(f"DIFERENTE [{falha['conjunto']}] {falha['verificação']} / {falha['caminho']}: {falha['diferença']}")
+    if len(falhas):
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""
+Teste de carga com sessões concorrentes do dashboard.
+
+Sobe um servidor local (`streamlit run Home.py`) e abre N sessões
+simultâneas pelo mesmo protocolo do navegador (websocket em
+`/_stcore/stream`, mensagens protobuf `BackMsg`/`ForwardMsg`). Assim as
+reexecuções disputam o GIL e os caches do servidor como em uma réplica real.
+O `AppTest` não serve para isso: ele troca o Runtime global a cada execução
+e não suporta instâncias concorrentes no mesmo processo.
+
+Cada sessão abre a página e repete interações aleatórias:
+- troca o país em `paises_selectbox`
+- move o slider `quantidade_restaurantes` (página de culinárias)
+- troca a seleção do multiselect de culinárias (página de culinárias)
+
+Ao final, o relatório mostra o throughput (reexecuções por segundo), os
+percentis de latência de cada reexecução (do envio da interação até a
+mensagem `script_finished`) e a memória por sessão (RSS adicional do
+servidor dividido pelo número de sessões).
+
+Uso:
+    python -m benchmarks.loadtest --sessions 8 --actions 20 --pages cuisines
+"""
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+import urllib.request
+
+import numpy as np
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Rótulos dos widgets usados nas interações (iguais nas páginas)
+ROTULO_PAIS = 'Selecione o País'
+ROTULO_QUANTIDADE = 'Selecione a quantidade de restaurantes'
+ROTULO_CULINARIAS = 'Selecione os tipos de culinária'
+
+# Tipos de elemento tratados como widgets pela sessão
+WIDGETS = ('selectbox', 'slider', 'multiselect')
+
+
+def rss_mb(pid):
+    """RSS atual do processo `pid` em MB (Linux); None onde /proc não existe."""
+    try:
+        with open(f'/proc/{pid}/statm') as arquivo:
+            paginas = int(arquivo.read().split()[1])
+    except (OSError, ValueError):
+        return None
+    return paginas * os.sysconf('SC_PAGE_SIZE') / 1024 ** 2
+
+
+def start_server(port, timeout=120):
+    """
+    Sobe `streamlit run Home.py` em `port` e espera o health check responder.
+
+    Returns
+    -------
+    subprocess.Popen
+        O processo do servidor (encerrado por quem chamou).
+    """
+    comando = [sys.executable, '-m', 'streamlit', 'run', 'Home.py',
+               '--server.headless', 'true', '--server.port', str(port),
+               '--browser.gatherUsageStats', 'false']
+    servidor = subprocess.Popen(comando, cwd=RAIZ, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if servidor.poll() is not None:
+            raise RuntimeError(f'o servidor terminou com código {servidor.returncode}')
+        try:
+            with urllib.request.urlopen(f'http://localhost:{port}/_stcore/health', timeout=1):
+                return servidor
+        except OSError:
+            time.sleep(0.5)
+    servidor.terminate()
+    raise RuntimeError(f'o servidor não respondeu em {timeout}s')
+
+
+class Sessao:
+    """
+    Uma sessão do navegador: conexão websocket, widgets e estado dos widgets.
+
+    Como o navegador, guarda as mensagens marcadas como `cacheable` para
+    resolver as referências (`ref_hash`) que o servidor envia nas reexecuções.
+    """
+
+    def __init__(self, url, pagina, rng):
+        self.url = url
+        self.pagina = pagina
+        self.rng = rng
+        self.conexao = None
+        self.widgets = {}
+        self.estados = {}
+        self.mensagens = {}
+
+    async def conectar(self):
+        from tornado.websocket import websocket_connect
+        self.conexao = await websocket_connect(self.url, max_message_size=1024 ** 3)
+
+    async def executar(self):
+        """
+        Pede uma reexecução com o estado atual e espera o fim do script.
+
+        Returns
+        -------
+        tuple of (float, str)
+            Duração em segundos e a primeira mensagem de exceção da página
+            (None se a página rodou sem erro).
+        """
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        pedido = BackMsg()
+        pedido.rerun_script.query_string = ''
+        pedido.rerun_script.page_name = self.pagina
+        pedido.rerun_script.widget_states.widgets.extend(self.estados.values())
+
+        inicio = time.perf_counter()
+        await self.conexao.write_message(pedido.SerializeToString(), binary=True)
+        widgets, erro = {}, None
+        while True:
+            bruto = await self.conexao.read_message()
+            if bruto is None:
+                raise ConnectionError('o servidor fechou a conexão')
+            mensagem = ForwardMsg()
+            mensagem.ParseFromString(bruto)
+            if mensagem.ref_hash:
+                mensagem = self.mensagens[mensagem.ref_hash]
+            elif mensagem.metadata.cacheable:
+                self.mensagens[mensagem.hash] = mensagem
+
+            tipo = mensagem.WhichOneof('type')
+            if tipo == 'script_finished':
+                break
+            if tipo != 'delta' or mensagem.delta.WhichOneof('type') != 'new_element':
+                continue
+            elemento = mensagem.delta.new_element
+            tipo_elemento = elemento.WhichOneof('type')
+            if tipo_elemento in WIDGETS:
+                widget = getattr(elemento, tipo_elemento)
+                widgets[widget.label] = (tipo_elemento, widget)
+            elif tipo_elemento == 'exception' and erro is None:
+                erro = elemento.exception.message or elemento.exception.type
+        duracao = time.perf_counter() - inicio
+
+        # Widgets que sumiram (ou mudaram de id) deixam de ter estado
+        self.widgets = widgets
+        ids = {widget.id for _, widget in widgets.values()}
+        self.estados = {id_: estado for id_, estado in self.estados.items() if id_ in ids}
+        return duracao, erro
+
+    def _estado(self, widget):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        estado = WidgetState(id=widget.id)
+        self.estados[widget.id] = estado
+        return estado
+
+    def interacoes(self):
+        """Lista as interações possíveis com os widgets da última execução."""
+        acoes = []
+        if ROTULO_PAIS in self.widgets:
+            _, widget = self.widgets[ROTULO_PAIS]
+            acoes.append(('país', lambda w=widget: setattr(
+                self._estado(w), 'int_value', self.rng.randrange(len(w.options)))))
+        if ROTULO_QUANTIDADE in self.widgets:
+            _, widget = self.widgets[ROTULO_QUANTIDADE]
+            acoes.append(('slider', lambda w=widget: self._estado(w).double_array_value.data.append(
+                float(self.rng.randint(int(w.min), int(w.max))))))
+        if ROTULO_CULINARIAS in self.widgets:
+            _, widget = self.widgets[ROTULO_CULINARIAS]
+            acoes.append(('culinárias', lambda w=widget: self._estado(w).int_array_value.data.extend(
+                sorted(self.rng.sample(range(len(w.options)), k=min(len(w.options),
+                                                                   self.rng.randint(1, 5)))))))
+        return acoes
+
+
+async def run_session(url, pagina, actions, seed, resultados, inicio_comum):
+    """
+    Executa uma sessão: abre a página e faz `actions` interações.
+
+    As latências de cada execução são acrescentadas em `resultados` como
+    tuplas (ação, segundos); erros da página entram como ('erro', mensagem).
+    """
+    sessao = Sessao(url, pagina, random.Random(seed))
+    await sessao.conectar()
+    await inicio_comum.wait()
+
+    duracao, erro = await sessao.executar()
+    resultados.append(('abertura', duracao))
+    for _ in range(actions):
+        if erro is not None:
+            resultados.append(('erro', erro))
+            break
+        acoes = sessao.interacoes()
+        if not acoes:
+            break
+        nome, acao = sessao.rng.choice(acoes)
+        acao()
+        duracao, erro = await sessao.executar()
+        resultados.append((nome, duracao))
+    sessao.conexao.close()
+
+
+async def run_load(url, paginas, sessions, actions, seed):
+    """Abre todas as sessões, libera todas juntas e devolve (resultados, duração)."""
+    resultados = []
+    inicio_comum = asyncio.Event()
+    tarefas = [
+        asyncio.create_task(run_session(url, paginas[i % len(paginas)], actions, seed + i,
+                                        resultados, inicio_comum))
+        for i in range(sessions)
+    ]
+    await asyncio.sleep(0.5)  # tempo para as conexões abrirem
+    inicio = time.perf_counter()
+    inicio_comum.set()
+    await asyncio.gather(*tarefas)
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=8, help='sessões simultâneas')
+    parser.add_argument('--actions', type=int, default=20, help='interações por sessão')
+    parser.add_argument('--pages', nargs='+', default=['cuisines'],
+                        help="páginas testadas, pelo nome na URL ('' para a Home); "
+                             'as sessões são distribuídas entre elas')
+    parser.add_argument('--seed', type=int, default=0, help='semente das interações')
+    parser.add_argument('--port', type=int, default=8599, help='porta do servidor local')
+    args = parser.parse_args()
+
+    url = f'ws://localhost:{args.port}/_stcore/stream'
+    servidor = start_server(args.port)
+    try:
+        # Aquece os caches do servidor (dados tratados, agregações) antes da medição
+        asyncio.run(run_load(url, args.pages, 1, 0, args.seed))
+        rss_inicial = rss_mb(servidor.pid)
+        resultados, duracao = asyncio.run(
+            run_load(url, args.pages, args.sessions, args.actions, args.seed))
+        rss_final = rss_mb(servidor.pid)
+    finally:
+        servidor.terminate()
+        servidor.wait()
+
+    erros = [mensagem for nome, mensagem in resultados if nome == 'erro']
+    latencias = [(nome, segundos) for nome, segundos in resultados if nome != 'erro']
+    todas = np.array([segundos for _, segundos in latencias]) * 1000
+
+    print(f'Páginas: {args.pages} | sessões: {args.sessions} | interações por sessão: {args.actions}')
+    print(f'reexecuções: {len(todas)} em {duracao:.1f}s -> throughput {len(todas) / duracao:.1f}/s')
+    print(f'latência (ms): p50 {np.percentile(todas, 50):.0f} | p90 {np.percentile(todas, 90):.0f} '
+          f'| p99 {np.percentile(todas, 99):.0f} | máx {todas.max():.0f}')
+    for nome in sorted({nome for nome, _ in latencias}):
+        valores = np.array([s for n, s in latencias if n == nome]) * 1000
+        print(f'    {nome:12s} n={len(valores):4d}  p50 {np.percentile(valores, 50):7.0f} ms  '
+              f'p90 {np.percentile(valores, 90):7.0f} ms')
+    if rss_inicial is not None:
+        print(f'memória do servidor: RSS {rss_inicial:.0f} MB -> {rss_final:.0f} MB '
+              f'({(rss_final - rss_inicial) / args.sessions:.1f} MB por sessão)')
+    if erros:
+        print(f'{len(erros)} sessões com erro; primeiro: {erros[0]}')
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,272 @@
+"""
+Perfil de memória das páginas do dashboard com datasets em escala.
+
+Para cada página e cada tamanho de dataset, executa a página sem navegador
+(`streamlit.testing.v1.AppTest`) em um processo separado e registra:
+- o pico de memória residente (RSS) do processo
+- o pico de memória rastreada pelo `tracemalloc`
+- os maiores alocadores ainda vivos ao final da execução, agrupados pela
+  linha da página (ou do pacote `zomato`) que os originou e pela seção
+  da página (os cabeçalhos `# ====`)
+
+O cache em disco (`zomato.cache`) fica desativado nos processos filhos:
+o dataset e os mapas são sempre montados do zero, e nada é gravado no
+cache do projeto.
+
+Os limites de RSS ficam em `benchmarks/memory_budget.json`; o script termina
+com código 1 se alguma página passar do limite. O relatório completo pode
+ser gravado em JSON (`--output`) para acompanhar a evolução ao longo do tempo.
+
+Uso:
+    python -m benchmarks.memprofile --rows 10000 100000 --output memoria.json
+"""
+import argparse
+import json
+import linecache
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_PATH = os.path.join(RAIZ, 'benchmarks', 'memory_budget.json')
+
+
+def list_pages():
+    """Retorna `Home.py` e as páginas de `pages/`, relativos à raiz do projeto."""
+    paginas = sorted(
+        os.path.join('pages', nome) for nome in os.listdir(os.path.join(RAIZ, 'pages'))
+        if nome.endswith('.py')
+    )
+    return ['Home.py'] + paginas
+
+
+def _peak_rss_mb():
+    """Pico de RSS do processo atual em MB (None onde `resource` não existe)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB e macOS em bytes
+    return pico / 1024 ** 2 if sys.platform == 'darwin' else pico / 1024
+
+
+def _sections(path):
+    """Mapeia cada linha da página para o título do cabeçalho `# ====` anterior."""
+    secoes = {}
+    atual = '(início)'
+    linhas = open(path, encoding='utf-8').read().splitlines()
+    for numero, linha in enumerate(linhas, start=1):
+        anterior = linhas[numero - 2].strip() if numero > 1 else ''
+        texto = linha.strip()
+        if anterior.replace(' ', '').startswith('#=') and texto.startswith('#'):
+            titulo = texto.lstrip('#').strip()
+            if titulo and not titulo.startswith('='):
+                atual = titulo
+        secoes[numero] = atual
+    return secoes
+
+
+def _origem(traceback, pagina):
+    """Primeiro frame do traceback dentro da página ou do pacote zomato."""
+    pacote = os.path.join(RAIZ, 'zomato')
+    for frame in reversed(traceback):
+        if os.path.abspath(frame.filename) == pagina:
+            return frame
+    for frame in reversed(traceback):
+        if os.path.abspath(frame.filename).startswith(pacote):
+            return frame
+    return None
+
+
+# Bibliotecas importadas antes de ligar o tracemalloc: o custo delas é o
+# mesmo para todas as páginas e rastreá-las deixaria a execução muito lenta
+BIBLIOTECAS = ['pandas', 'numpy', 'plotly.express', 'plotly.graph_objects', 'plotly.offline',
+               'plotly.io', 'folium', 'folium.plugins', 'streamlit_folium', 'matplotlib.pyplot',
+               'seaborn', 'PIL.Image', 'haversine', 'pyarrow', 'streamlit.emojis',
+               'streamlit.components.v1']
+
+# Profundidade dos tracebacks guardados; precisa alcançar a linha da página
+# a partir das funções internas do pandas
+FRAMES = 12
+
+
+def profile_page(page, top=10, trace=True):
+    """
+    Executa uma página e mede a memória (chamado dentro do processo filho).
+
+    O pico de RSS só é confiável com `trace=False`, porque o próprio
+    tracemalloc consome memória; por isso cada página roda duas vezes, em
+    processos separados.
+
+    Parameters
+    ----------
+    page : str
+        Caminho da página relativo à raiz do projeto.
+    top : int, optional
+        Quantidade de alocadores listados.
+    trace : bool, optional
+        Liga o tracemalloc para levantar os maiores alocadores.
+
+    Returns
+    -------
+    dict
+        Métricas da execução: `peak_rss_mb`, `seconds` e `exception`, e com
+        `trace=True` também `traced_peak_mb`, `sections_mb` e
+        `top_allocators`.
+    """
+    import importlib
+    import warnings
+    warnings.simplefilter('ignore')
+    from streamlit.testing.v1 import AppTest
+    for biblioteca in BIBLIOTECAS:
+        importlib.import_module(biblioteca)
+
+    pagina = os.path.join(RAIZ, page)
+    if trace:
+        tracemalloc.start(FRAMES)
+    inicio = time.perf_counter()
+    app = AppTest.from_file(pagina, default_timeout=3600).run()
+    resultado = {
+        'peak_rss_mb': _peak_rss_mb(),
+        'seconds': time.perf_counter() - inicio,
+        'exception': [erro.message for erro in app.exception],
+    }
+    if not trace:
+        return resultado
+
+    snapshot = tracemalloc.take_snapshot()
+    _, pico_rastreado = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    secoes = _sections(pagina)
+    por_linha = defaultdict(int)
+    por_secao = defaultdict(int)
+    for estatistica in snapshot.statistics('traceback'):
+        frame = _origem(estatistica.traceback, pagina)
+        if frame is None:
+            chave, secao = '(outros)', '(outros)'
+        elif os.path.abspath(frame.filename) == pagina:
+            chave = f'{page}:{frame.lineno}'
+            secao = secoes.get(frame.lineno, '(início)')
+        else:
+            chave = f'{os.path.relpath(frame.filename, RAIZ)}:{frame.lineno}'
+            secao = 'zomato'
+        por_linha[chave] += estatistica.size
+        por_secao[secao] += estatistica.size
+
+    maiores = sorted(por_linha.items(), key=lambda item: item[1], reverse=True)[:top]
+    alocadores = []
+    for chave, tamanho in maiores:
+        arquivo, _, linha = chave.rpartition(':')
+        codigo = linecache.getline(os.path.join(RAIZ, arquivo), int(linha)).strip() if linha.isdigit() else ''
+        alocadores.append({'location': chave, 'mb': tamanho / 1024 ** 2, 'code': codigo})
+
+    resultado.update({
+        'traced_peak_mb': pico_rastreado / 1024 ** 2,
+        'sections_mb': {secao: tamanho / 1024 ** 2 for secao, tamanho in por_secao.items()},
+        'top_allocators': alocadores,
+    })
+    return resultado
+
+
+def load_budget(path=BUDGET_PATH):
+    """Lê os limites de RSS (MB) por página e tamanho de dataset."""
+    with open(path, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+
+def budget_for(budget, page, rows):
+    """
+    Limite de RSS em MB para uma página e tamanho de dataset.
+
+    Procura `budget['pages'][page][str(rows)]`, depois
+    `budget['pages'][page]['*']`, depois `budget['default'][str(rows)]` e por
+    fim `budget['default']['*']`. Retorna None se nada for encontrado.
+    """
+    for grupo in (budget.get('pages', {}).get(page, {}), budget.get('default', {})):
+        for chave in (str(rows), '*'):
+            if chave in grupo:
+                return grupo[chave]
+    return None
+
+
+def run_child(page, csv, pasta, top, trace):
+    """Executa `profile_page` em um processo novo com o dataset `csv`."""
+    env = dict(os.environ)
+    env['ZOMATO_DATASET'] = csv
+    env['ZOMATO_QUARANTINE'] = os.path.join(pasta, 'quarantine.parquet')
+    env['ZOMATO_SNAPSHOT_ON_LOAD'] = '0'
+    # Sem cache em disco: um pickle do `load_data` ou do mapa esconderia o
+    # pico real, e a segunda execução (sem tracemalloc) leria o da primeira
+    env['ZOMATO_CACHE'] = ''
+    env['PYTHONPATH'] = RAIZ + os.pathsep + env.get('PYTHONPATH', '')
+    comando = [sys.executable, '-m', 'benchmarks.memprofile', '--child', page, '--top', str(top)]
+    if trace:
+        comando.append('--trace')
+    saida = subprocess.run(comando, cwd=RAIZ, env=env, capture_output=True, text=True, check=True)
+    return json.loads(saida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000],
+                        help='tamanhos dos datasets sintéticos')
+    parser.add_argument('--pages', nargs='+', default=None, help='páginas (padrão: todas)')
+    parser.add_argument('--top', type=int, default=10, help='alocadores listados por página')
+    parser.add_argument('--budget', default=BUDGET_PATH, help='arquivo JSON com os limites')
+    parser.add_argument('--output', default=None, help='grava o relatório completo em JSON')
+    parser.add_argument('--child', default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--trace', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(profile_page(args.child, args.top, args.trace)))
+        return
+
+    from zomato import pipeline, synthetic
+
+    budget = load_budget(args.budget)
+    paginas = args.pages or list_pages()
+    raw = pipeline.read_raw(os.path.join(RAIZ, 'dataset', 'zomato.csv'))
+    relatorio = []
+    estourou = False
+
+    with tempfile.TemporaryDirectory() as pasta:
+        for linhas in args.rows:
+            csv = synthetic.write_scaled_csv(raw, linhas, os.path.join(pasta, f'zomato_{linhas}.csv'))
+            for pagina in paginas:
+                resultado = run_child(pagina, csv, pasta, args.top, trace=True)
+                # O pico de RSS vem de uma execução sem tracemalloc
+                resultado.update(run_child(pagina, csv, pasta, args.top, trace=False))
+                limite = budget_for(budget, pagina, linhas)
+                rss = resultado['peak_rss_mb']
+                acima = limite is not None and rss is not None and rss > limite
+                estourou = estourou or acima
+                relatorio.append(dict(resultado, page=pagina, rows=linhas, budget_mb=limite, over_budget=acima))
+
+                situacao = 'ACIMA DO LIMITE' if acima else 'ok'
+                rss_texto = f'{rss:8.1f}' if rss is not None else '     n/d'
+                print(f'{pagina:28s} {linhas:>10,} linhas  RSS {rss_texto} MB '
+                      f'(limite {limite}) tracemalloc {resultado["traced_peak_mb"]:7.1f} MB '
+                      f'{resultado["seconds"]:6.1f}s  {situacao}')
+                if resultado['exception']:
+                    print('    exceção:', resultado['exception'][0])
+                for secao, tamanho in sorted(resultado['sections_mb'].items(), key=lambda item: -item[1]):
+                    print(f'    seção {secao:40s} {tamanho:8.1f} MB')
+                for alocador in resultado['top_allocators'][:5]:
+                    print(f'    {alocador["location"]:40s} {alocador["mb"]:8.1f} MB  {alocador["code"][:60]}')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, indent=2, ensure_ascii=False)
+    if estourou:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,188 @@
+"""
+Código de referência: o tratamento e os cálculos das páginas como eram
+antes das otimizações (Home.py, pages/paises.py, pages/cidades.py e
+pages/cuisines.py do commit inicial).
+
+As funções copiam as linhas originais sem alterações de comportamento, só
+envolvidas em funções. Não devem ser "corrigidas" nem otimizadas: são o
+gabarito de `benchmarks.differential`, e qualquer diferença de um caminho
+rápido em relação a elas é um erro do caminho rápido.
+"""
+import pandas as pd
+
+
+#==================================
+# Home.py: funções de tratamento
+#==================================
+def country_name(country_id):
+    """Nome do país pelo código; "Unknown" se o código não for encontrado."""
+    COUNTRIES = {
+        1: "India", 14: "Australia", 30: "Brazil", 37: "Canada", 94: "Indonesia",
+        148: "New Zeland", 162: "Philippines", 166: "Qatar", 184: "Singapure",
+        189: "South Africa", 191: "Sri Lanka", 208: "Turkey", 214: "United Arab Emirates",
+        215: "England", 216: "United States of America",
+    }
+    return COUNTRIES.get(country_id, "Unknown")
+
+
+def create_price_type(price_range):
+    """Categoria da faixa de preço; qualquer valor fora de 1 a 3 vira "gourmet"."""
+    if price_range == 1:
+        return "cheap"
+    elif price_range == 2:
+        return "normal"
+    elif price_range == 3:
+        return "expensive"
+    else:
+        return "gourmet"
+
+
+def color_name(color_code):
+    """Nome da cor pelo código hexadecimal; "unknown" se não for encontrado."""
+    COLORS = {
+        "3F7E00": "darkgreen", "5BA829": "green", "9ACD32": "lightgreen",
+        "CDD614": "orange", "FFBA00": "red", "CBCBC8": "darkred", "FF7800": "darkred",
+    }
+    return COLORS.get(color_code, "unknown")
+
+
+def rename_columns(dataframe):
+    """Cópia do DataFrame com as colunas em snake_case."""
+    df = dataframe.copy()
+    df.columns = df.columns.str.lower().str.replace(' ', '_')
+    return df
+
+
+def clean(raw):
+    """
+    Passos 1 a 9 do tratamento original do Home.py.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos (não são alterados).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados tratados como no dashboard original.
+    """
+    df = raw.copy()
+
+    # 1. Remoção de duplicatas
+    df = df.drop_duplicates(subset='Restaurant ID')
+
+    # 2. Tratamento de valores nulos
+    df['Cuisines'] = df['Cuisines'].fillna('Not Informed')
+    df['Rating text'] = df['Rating text'].fillna('Not Rated')
+    df['Average Cost for two'] = df['Average Cost for two'].fillna(0)
+
+    # 3. Conversão de tipos
+    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
+    df['Average Cost for two'] = pd.to_numeric(df['Average Cost for two'], errors='coerce')
+    df['Aggregate rating'] = pd.to_numeric(df['Aggregate rating'], errors='coerce')
+
+    # 4. Substituição de códigos por nomes
+    df['country_name'] = df['Country Code'].apply(country_name)
+    df['Price Category'] = df['Price range'].apply(create_price_type)
+    df['Color Name'] = df['Rating color'].apply(color_name)
+
+    # 5. Tratamento da coluna Cuisines (pegando apenas a primeira culinária)
+    df['Cuisines'] = df['Cuisines'].apply(lambda x: str(x).split(',')[0].strip())
+
+    # 6. Renomeação das colunas para snake_case
+    df = rename_columns(df)
+    # Após renomeação, ajuste o nome da coluna 'country_name' para 'country'
+    df.rename(columns={'country_name': 'country'}, inplace=True)
+
+    # 7. Remoção de colunas redundantes ou desnecessárias
+    colunas_para_remover = ['country_code', 'rating_color', 'switch_to_order_menu']
+    df = df.drop(columns=colunas_para_remover)
+
+    # 8. Ordenação do dataframe
+    df = df.sort_values('restaurant_id')
+
+    # 9. Reset do índice
+    df = df.reset_index(drop=True)
+    return df
+
+
+#==================================
+# Cálculos das páginas
+#==================================
+def home_metrics(df):
+    """Métricas do topo do Home.py."""
+    return {
+        'restaurants': int(df['restaurant_id'].nunique()),
+        'countries': int(df['country'].nunique()),
+        'cities': int(df['city'].nunique()),
+        'votes': df['votes'].sum(),
+        'cuisines': int(df['cuisines'].nunique()),
+    }
+
+
+def country_rankings(df):
+    """
+    Rankings de pages/paises.py (antes do `.head(6)`), como Series país -> valor.
+
+    As médias já vêm com o `.round(2)` aplicado pela página.
+    """
+    country_counts = df['country'].value_counts().reset_index()
+    country_counts.columns = ['País', 'Quantidade de Restaurantes']
+
+    city_counts = df.groupby('country')['city'].nunique().reset_index()
+    city_counts.columns = ['País', 'Quantidade de Cidades']
+
+    average_votes = df.groupby('country')['votes'].mean().reset_index()
+    average_votes.columns = ['País', 'Média de Avaliações']
+    average_votes['Média de Avaliações'] = average_votes['Média de Avaliações'].round(2)
+
+    average_cost = df.groupby('country')['average_cost_for_two'].mean().reset_index()
+    average_cost.columns = ['País', 'Média de Preço para Duas Pessoas']
+    average_cost['Média de Preço para Duas Pessoas'] = average_cost['Média de Preço para Duas Pessoas'].round(2)
+
+    return {
+        'restaurants': country_counts.set_index('País')['Quantidade de Restaurantes'],
+        'cities': city_counts.set_index('País')['Quantidade de Cidades'],
+        'votes_mean': average_votes.set_index('País')['Média de Avaliações'],
+        'cost_mean': average_cost.set_index('País')['Média de Preço para Duas Pessoas'],
+    }
+
+
+def city_cuisine_counts(df):
+    """Culinárias distintas por cidade, sem "Not Informed" (pages/cidades.py)."""
+    df_filtrado_culinarias = df[df['cuisines'] != 'Not Informed']
+    top_culinarias = df_filtrado_culinarias.groupby('city')['cuisines'].nunique().reset_index()
+    top_culinarias.columns = ['Cidade', 'Quantidade de Culinárias Distintas']
+    return top_culinarias.set_index('Cidade')['Quantidade de Culinárias Distintas']
+
+
+def best_by_cuisine(df, paises_selectbox, culinarias_selectbox):
+    """
+    Melhor restaurante de cada culinária, 5 melhores culinárias (pages/cuisines.py).
+
+    Returns
+    -------
+    pandas.DataFrame or None
+        None quando a página não mostra o ranking (nenhuma culinária
+        selecionada ou filtro vazio).
+    """
+    if not culinarias_selectbox:
+        return None
+    if paises_selectbox != 'Todos os Países':
+        filtered_restaurants = df[(df['country'] == paises_selectbox) & (df['cuisines'].isin(culinarias_selectbox))]
+    else:
+        filtered_restaurants = df[df['cuisines'].isin(culinarias_selectbox)]
+    if filtered_restaurants.empty:
+        return None
+    best_rated_cuisines = filtered_restaurants.loc[filtered_restaurants.groupby('cuisines')['aggregate_rating'].idxmax()]
+    return best_rated_cuisines.nlargest(5, 'aggregate_rating')
+
+
+def best_overall(df, paises_selectbox, quantidade_restaurantes):
+    """Os melhores restaurantes do país selecionado (pages/cuisines.py)."""
+    if paises_selectbox != 'Todos os Países':
+        filtered_restaurants = df[df['country'] == paises_selectbox]
+    else:
+        filtered_restaurants = df
+    return filtered_restaurants.nlargest(quantidade_restaurantes, 'aggregate_rating')
@@ -0,0 +1,155 @@
+import streamlit as st
+from PIL import Image
+
+from zomato import features
+from zomato.charts import bar_chart, bar_spec, figure, heatmap_spec
+from zomato.ui import load_country_features
+
+st.set_page_config(
+    page_title='Comparar Países',
+    page_icon='⚖️',
+    layout='wide'
+    )
+
+# Matriz de características por país, montada uma única vez
+caracteristicas = load_country_features()
+matriz = caracteristicas['matrix']
+
+# Cores das faixas de nota, da sem nota à excelente (como as cores do Zomato)
+CORES_NOTA = ['#CBCBC8', '#FF7800', '#FFBA00', '#9ACD32', '#5BA829', '#3F7E00']
+CORES_PRECO = ['lightgreen', 'lightblue', 'orange', 'red']
+CORES_SERVICOS = ['lightblue', 'lightgreen', 'orange']
+
+
+def barras_por_pais(tabela, titulo, cores, barmode):
+    """
+    Gráfico com uma série de barras por coluna da tabela (frações de 0 a 1).
+
+    `barmode` 'stack' empilha as faixas de uma distribuição; 'group' põe
+    taxas independentes lado a lado.
+    """
+    spec = None
+    for coluna, cor in zip(tabela.columns, cores):
+        dados = tabela[coluna].rename('valor').rename_axis('país').reset_index()
+        parcial = bar_spec(dados, x='país', y='valor', title=titulo, labels={'país': 'País', 'valor': coluna},
+                           color=cor, line_color='white', texttemplate='%{y:.0%}',
+                           textposition='inside' if barmode == 'stack' else 'outside',
+                           layout={'barmode': barmode, 'yaxis': {'tickformat': '.0%'}})
+        parcial['data'][0]['name'] = coluna
+        if spec is None:
+            spec = parcial
+        else:
+            spec['data'].append(parcial['data'][0])
+    return figure(spec)
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' ⚖️ Comparação entre Países')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+paises_multiselect = st.sidebar.multiselect(
+    'Países',
+    options=list(matriz.index),
+    default=list(matriz['restaurants'].nlargest(4).index),
+    key='comparacao_paises'
+)
+
+if not paises_multiselect:
+    st.write('Selecione ao menos um país.')
+    st.stop()
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+# Cada seção é uma fatia da matriz: nenhuma volta ao dataset
+resumo = features.compare_countries(caracteristicas, paises_multiselect, 'summary')
+
+with st.container():
+    st.markdown('### Indicadores Lado a Lado')
+    tabela = resumo.assign(**{'Moeda': caracteristicas['currency'].loc[resumo.index]})
+    st.dataframe(tabela.round(2).T.astype(str), use_container_width=True)
+    st.caption('O preço para dois está na moeda de cada país. Para comparar o nível de preço entre países, '
+               'use a faixa de preço média: o Zomato classifica cada restaurante de 1 a 4 em relação ao '
+               'próprio mercado.')
+
+with st.container():
+    st.markdown("""---""")
+    grafico = resumo.rename_axis('País').reset_index()
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        fig_restaurantes = bar_chart(
+            grafico, x='País', y='Restaurantes', text='Restaurantes',
+            title='Quantidade de Restaurantes', color='lightblue'
+        )
+        st.plotly_chart(fig_restaurantes, use_container_width=True)
+
+    with col2:
+        fig_cidades = bar_chart(
+            grafico, x='País', y='Cidades', text='Cidades',
+            title='Quantidade de Cidades', color='lightgreen'
+        )
+        st.plotly_chart(fig_cidades, use_container_width=True)
+
+with st.container():
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        fig_votos = bar_chart(
+            grafico, x='País', y='Avaliações por Restaurante', text='Avaliações por Restaurante',
+            title='Média de Avaliações por Restaurante', color='lightblue', texttemplate='%{text:.2f}'
+        )
+        st.plotly_chart(fig_votos, use_container_width=True)
+
+    with col2:
+        fig_preco = bar_chart(
+            grafico, x='País', y='Faixa de Preço Média (1 a 4)', text='Faixa de Preço Média (1 a 4)',
+            title='Faixa de Preço Média (1 a 4)', color='lightgreen', texttemplate='%{text:.2f}'
+        )
+        st.plotly_chart(fig_preco, use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        notas = features.compare_countries(caracteristicas, paises_multiselect, 'rating')
+        st.plotly_chart(barras_por_pais(notas, 'Distribuição das Notas', CORES_NOTA, 'stack'),
+                        use_container_width=True)
+
+    with col2:
+        precos = features.compare_countries(caracteristicas, paises_multiselect, 'price')
+        st.plotly_chart(barras_por_pais(precos, 'Categorias de Preço', CORES_PRECO, 'stack'),
+                        use_container_width=True)
+
+with st.container():
+    servicos = features.compare_countries(caracteristicas, paises_multiselect, 'services')
+    st.plotly_chart(barras_por_pais(servicos, 'Restaurantes com Cada Serviço', CORES_SERVICOS, 'group'),
+                    use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+    culinarias = features.compare_countries(caracteristicas, paises_multiselect, 'cuisines')
+    fig_culinarias = figure(heatmap_spec(
+        culinarias,
+        title=f'Mix de Culinárias ({features.N_CULINARIAS} Mais Comuns no Dataset)',
+        labels={'x': 'Culinária', 'y': 'País', 'z': 'Fração dos restaurantes'},
+        texttemplate='%{z:.0%}',
+        layout={'height': 120 + 45 * len(culinarias)}
+    ))
+    st.plotly_chart(fig_culinarias, use_container_width=True)
+    st.caption('Cada restaurante conta pela primeira culinária informada.')
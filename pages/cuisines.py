@@ -13,90 +13,26 @@ import folium
 from streamlit_folium import folium_static
 from folium.plugins import MarkerCluster
 
+from zomato import storage
+from zomato.charts import bar_chart, figure, heatmap_spec
+from zomato.cooccurrence import cooccurrence, partners, top_matrix
+from zomato.export import filter_positions
+from zomato.paging import SORT_KEYS, filtered_order, get_page, n_pages
+from zomato.ui import (download_buttons, download_query_buttons, load_cuisine_incidence, load_dataset,
+                       load_sort_index, load_storage)
+
 st.set_page_config(
     page_title='Cozinhas', 
     page_icon='🍽️', 
     layout='wide'
     )
 
-df = pd.read_csv('dataset/zomato.csv')
-
-
-
-# Funções de tratamento
-def country_name(country_id):
-    COUNTRIES = {
-        1: "India", 14: "Australia", 30: "Brazil", 37: "Canada", 94: "Indonesia", 
-        148: "New Zeland", 162: "Philippines", 166: "Qatar", 184: "Singapure", 
-        189: "South Africa", 191: "Sri Lanka", 208: "Turkey", 214: "United Arab Emirates", 
-        215: "England", 216: "United States of America",
-    }
-    return COUNTRIES.get(country_id, "Unknown")
-
-def create_price_type(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-def color_name(color_code):
-    COLORS = {
-        "3F7E00": "darkgreen", "5BA829": "green", "9ACD32": "lightgreen",
-        "CDD614": "orange", "FFBA00": "red", "CBCBC8": "darkred", "FF7800": "darkred",
-    }
-    return COLORS.get(color_code, "unknown")
-
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
-    return df
-
-# 1. Remoção de duplicatas
-df = df.drop_duplicates(subset='Restaurant ID')
-
-
-# 2. Tratamento de valores nulos
-df['Cuisines'] = df['Cuisines'].fillna('Not Informed')
-df['Rating text'] = df['Rating text'].fillna('Not Rated')
-df['Average Cost for two'] = df['Average Cost for two'].fillna(0)
-
-# 3. Conversão de tipos
-df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
-df['Average Cost for two'] = pd.to_numeric(df['Average Cost for two'], errors='coerce')
-df['Aggregate rating'] = pd.to_numeric(df['Aggregate rating'], errors='coerce')
-
-# 4. Substituição de códigos por nomes
-df['country_name'] = df['Country Code'].apply(country_name)
-df['Price Category'] = df['Price range'].apply(create_price_type)
-df['Color Name'] = df['Rating color'].apply(color_name)
-
-
-# 5. Tratamento da coluna Cuisines (pegando apenas a primeira culinária)
-df['Cuisines'] = df['Cuisines'].apply(lambda x: str(x).split(',')[0].strip())
-
-# 6. Renomeação das colunas para snake_case
-df = rename_columns(df)
-# Após renomeação, ajuste o nome da coluna 'country_name' para 'country'
-df.rename(columns={'country_name': 'country'}, inplace=True)
-
-# 7. Remoção de colunas redundantes ou desnecessárias
-colunas_para_remover = ['country_code', 'rating_color', 'switch_to_order_menu']
-df = df.drop(columns=colunas_para_remover)
-
-# 8. Ordenação do dataframe
-df = df.sort_values('restaurant_id')
-
-# 9. Reset do índice
-df = df.reset_index(drop=True)
-
-# Verificação dos dados tratados
-#print("Shape após tratamento:", df.shape)
-#print("\nInformações do DataFrame:")
-#print(df.info())
+# Banco SQLite (ZOMATO_DB): filtros, rankings e exportação viram consultas e o
+# DataFrame não fica em memória; None = tudo em pandas
+pool = load_storage()
+if pool is None:
+    # Dados tratados e agregações por país/cidade (calculados uma única vez)
+    df, agregados = load_dataset()
 
 
 
@@ -117,7 +53,8 @@ st.sidebar.markdown('### Elegant Restaurant')
 st.sidebar.markdown('## Food Experience')
 st.sidebar.markdown("""---""")
 
-options = ['Todos os Países'] + sorted(df['country'].unique())
+paises = storage.distinct(pool, 'country') if pool is not None else sorted(df['country'].unique())
+options = ['Todos os Países'] + paises
 # Filtro de seleção de país na barra lateral
 paises_selectbox = st.sidebar.selectbox(
     'Selecione o País',
@@ -133,12 +70,22 @@ quantidade_restaurantes = st.sidebar.slider(
     value=10
 )
 
-# Obtém as opções de culinária
-cuisine_options = sorted(df['cuisines'].unique())
+# Restaurantes marcados por zomato.anomalies saem dos rankings
+ocultar_anomalias = st.sidebar.toggle('Ocultar anomalias nos rankings', value=True,
+                                      key='cuisines_ocultar_anomalias')
+if pool is not None:
+    cuisine_options = storage.distinct(pool, 'cuisines')
+    top_cuisines = storage.best_by_cuisine(pool, ['cuisines'], 5, exclude_anomalies=ocultar_anomalias)
+    top_cuisines = top_cuisines['cuisines'].tolist()
+else:
+    df_ranking = df[df['anomaly_flags'] == 0] if ocultar_anomalias else df
 
-# Filtra as melhores culinárias com base nas avaliações
-best_rated_cuisines = df.loc[df.groupby('cuisines')['aggregate_rating'].idxmax()]
-top_cuisines = best_rated_cuisines.nlargest(5, 'aggregate_rating')['cuisines'].tolist()
+    # Obtém as opções de culinária
+    cuisine_options = sorted(df['cuisines'].unique())
+
+    # Filtra as melhores culinárias com base nas avaliações
+    best_rated_cuisines = df_ranking.loc[df_ranking.groupby('cuisines')['aggregate_rating'].idxmax()]
+    top_cuisines = best_rated_cuisines.nlargest(5, 'aggregate_rating')['cuisines'].tolist()
 
 # Seleciona as melhores como padrão
 default_selection = top_cuisines
@@ -160,21 +107,30 @@ with st.container():
 
 
 
+# País do filtro (None = todos)
+pais_filtro = paises_selectbox if paises_selectbox != 'Todos os Países' else None
+
 # Filtra o DataFrame com base nas seleções do usuário
 if culinarias_selectbox:
-    # Filtra por país se não for "Todos os Países"
-    if paises_selectbox != 'Todos os Países':
-        filtered_restaurants = df[(df['country'] == paises_selectbox) & (df['cuisines'].isin(culinarias_selectbox))]
+    if pool is not None:
+        # Melhor restaurante de cada culinária calculado no banco
+        top_cuisines = storage.best_by_cuisine(pool, ['cuisines', 'restaurant_name', 'aggregate_rating'], 5,
+                                               pais_filtro, culinarias_selectbox, ocultar_anomalias)
     else:
-        filtered_restaurants = df[df['cuisines'].isin(culinarias_selectbox)]
-    
-    # Encontra as melhores avaliações por culinária nas opções filtradas
-    if not filtered_restaurants.empty:
+        # Filtra por país se não for "Todos os Países"
+        if paises_selectbox != 'Todos os Países':
+            filtered_restaurants = df_ranking[(df_ranking['country'] == paises_selectbox)
+                                              & (df_ranking['cuisines'].isin(culinarias_selectbox))]
+        else:
+            filtered_restaurants = df_ranking[df_ranking['cuisines'].isin(culinarias_selectbox)]
+
+        # Encontra as melhores avaliações por culinária nas opções filtradas
         best_rated_cuisines = filtered_restaurants.loc[filtered_restaurants.groupby('cuisines')['aggregate_rating'].idxmax()]
-        
+
         # Ordena as culinárias por avaliação e seleciona as 5 melhores
         top_cuisines = best_rated_cuisines.nlargest(5, 'aggregate_rating')
-        
+
+    if not top_cuisines.empty:
         # Cria 5 colunas para exibir a melhor avaliação de cada culinária
         col1, col2, col3, col4, col5 = st.columns(5, gap='large')
 
@@ -226,31 +182,172 @@ with st.container():
     # Define o título com base na quantidade de restaurantes a serem exibidos
     st.markdown(f"### Top {quantidade_restaurantes} Melhores Restaurantes:")
 
-    # Aplica o filtro de país se selecionado
-    if paises_selectbox != 'Todos os Países':
-        # Filtra para o país selecionado
-        filtered_restaurants = df[df['country'] == paises_selectbox]
+    colunas_ranking = ['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two', 'aggregate_rating']
+    if pool is not None:
+        # Só as linhas do ranking saem do banco
+        best_overall = storage.top_restaurants(pool, colunas_ranking, quantidade_restaurantes, pais_filtro,
+                                               exclude_anomalies=ocultar_anomalias)
     else:
-        # Se "Todos os Países" estiver selecionado, use o DataFrame completo
-        filtered_restaurants = df
+        # Aplica o filtro de país se selecionado
+        if paises_selectbox != 'Todos os Países':
+            # Filtra para o país selecionado
+            filtered_restaurants = df_ranking[df_ranking['country'] == paises_selectbox]
+        else:
+            # Se "Todos os Países" estiver selecionado, use o DataFrame completo
+            filtered_restaurants = df_ranking
 
-    # Filtra os melhores restaurantes de acordo com a avaliação
-    best_overall = filtered_restaurants.nlargest(quantidade_restaurantes, 'aggregate_rating')
+        # Filtra os melhores restaurantes de acordo com a avaliação
+        best_overall = filtered_restaurants.nlargest(quantidade_restaurantes, 'aggregate_rating')
 
     # Verifica se há restaurantes disponíveis após o filtro
     if best_overall.empty:
         st.markdown("Nenhum restaurante encontrado para o país selecionado.")
     else:
         # Mostra as colunas desejadas
-        st.dataframe(best_overall[['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two', 'aggregate_rating']])
+        st.dataframe(best_overall[colunas_ranking])
+    if ocultar_anomalias:
+        n_anomalias = storage.count_anomalies(pool) if pool is not None else int((df['anomaly_flags'] > 0).sum())
+        st.caption(f"{n_anomalias} restaurantes com anomalias (nota fora do padrão, "
+                   "poucas avaliações, anúncio duplicado ou texto incoerente) ficam fora dos rankings.")
+
+    # Exporta o ranking completo do país selecionado (não só as linhas exibidas)
+    with st.expander('Exportar ranking'):
+        faixa_nota = st.slider('Faixa de nota', min_value=0.0, max_value=5.0, value=(0.0, 5.0), step=0.1,
+                               key='cuisines_exportar_notas')
+        colunas_exportacao = ['restaurant_id', 'restaurant_name', 'country', 'city', 'cuisines',
+                              'average_cost_for_two', 'aggregate_rating', 'votes']
+        if pool is not None:
+            # Linhas lidas do banco em blocos, já na ordem da tabela
+            download_query_buttons(pool, 'melhores_restaurantes', 'cuisines_exportar', colunas_exportacao,
+                                   pais_filtro, faixa_nota[0], faixa_nota[1])
+        else:
+            posicoes = filter_positions(
+                df,
+                countries=[paises_selectbox] if paises_selectbox != 'Todos os Países' else None,
+                min_rating=faixa_nota[0],
+                max_rating=faixa_nota[1]
+            )
+            # Mesma ordem da tabela: maiores notas primeiro
+            posicoes = posicoes[np.argsort(-df['aggregate_rating'].to_numpy()[posicoes], kind='stable')]
+            download_buttons(df, posicoes, 'melhores_restaurantes', key='cuisines_exportar',
+                             columns=colunas_exportacao)
 
     
+# Tabela paginada com todos os restaurantes do filtro (país + culinárias selecionadas)
 with st.container():
     st.markdown("""---""")
-    st.markdown("### Top 10 Melhores Tipos de Culinária:")
-    
-    # Calcula a média de avaliação por culinária e arredonda para 1 casa decimal
+    st.markdown("### Todos os Restaurantes do Filtro:")
+
+    col1, col2, col3 = st.columns([2, 1, 1])
+    ordenar_por = col1.selectbox('Ordenar por', options=list(SORT_KEYS), format_func=SORT_KEYS.get,
+                                 key='cuisines_tabela_ordem')
+    tamanho_pagina = col2.selectbox('Linhas por página', options=[25, 50, 100], key='cuisines_tabela_tamanho')
+    crescente = col3.toggle('Ordem crescente', key='cuisines_tabela_crescente')
+
+    colunas_tabela = ['restaurant_name', 'country', 'city', 'cuisines', 'average_cost_for_two',
+                      'aggregate_rating', 'votes']
+    if pool is not None:
+        # Filtro, ordem e LIMIT/OFFSET no banco
+        total_filtro = storage.count(pool, pais_filtro, culinarias_selectbox)
+    else:
+        # Ordem pré-calculada; o filtro só seleciona posições, sem reordenar
+        ordem = filtered_order(
+            load_sort_index(),
+            ordenar_por,
+            country=pais_filtro,
+            cuisines=culinarias_selectbox,
+            ascending=crescente
+        )
+        total_filtro = len(ordem)
+    total_paginas = n_pages(total_filtro, tamanho_pagina)
+
+    # A página guardada pode não existir mais depois de uma troca de filtro
+    if st.session_state.get('cuisines_tabela_pagina', 1) > total_paginas:
+        st.session_state['cuisines_tabela_pagina'] = total_paginas
+    pagina = st.number_input('Página', min_value=1, max_value=total_paginas, step=1,
+                             key='cuisines_tabela_pagina')
+
+    # Só as linhas da página são enviadas ao navegador
+    if pool is not None:
+        linhas_pagina = storage.get_page(pool, colunas_tabela, ordenar_por, pagina, tamanho_pagina,
+                                         pais_filtro, culinarias_selectbox, ascending=crescente)
+    else:
+        linhas_pagina = get_page(df, ordem, pagina, tamanho_pagina, colunas_tabela)
+    st.dataframe(linhas_pagina, use_container_width=True)
+    st.caption(f'Página {pagina} de {total_paginas} ({total_filtro:,} restaurantes)')
+
+with st.container():
+    st.markdown("""---""")
+    st.markdown("### Culinárias Servidas Juntas:")
+
+    # Coocorrência calculada sob demanda para o país/cidade e guardada em cache
+    pais_coocorrencia = None if paises_selectbox == 'Todos os Países' else paises_selectbox
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        if pais_coocorrencia is None:
+            cidades_coocorrencia = []
+        elif pool is not None:
+            cidades_coocorrencia = storage.distinct(pool, 'city', pais_coocorrencia)
+        else:
+            cidades_coocorrencia = sorted(df.loc[df['country'] == pais_coocorrencia, 'city'].dropna().unique())
+        cidade_coocorrencia = st.selectbox(
+            'Cidade',
+            options=['Todas as Cidades'] + cidades_coocorrencia,
+            key='cuisines_coocorrencia_cidade'
+        )
+    matriz = cooccurrence(
+        load_cuisine_incidence(), pais_coocorrencia,
+        None if cidade_coocorrencia == 'Todas as Cidades' else cidade_coocorrencia
+    )
+    with col2:
+        tamanho_matriz = st.slider('Culinárias no mapa de calor', min_value=5, max_value=30, value=15,
+                                   key='cuisines_coocorrencia_tamanho')
+    with col3:
+        culinaria_base = st.selectbox(
+            'Servidas junto com',
+            options=matriz.index.tolist(),
+            index=matriz.index.get_loc('Italian') if 'Italian' in matriz.index else 0,
+            key='cuisines_coocorrencia_base'
+        ) if len(matriz) else None
+
+    if len(matriz) < 2:
+        st.markdown("Poucas culinárias no filtro para calcular a coocorrência.")
+    else:
+        local = cidade_coocorrencia if cidade_coocorrencia != 'Todas as Cidades' else paises_selectbox
+        fig_coocorrencia = figure(heatmap_spec(
+            top_matrix(matriz, tamanho_matriz),
+            title=f'Restaurantes que Servem as Duas Culinárias ({local})',
+            labels={'x': 'Culinária', 'y': 'Culinária', 'z': 'Restaurantes'},
+            texttemplate='%{z:.0f}',
+            layout={'height': 650}
+        ))
+        st.plotly_chart(fig_coocorrencia, use_container_width=True)
+
+        parceiras = partners(matriz, culinaria_base)
+        if parceiras.empty:
+            st.markdown(f"Nenhuma culinária servida junto com {culinaria_base}.")
+        else:
+            fig_parceiras = bar_chart(
+                parceiras.assign(percentual=parceiras['share'] * 100),
+                x='cuisine',
+                y='percentual',
+                text='percentual',
+                labels={'cuisine': 'Culinária', 'percentual': f'% dos restaurantes de {culinaria_base}'},
+                title=f'Culinárias Servidas Junto com {culinaria_base} ({local})',
+                color='lightblue',
+                texttemplate='%{text:.1f}%'
+            )
+            st.plotly_chart(fig_parceiras, use_container_width=True)
+
+# Calcula a média de avaliação por culinária e arredonda para 1 casa decimal
+if pool is not None:
+    average_ratings = storage.cuisine_ratings(pool).round(1)
+else:
     average_ratings = df.groupby('cuisines', as_index=False)['aggregate_rating'].mean().round(1)
+
+with st.container():
+    st.markdown("""---""")
+    st.markdown("### Top 10 Melhores Tipos de Culinária:")
     
     # Seleciona as 10 melhores culinárias com base na média de avaliação
     top_cuisines = average_ratings.nlargest(10, 'aggregate_rating')     
@@ -281,9 +378,6 @@ with st.container():
     st.markdown("""---""")
     st.markdown("### Top 10 Piores Tipos de Culinária:")
     
-    # Calcula a média de avaliação por culinária e arredonda para 1 casa decimal
-    average_ratings = df.groupby('cuisines', as_index=False)['aggregate_rating'].mean().round(1)
-    
     # Seleciona as 10 piores culinárias com base na média de avaliação
     bottom_cuisines = average_ratings.nsmallest(10, 'aggregate_rating')
     
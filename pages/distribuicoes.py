@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from PIL import Image
+
+from zomato import distributions
+from zomato.charts import bar_chart
+from zomato.ui import load_distributions
+
+st.set_page_config(
+    page_title='Distribuições',
+    page_icon='📊',
+    layout='wide'
+    )
+
+# Contagens por (país, cidade, faixa de preço) x bucket, montadas uma única vez
+dist = load_distributions()
+grupos = dist['groups']
+
+NOMES_FAIXAS = {'cheap': 'Barato', 'normal': 'Normal', 'expensive': 'Caro', 'gourmet': 'Gourmet'}
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 📊 Distribuições')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+metrica_radio = st.sidebar.radio(
+    'Métrica',
+    options=list(distributions.METRICAS),
+    format_func=lambda coluna: distributions.METRICAS[coluna][0],
+    key='distribuicoes_metrica'
+)
+
+# Filtros vazios equivalem a "todos"
+paises_multiselect = st.sidebar.multiselect(
+    'Países',
+    options=sorted(grupos['country'].unique()),
+    key='distribuicoes_paises'
+)
+cidades_disponiveis = grupos['city'] if not paises_multiselect else \
+    grupos.loc[grupos['country'].isin(paises_multiselect), 'city']
+cidades_multiselect = st.sidebar.multiselect(
+    'Cidades',
+    options=sorted(cidades_disponiveis.dropna().unique()),
+    key='distribuicoes_cidades'
+)
+faixas_multiselect = st.sidebar.multiselect(
+    'Faixas de preço',
+    options=distributions.PRICE_CATEGORIES,
+    format_func=NOMES_FAIXAS.get,
+    key='distribuicoes_faixas'
+)
+barras_slider = st.sidebar.slider('Quantidade de barras', min_value=5, max_value=60, value=30,
+                                  key='distribuicoes_barras')
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+
+nome_metrica = distributions.METRICAS[metrica_radio][0]
+valores = dist[metrica_radio]['values']
+selecao = distributions.select_groups(dist, paises_multiselect, cidades_multiselect, faixas_multiselect)
+contagens = distributions.histogram(dist, metrica_radio, selecao)
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2, col3, col4 = st.columns(4, gap='large')
+    col1.metric('Restaurantes', f'{int(contagens.sum()):,}')
+    col2.metric('Mediana', f'{distributions.quantile(contagens, valores, 0.5):,.2f}')
+    col3.metric('p90', f'{distributions.quantile(contagens, valores, 0.9):,.2f}')
+    col4.metric('Máximo', f'{valores[np.flatnonzero(contagens)[-1]]:,.2f}' if contagens.any() else '-')
+    if metrica_radio == 'average_cost_for_two' and len(set(grupos.loc[selecao, 'country'])) > 1:
+        st.caption('Os preços estão na moeda local de cada país.')
+
+with st.container():
+    # Histograma com barras ajustadas ao intervalo dos dados filtrados
+    bordas, barras = distributions.rebin(contagens, valores, barras_slider)
+    histograma = pd.DataFrame({
+        'faixa': [f'{inicio:,.1f} - {fim:,.1f}' for inicio, fim in zip(bordas[:-1], bordas[1:])],
+        'restaurants': barras,
+    })
+    fig_histograma = bar_chart(
+        histograma,
+        x='faixa',
+        y='restaurants',
+        labels={'faixa': nome_metrica, 'restaurants': 'Número de Restaurantes'},
+        title=f'Distribuição de {nome_metrica}',
+        color='lightblue',
+        layout={'bargap': 0.05, 'xaxis': {'title': {'text': nome_metrica}}}
+    )
+    st.plotly_chart(fig_histograma, use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2 = st.columns(2, gap='large')
+
+    # Mediana e p90 por faixa de preço e por país, somando as contagens dos grupos
+    with col1:
+        por_faixa = distributions.summarize(dist, metrica_radio, selecao, 'price_category')
+        por_faixa = por_faixa.reindex([faixa for faixa in distributions.PRICE_CATEGORIES
+                                       if faixa in por_faixa.index]).reset_index()
+        por_faixa['price_category'] = por_faixa['price_category'].map(NOMES_FAIXAS)
+        fig_faixas = bar_chart(
+            por_faixa,
+            x='price_category',
+            y='median',
+            text='median',
+            labels={'price_category': 'Faixa de Preço', 'median': f'Mediana de {nome_metrica}'},
+            title=f'Mediana de {nome_metrica} por Faixa de Preço',
+            color='lightgreen',
+            line_color='white',
+            texttemplate='%{text:.2f}'
+        )
+        st.plotly_chart(fig_faixas, use_container_width=True)
+
+    with col2:
+        nivel = 'city' if paises_multiselect else 'country'
+        por_local = distributions.summarize(dist, metrica_radio, selecao, nivel).reset_index()
+        tabela = por_local.sort_values('restaurants', ascending=False).round(2)
+        tabela.columns = ['Cidade' if nivel == 'city' else 'País', 'Restaurantes', 'Mediana', 'p90']
+        st.markdown(f"### {nome_metrica} por {'Cidade' if nivel == 'city' else 'País'}")
+        st.dataframe(tabela, hide_index=True, use_container_width=True)
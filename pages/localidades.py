@@ -0,0 +1,119 @@
+import streamlit as st
+import plotly.express as px
+from PIL import Image
+
+from zomato.charts import BASE_LAYOUT, TEMPLATE_NAME, bar_chart
+from zomato.ui import load_locality_rollup
+
+st.set_page_config(
+    page_title='Localidades',
+    page_icon='📍',
+    layout='wide'
+    )
+
+# Tabelas hierárquicas país -> cidade -> localidade (montadas uma única vez)
+rollup = load_locality_rollup()
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 📍 Localidades')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+# Drill-down: país -> cidade (cada passo é um fatiamento do índice do rollup)
+paises_selectbox = st.sidebar.selectbox(
+    'Selecione o País',
+    options=rollup['country'].index.tolist(),
+    key='localidades_pais'
+)
+
+cidades_pais = rollup['city'].loc[paises_selectbox]
+cidades_selectbox = st.sidebar.selectbox(
+    'Selecione a Cidade',
+    options=cidades_pais.sort_values('restaurants', ascending=False).index.tolist(),
+    key='localidades_cidade'
+)
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+
+with st.container():
+    st.markdown("""---""")
+    cidade = cidades_pais.loc[cidades_selectbox]
+
+    col1, col2, col3, col4 = st.columns(4, gap='large')
+    col1.metric('Restaurantes', int(cidade['restaurants']))
+    col2.metric('Localidades', len(rollup['locality'].loc[(paises_selectbox, cidades_selectbox)]))
+    col3.metric('Nota média', f"{cidade['rating_mean']:.2f}")
+    col4.metric('Preço médio para dois', f"{cidade['cost_mean']:.2f}")
+
+# Localidades da cidade selecionada (pequenas localidades somadas em "Outras")
+localidades = rollup['locality'].loc[(paises_selectbox, cidades_selectbox)].reset_index()
+localidades = localidades.sort_values('restaurants', ascending=False)
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        fig_localidades = bar_chart(
+            localidades,
+            x='locality',
+            y='restaurants',
+            text='restaurants',
+            labels={'locality': 'Localidade', 'restaurants': 'Número de Restaurantes'},
+            title=f'Restaurantes por Localidade em {cidades_selectbox}',
+            color='lightblue'
+        )
+        st.plotly_chart(fig_localidades, use_container_width=True)
+
+    with col2:
+        fig_notas = bar_chart(
+            localidades,
+            x='locality',
+            y='rating_mean',
+            text='rating_mean',
+            labels={'locality': 'Localidade', 'rating_mean': 'Nota Média'},
+            title=f'Nota Média por Localidade em {cidades_selectbox}',
+            color='lightgreen',
+            line_color='white',
+            texttemplate='%{text:.2f}',
+            layout={'yaxis': {'range': [0, 5.5]}}
+        )
+        st.plotly_chart(fig_notas, use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+    st.markdown(f"### Culinárias por Localidade em {cidades_selectbox}")
+
+    # Mix de culinárias: uma fatia do rollup por (país, cidade)
+    mix_culinarias = rollup['cuisine'].loc[(paises_selectbox, cidades_selectbox)].reset_index()
+    fig_mix = px.bar(
+        mix_culinarias,
+        x='locality',
+        y='restaurants',
+        color='cuisine',
+        labels={'locality': 'Localidade', 'restaurants': 'Número de Restaurantes', 'cuisine': 'Culinária'},
+        category_orders={'locality': localidades['locality'].tolist()}
+    )
+    fig_mix.update_layout(template=TEMPLATE_NAME, **BASE_LAYOUT)
+    st.plotly_chart(fig_mix, use_container_width=True)
+
+    # Tabela com as métricas de cada localidade
+    tabela = localidades[['locality', 'restaurants', 'rating_mean', 'cost_mean', 'votes_mean']].round(2)
+    tabela.columns = ['Localidade', 'Restaurantes', 'Nota Média', 'Preço Médio para Dois', 'Média de Avaliações']
+    st.dataframe(tabela, hide_index=True, use_container_width=True)
@@ -12,91 +12,17 @@ import folium
 from streamlit_folium import folium_static
 from folium.plugins import MarkerCluster
 
+from zomato.charts import bar_chart
+from zomato.ui import load_aggregates
+
 st.set_page_config(
     page_title='Países', 
     page_icon='🌍', 
     layout='wide'
     )
 
-df = pd.read_csv('dataset/zomato.csv')
-
-
-
-
-
-# Funções de tratamento
-def country_name(country_id):
-    COUNTRIES = {
-        1: "India", 14: "Australia", 30: "Brazil", 37: "Canada", 94: "Indonesia", 
-        148: "New Zeland", 162: "Philippines", 166: "Qatar", 184: "Singapure", 
-        189: "South Africa", 191: "Sri Lanka", 208: "Turkey", 214: "United Arab Emirates", 
-        215: "England", 216: "United States of America",
-    }
-    return COUNTRIES.get(country_id, "Unknown")
-
-def create_price_type(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-
-def color_name(color_code):
-    COLORS = {
-        "3F7E00": "darkgreen", "5BA829": "green", "9ACD32": "lightgreen",
-        "CDD614": "orange", "FFBA00": "red", "CBCBC8": "darkred", "FF7800": "darkred",
-    }
-    return COLORS.get(color_code, "unknown")
-
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    df.columns = df.columns.str.lower().str.replace(' ', '_')
-    return df
-
-# 1. Remoção de duplicatas
-df = df.drop_duplicates(subset='Restaurant ID')
-
-# 2. Tratamento de valores nulos
-df['Cuisines'] = df['Cuisines'].fillna('Not Informed')
-df['Rating text'] = df['Rating text'].fillna('Not Rated')
-df['Average Cost for two'] = df['Average Cost for two'].fillna(0)
-
-# 3. Conversão de tipos
-df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
-df['Average Cost for two'] = pd.to_numeric(df['Average Cost for two'], errors='coerce')
-df['Aggregate rating'] = pd.to_numeric(df['Aggregate rating'], errors='coerce')
-
-# 4. Substituição de códigos por nomes
-df['country_name'] = df['Country Code'].apply(country_name)
-df['Price Category'] = df['Price range'].apply(create_price_type)
-df['Color Name'] = df['Rating color'].apply(color_name)
-
-
-# 5. Tratamento da coluna Cuisines (pegando apenas a primeira culinária)
-df['Cuisines'] = df['Cuisines'].apply(lambda x: str(x).split(',')[0].strip())
-
-# 6. Renomeação das colunas para snake_case
-df = rename_columns(df)
-# Após renomeação, ajuste o nome da coluna 'country_name' para 'country'
-df.rename(columns={'country_name': 'country'}, inplace=True)
-
-# 7. Remoção de colunas redundantes ou desnecessárias
-colunas_para_remover = ['country_code', 'rating_color', 'switch_to_order_menu']
-df = df.drop(columns=colunas_para_remover)
-
-# 8. Ordenação do dataframe
-df = df.sort_values('restaurant_id')
-
-# 9. Reset do índice
-df = df.reset_index(drop=True)
-
-# Verificação dos dados tratados
-#print("Shape após tratamento:", df.shape)
-#print("\nInformações do DataFrame:")
-#print(df.info())
+# Agregações por país/cidade (calculadas uma única vez); a página não usa as linhas do dataset
+agregados = load_aggregates()
 
 
 
@@ -116,7 +42,7 @@ st.sidebar.markdown('### Elegant Restaurant')
 st.sidebar.markdown('## Food Experience')
 st.sidebar.markdown("""---""")
 
-options = ['Todos os Países'] + sorted(df['country'].unique())
+options = ['Todos os Países'] + sorted(agregados['country'].index)
 
 # Filtro de seleção de país na barra lateral
 paises_selectbox = st.sidebar.selectbox(
@@ -139,14 +65,14 @@ with st.container():
     with col1:
         
         # Contagem de restaurantes por país e seleção dos 6 maiores
-        country_counts = df['country'].value_counts().reset_index()
+        country_counts = agregados['country']['restaurants'].reset_index()
         country_counts.columns = ['País', 'Quantidade de Restaurantes']
         country_counts = country_counts.sort_values('Quantidade de Restaurantes', ascending=False).head(6)  # Mantém apenas os 6 primeiros
 
 # ==================================
-# Gráfico de Barras com Plotly Express
+# Gráfico de Barras (tema padrão de zomato.charts)
 # ==================================
-fig = px.bar(
+fig = bar_chart(
     country_counts,
     x='País',
     y='Quantidade de Restaurantes',
@@ -155,23 +81,6 @@ fig = px.bar(
     title='Quantidade de Restaurantes Registrados por País'
 )
 
-# Customização para aproximar do visual da imagem
-fig.update_traces(
-    marker_color='blue',  # Cor das barras
-    marker_line_color='black',  # Cor da borda das barras
-    marker_line_width=1.5,  # Largura da borda
-    textposition='outside'  # Posição do texto fora das barras
-)
-
-fig.update_layout(
-    plot_bgcolor='rgb(22,31,44)',  # Cor de fundo do gráfico
-    paper_bgcolor='rgb(22,31,44)',  # Cor de fundo fora do gráfico
-    font=dict(color='white'),  # Cor do texto
-    title_font=dict(size=18, color='white', family="Arial"),
-    xaxis=dict(title='', color='white', showgrid=False),  # Remove título do eixo x e grades
-    yaxis=dict(title='', color='white', showgrid=False)  # Remove título do eixo y e grades
-)
-
 # ==================================
 # Exibi o gráfico no Streamlit
 # ==================================
@@ -181,14 +90,14 @@ with col2:
     
     # Contagem de cidades únicas por país e seleção dos 6 maiores
     
-    city_counts = df.groupby('country')['city'].nunique().reset_index()
+    city_counts = agregados['country']['n_cities'].reset_index()
     city_counts.columns = ['País', 'Quantidade de Cidades']
     city_counts = city_counts.sort_values('Quantidade de Cidades', ascending=False).head(6)  # Mantém apenas os 6 primeiros
 
 # ==================================
-# Gráfico de Barras com Plotly Express
+# Gráfico de Barras (tema padrão de zomato.charts)
 # ==================================
-fig = px.bar(
+fig = bar_chart(
     city_counts,
     x='País',
     y='Quantidade de Cidades',
@@ -197,23 +106,6 @@ fig = px.bar(
     title='Quantidade de Cidades Registradas por País'
 )
 
-# Customização para aproximar do visual da imagem
-fig.update_traces(
-    marker_color='blue',  # Cor das barras
-    marker_line_color='black',  # Cor da borda das barras
-    marker_line_width=1.5,  # Largura da borda
-    textposition='outside'  # Posição do texto fora das barras
-)
-
-fig.update_layout(
-    plot_bgcolor='rgb(22,31,44)',  # Cor de fundo do gráfico
-    paper_bgcolor='rgb(22,31,44)',  # Cor de fundo fora do gráfico
-    font=dict(color='white'),  # Cor do texto
-    title_font=dict(size=18, color='white', family="Arial"),
-    xaxis=dict(title='', color='white', showgrid=False),  # Remove título do eixo x e grades
-    yaxis=dict(title='', color='white', showgrid=False)  # Remove título do eixo y e grades
-)
-
 # ==================================
 # Exibir o gráfico no Streamlit
 # ==================================
@@ -229,7 +121,7 @@ with st.container():
   
   
 # Cálculo da média de avaliações por país
-       average_votes = df.groupby('country')['votes'].mean().reset_index()
+       average_votes = agregados['country']['votes_mean'].reset_index()
 average_votes.columns = ['País', 'Média de Avaliações']
 
 # Arredonda a coluna "Média de Avaliações" para duas casas decimais
@@ -240,7 +132,7 @@ average_votes = average_votes.sort_values('Média de Avaliações', ascending=Fa
 
 
 # Criação do gráfico de barras
-fig = px.bar(
+fig = bar_chart(
     average_votes,
     x='País',
     y='Média de Avaliações',
@@ -249,24 +141,6 @@ fig = px.bar(
     title='Média de Avaliações Feitas por País '
 )
 
-# Customização do gráfico
-fig.update_traces(
-    
-    marker_color='blue',  # Cor das barras
-    marker_line_color='black',  # Cor da borda das barras
-    marker_line_width=1.5,  # Largura da borda
-    textposition='outside'  # Posição do texto fora das barras
-)
-
-fig.update_layout(
-    plot_bgcolor='rgb(22,31,44)',  # Cor de fundo do gráfico
-    paper_bgcolor='rgb(22,31,44)',  # Cor de fundo fora do gráfico
-    font=dict(color='white'),  # Cor do texto
-    title_font=dict(size=18, color='white', family="Arial"),
-    xaxis=dict(title='', color='white', showgrid=False),  # Remove título do eixo x e grades
-    yaxis=dict(title='', color='white', showgrid=False)  # Remove título do eixo y e grades
-)
-
 # Exibir o gráfico no Streamlit
 st.plotly_chart(fig, use_container_width=True)
 
@@ -275,7 +149,7 @@ with col2:
         # Média de preço de um prato para duas pessoas por país.
         
     # Cálculo da média do preço de um prato para duas pessoas por país
-    average_cost = df.groupby('country')['average_cost_for_two'].mean().reset_index()
+    average_cost = agregados['country']['cost_mean'].reset_index()
 average_cost.columns = ['País', 'Média de Preço para Duas Pessoas']
 
 # Arredonda a média para duas casas decimais
@@ -287,7 +161,7 @@ average_cost = average_cost.sort_values('Média de Preço para Duas Pessoas', as
 
 
 # Criação do gráfico de barras
-fig_cost = px.bar(
+fig_cost = bar_chart(
     average_cost,
     x='País',
     y='Média de Preço para Duas Pessoas',
@@ -296,23 +170,6 @@ fig_cost = px.bar(
     title='Média de Preço de um Prato para Duas Pessoas por País '
 )
 
-# Customização do gráfico
-fig_cost.update_traces(
-    marker_color='blue',  # Cor das barras
-    marker_line_color='black',  # Cor da borda das barras
-    marker_line_width=1.5,  # Largura da borda
-    textposition='outside'  # Posição do texto fora das barras
-)
-
-fig_cost.update_layout(
-    plot_bgcolor='rgb(22,31,44)',  # Cor de fundo do gráfico
-    paper_bgcolor='rgb(22,31,44)',  # Cor de fundo fora do gráfico
-    font=dict(color='white'),  # Cor do texto
-    title_font=dict(size=18, color='white', family="Arial"),
-    xaxis=dict(title='', color='white', showgrid=False),  # Remove título do eixo x e grades
-    yaxis=dict(title='', color='white', showgrid=False)  # Remove título do eixo y e grades
-)
-
 # Exibir o gráfico no Streamlit
 st.plotly_chart(fig_cost, use_container_width=True)
     
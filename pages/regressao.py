@@ -0,0 +1,155 @@
+import math
+
+import streamlit as st
+from PIL import Image
+
+from zomato import regression
+from zomato.charts import bar_chart, bar_spec, figure
+from zomato.ui import load_regression_stats
+
+st.set_page_config(
+    page_title='Preço x Nota',
+    page_icon='📈',
+    layout='wide'
+    )
+
+# Estatísticas suficientes por (país, cidade), montadas uma única vez
+estatisticas = load_regression_stats()
+
+NOMES_NIVEIS = {'country': 'País', 'city': 'Cidade'}
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 📈 Preço para Dois x Nota e Avaliações')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+metrica_radio = st.sidebar.radio(
+    'Comparar o preço com',
+    options=list(regression.METRICAS_Y),
+    format_func=regression.METRICAS_Y.get,
+    key='regressao_metrica'
+)
+escala_radio = st.sidebar.radio(
+    'Escala do preço',
+    options=list(regression.ESCALAS_X),
+    format_func=regression.ESCALAS_X.get,
+    key='regressao_escala'
+)
+nivel_radio = st.sidebar.radio(
+    'Agrupar por',
+    options=list(NOMES_NIVEIS),
+    format_func=NOMES_NIVEIS.get,
+    key='regressao_nivel'
+)
+# Filtro vazio equivale a "todos"
+paises_multiselect = st.sidebar.multiselect(
+    'Países',
+    options=sorted(estatisticas['sums']['country'].unique()),
+    key='regressao_paises'
+)
+minimo_slider = st.sidebar.slider('Mínimo de restaurantes por grupo', min_value=2, max_value=100, value=20,
+                                  key='regressao_minimo')
+quantidade_slider = st.sidebar.slider('Quantidade de grupos nos gráficos', min_value=5, max_value=30, value=15,
+                                      key='regressao_quantidade')
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+nome_metrica = regression.METRICAS_Y[metrica_radio]
+nome_nivel = NOMES_NIVEIS[nivel_radio]
+
+tabela = regression.regression_table(estatisticas, nivel_radio, metrica_radio, escala_radio,
+                                     paises_multiselect, minimo_slider)
+# O rótulo de cidade é o último nível do índice (país, cidade)
+tabela.index = tabela.index.get_level_values(-1) if tabela.index.nlevels > 1 else tabela.index
+tabela = tabela.rename_axis('grupo').reset_index().dropna(subset=['pearson'])
+
+if tabela.empty:
+    st.write('Nenhum grupo com a quantidade mínima de restaurantes.')
+    st.stop()
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2, col3, col4 = st.columns(4, gap='large')
+    col1.metric(f'Grupos ({nome_nivel})', len(tabela))
+    col2.metric('Pearson Mediano', f"{tabela['pearson'].median():.2f}")
+    col3.metric('Spearman Mediano', f"{tabela['spearman'].median():.2f}")
+    col4.metric('Grupos com Correlação Positiva', f"{(tabela['pearson'] > 0).mean():.0%}")
+
+with st.container():
+    st.markdown("""---""")
+    # Os maiores grupos, com as duas correlações lado a lado
+    maiores = tabela.sort_values('restaurants', ascending=False).head(quantidade_slider)
+    spec = bar_spec(maiores, x='grupo', y='pearson', title=f'Correlação entre Preço e {nome_metrica}',
+                    labels={'grupo': nome_nivel, 'pearson': 'Pearson'}, color='lightblue',
+                    line_color='white', layout={'barmode': 'group'})
+    spec['data'].append(bar_spec(maiores, x='grupo', y='spearman', color='lightgreen', line_color='white',
+                                 labels={'grupo': nome_nivel, 'spearman': 'Spearman'})['data'][0])
+    spec['data'][0]['name'], spec['data'][1]['name'] = 'Pearson', 'Spearman'
+    st.plotly_chart(figure(spec), use_container_width=True)
+
+with st.container():
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        fig_r2 = bar_chart(
+            maiores.sort_values('r2', ascending=False),
+            x='grupo',
+            y='r2',
+            text='r2',
+            labels={'grupo': nome_nivel, 'r2': 'R²'},
+            title=f'R² da Reta de {nome_metrica} pelo Preço',
+            color='lightblue',
+            texttemplate='%{text:.2f}'
+        )
+        st.plotly_chart(fig_r2, use_container_width=True)
+
+    with col2:
+        if escala_radio == 'log':
+            # Na escala log, inclinação x ln 2 = variação de y quando o preço dobra
+            maiores = maiores.assign(efeito=maiores['slope'] * math.log(2))
+            rotulo = f'{nome_metrica} a mais quando o preço dobra'
+        else:
+            maiores = maiores.assign(efeito=maiores['slope'])
+            rotulo = f'{nome_metrica} a mais por unidade de moeda'
+        fig_inclinacao = bar_chart(
+            maiores.sort_values('efeito', ascending=False),
+            x='grupo',
+            y='efeito',
+            text='efeito',
+            labels={'grupo': nome_nivel, 'efeito': rotulo},
+            title='Inclinação da Reta',
+            color='lightgreen',
+            texttemplate='%{text:.3g}'
+        )
+        st.plotly_chart(fig_inclinacao, use_container_width=True)
+        if escala_radio == 'linear':
+            st.caption('Na escala linear a inclinação está na moeda local de cada país; '
+                       'compare grupos de um mesmo país ou use a escala log.')
+
+with st.container():
+    st.markdown(f'### Todos os Grupos por {nome_nivel}')
+    st.dataframe(
+        tabela.sort_values('restaurants', ascending=False).rename(columns={
+            'grupo': nome_nivel, 'restaurants': 'Restaurantes', 'slope': 'Inclinação',
+            'intercept': 'Intercepto', 'r2': 'R²', 'pearson': 'Pearson', 'spearman': 'Spearman',
+        }).round(4),
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption('Restaurantes sem preço informado (e, para a nota, sem avaliação) ficam de fora. '
+               'O Spearman considera empatados os valores que diferem menos de 2%.')
@@ -0,0 +1,112 @@
+import numpy as np
+import streamlit as st
+from PIL import Image
+
+from zomato.charts import bar_chart
+from zomato.similarity import similar_restaurants
+from zomato.ui import load_dataset, load_similarity_index
+
+st.set_page_config(
+    page_title='Semelhantes',
+    page_icon='🔎',
+    layout='wide'
+    )
+
+# Dados tratados e vizinhos pré-calculados (uma única vez por processo)
+df, _ = load_dataset()
+indice = load_similarity_index()
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 🔎 Restaurantes Semelhantes')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+paises_selectbox = st.sidebar.selectbox(
+    'Selecione o País',
+    options=sorted(df['country'].unique().tolist()),
+    key='semelhantes_pais'
+)
+cidades = df.loc[df['country'] == paises_selectbox, 'city']
+cidades_selectbox = st.sidebar.selectbox(
+    'Selecione a Cidade',
+    options=sorted(cidades.dropna().unique().tolist()),
+    key='semelhantes_cidade'
+)
+if cidades_selectbox is None:
+    st.write('Nenhuma cidade informada para este país.')
+    st.stop()
+
+# Restaurantes da cidade, dos mais votados para os menos
+posicoes = np.flatnonzero(((df['country'] == paises_selectbox) & (df['city'] == cidades_selectbox)).to_numpy())
+posicoes = posicoes[np.argsort(-df['votes'].to_numpy()[posicoes], kind='stable')]
+restaurante_selectbox = st.sidebar.selectbox(
+    'Selecione o Restaurante',
+    options=posicoes.tolist(),
+    format_func=lambda posicao: f"{df['restaurant_name'].iat[posicao]} ({df['locality'].iat[posicao]})",
+    key='semelhantes_restaurante'
+)
+if restaurante_selectbox is None:
+    st.write('Nenhum restaurante nesta cidade.')
+    st.stop()
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+restaurante = df.iloc[restaurante_selectbox]
+
+with st.container():
+    st.markdown(f"### {restaurante['restaurant_name']}")
+    st.caption(f"{restaurante['locality_verbose']} · {restaurante['all_cuisines']}")
+    col1, col2, col3 = st.columns(3)
+    col1.metric('Nota', f"{restaurante['aggregate_rating']:.1f}")
+    col2.metric('Preço para Dois', f"{restaurante['average_cost_for_two']:,.0f} {restaurante['currency']}")
+    col3.metric('Faixa de Preço', restaurante['price_category'])
+
+semelhantes = similar_restaurants(
+    df, indice, restaurante_selectbox,
+    columns=['restaurant_name', 'locality', 'all_cuisines', 'price_category', 'aggregate_rating',
+             'average_cost_for_two', 'votes']
+)
+
+with st.container():
+    st.markdown("""---""")
+    if semelhantes.empty:
+        st.write('Nenhum outro restaurante nesta cidade.')
+    else:
+        fig_semelhantes = bar_chart(
+            semelhantes.assign(similarity=semelhantes['similarity'].round(3)),
+            x='restaurant_name',
+            y='similarity',
+            text='similarity',
+            labels={'restaurant_name': 'Restaurante', 'similarity': 'Semelhança'},
+            title=f"Restaurantes Mais Semelhantes a {restaurante['restaurant_name']}",
+            color='lightblue'
+        )
+        st.plotly_chart(fig_semelhantes, use_container_width=True)
+
+        st.dataframe(
+            semelhantes.rename(columns={
+                'restaurant_name': 'Restaurante', 'locality': 'Localidade', 'all_cuisines': 'Culinárias',
+                'price_category': 'Faixa de Preço', 'aggregate_rating': 'Nota',
+                'average_cost_for_two': 'Preço para Dois', 'votes': 'Avaliações',
+                'similarity': 'Semelhança', 'distance_km': 'Distância (km)',
+                'shared_cuisines': 'Culinárias em Comum',
+            }).round({'Semelhança': 3, 'Distância (km)': 2}),
+            use_container_width=True
+        )
+        st.caption('Semelhança = 1 / (1 + distância²) entre os atributos de culinárias, faixa de preço, '
+                   'nota, custo (percentil no país) e localização, só entre restaurantes da mesma cidade.')
@@ -0,0 +1,139 @@
+import pandas as pd
+import streamlit as st
+from PIL import Image
+
+from zomato import services
+from zomato.charts import bar_chart, bar_spec, figure
+from zomato.ui import load_rate_tables
+
+st.set_page_config(
+    page_title='Serviços',
+    page_icon='🛵',
+    layout='wide'
+    )
+
+# Numeradores e denominadores por (país, cidade, culinária), montados uma única vez
+tabela = load_rate_tables()
+
+NOMES_NIVEIS = {'country': 'País', 'city': 'Cidade', 'cuisines': 'Culinária'}
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 🛵 Entrega Online e Reserva de Mesa')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+servico_radio = st.sidebar.radio(
+    'Serviço',
+    options=list(services.SERVICOS),
+    format_func=services.SERVICOS.get,
+    key='servicos_servico'
+)
+# Filtro vazio equivale a "todos"
+paises_multiselect = st.sidebar.multiselect(
+    'Países',
+    options=sorted(tabela['country'].unique()),
+    key='servicos_paises'
+)
+nivel_radio = st.sidebar.radio(
+    'Agrupar por',
+    options=list(NOMES_NIVEIS),
+    format_func=NOMES_NIVEIS.get,
+    key='servicos_nivel'
+)
+minimo_slider = st.sidebar.slider('Mínimo de restaurantes por grupo', min_value=1, max_value=100, value=10,
+                                  key='servicos_minimo')
+quantidade_slider = st.sidebar.slider('Quantidade de grupos nos gráficos', min_value=5, max_value=30, value=10,
+                                      key='servicos_quantidade')
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+nome_servico = services.SERVICOS[servico_radio]
+nome_nivel = NOMES_NIVEIS[nivel_radio]
+
+with st.container():
+    st.markdown("""---""")
+    # Taxa de cada serviço no recorte atual
+    colunas = st.columns(len(services.SERVICOS) + 1, gap='large')
+    for coluna, servico in zip(colunas, services.SERVICOS):
+        total = services.service_rates(tabela, None, servico, paises_multiselect).iloc[0]
+        coluna.metric(services.SERVICOS[servico], f"{total['rate']:.1%}")
+    total = services.service_rates(tabela, None, servico_radio, paises_multiselect).iloc[0]
+    colunas[-1].metric(f'Nota com {nome_servico}', f"{total['rating_with']:.2f}",
+                       delta=f"{total['rating_delta']:+.2f} vs sem" if pd.notna(total['rating_delta']) else None)
+
+taxas = services.service_rates(tabela, nivel_radio, servico_radio, paises_multiselect, minimo_slider)
+# O rótulo de cidade é o último nível do índice (país, cidade)
+taxas.index = taxas.index.get_level_values(-1) if taxas.index.nlevels > 1 else taxas.index
+taxas = taxas.rename_axis('grupo').reset_index()
+
+if taxas.empty:
+    st.write('Nenhum grupo com a quantidade mínima de restaurantes.')
+    st.stop()
+
+with st.container():
+    maiores = taxas.sort_values(['rate', 'restaurants'], ascending=False).head(quantidade_slider)
+    fig_taxas = bar_chart(
+        maiores.assign(percentual=maiores['rate'] * 100),
+        x='grupo',
+        y='percentual',
+        text='percentual',
+        labels={'grupo': nome_nivel, 'percentual': f'% com {nome_servico}'},
+        title=f'{nome_nivel} com Maior Taxa de {nome_servico}',
+        color='lightblue',
+        texttemplate='%{text:.1f}%',
+        layout={'yaxis': {'title': {'text': f'% com {nome_servico}'}}}
+    )
+    st.plotly_chart(fig_taxas, use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2 = st.columns(2, gap='large')
+    # Os maiores grupos, com e sem o serviço lado a lado
+    maiores = taxas.sort_values('restaurants', ascending=False).head(quantidade_slider)
+
+    with col1:
+        spec = bar_spec(maiores, x='grupo', y='rating_with', title=f'Nota Média com e sem {nome_servico}',
+                        labels={'grupo': nome_nivel, 'rating_with': 'Com'}, color='lightgreen',
+                        line_color='white', layout={'barmode': 'group'})
+        spec['data'].append(bar_spec(maiores, x='grupo', y='rating_without', color='salmon', line_color='white',
+                                     labels={'grupo': nome_nivel, 'rating_without': 'Sem'})['data'][0])
+        spec['data'][0]['name'], spec['data'][1]['name'] = 'Com', 'Sem'
+        st.plotly_chart(figure(spec), use_container_width=True)
+
+    with col2:
+        spec = bar_spec(maiores, x='grupo', y='cost_with', title=f'Preço Médio para Dois com e sem {nome_servico}',
+                        labels={'grupo': nome_nivel, 'cost_with': 'Com'}, color='lightgreen',
+                        line_color='white', layout={'barmode': 'group'})
+        spec['data'].append(bar_spec(maiores, x='grupo', y='cost_without', color='salmon', line_color='white',
+                                     labels={'grupo': nome_nivel, 'cost_without': 'Sem'})['data'][0])
+        spec['data'][0]['name'], spec['data'][1]['name'] = 'Com', 'Sem'
+        st.plotly_chart(figure(spec), use_container_width=True)
+        if nivel_radio != 'country' and len(paises_multiselect) != 1:
+            st.caption('Os preços estão na moeda local de cada país; compare grupos de um mesmo país.')
+
+with st.container():
+    st.markdown(f'### Todos os Grupos por {nome_nivel}')
+    st.dataframe(
+        taxas.sort_values('restaurants', ascending=False).rename(columns={
+            'grupo': nome_nivel, 'restaurants': 'Restaurantes', 'with_service': f'Com {nome_servico}',
+            'rate': 'Taxa', 'rating_with': 'Nota com', 'rating_without': 'Nota sem', 'rating_delta': 'Diferença de Nota',
+            'cost_with': 'Preço com', 'cost_without': 'Preço sem', 'cost_delta': 'Diferença de Preço',
+        }).round(2),
+        hide_index=True,
+        use_container_width=True
+    )
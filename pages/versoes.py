@@ -0,0 +1,150 @@
+import streamlit as st
+from PIL import Image
+
+from zomato import snapshots
+from zomato.charts import bar_chart
+from zomato.ui import load_dataset, load_snapshot_aggregates
+
+st.set_page_config(
+    page_title='Versões',
+    page_icon='🕒',
+    layout='wide'
+    )
+
+# Garante que a carga atual já foi guardada como versão
+load_dataset()
+versoes = snapshots.list_versions()
+
+
+
+#==================================
+# Barra Lateral Streamlit
+#==================================
+st.header(' 🕒 Comparação entre Versões')
+
+
+# Carregar e exibir a imagem na barra lateral
+image = Image.open('logo.jpg')
+st.sidebar.image(image, width=120)
+
+# Exibir texto na barra lateral
+st.sidebar.markdown('### Elegant Restaurant')
+st.sidebar.markdown('## Food Experience')
+st.sidebar.markdown("""---""")
+
+if not versoes:
+    st.info('Nenhuma versão guardada ainda. Use `python -m zomato.snapshots save` para criar uma.')
+    st.stop()
+
+ids = [versao['version'] for versao in versoes]
+descricoes = {
+    versao['version']: f"{versao['version']} - {versao['created_at'][:16].replace('T', ' ')} "
+                       f"({versao['rows']:,} restaurantes)"
+    for versao in versoes
+}
+
+# Por padrão compara a penúltima com a última versão
+antes_selectbox = st.sidebar.selectbox(
+    'Versão anterior',
+    options=ids,
+    index=max(len(ids) - 2, 0),
+    format_func=descricoes.get,
+    key='versoes_antes'
+)
+depois_selectbox = st.sidebar.selectbox(
+    'Versão atual',
+    options=ids,
+    index=len(ids) - 1,
+    format_func=descricoes.get,
+    key='versoes_depois'
+)
+nivel_radio = st.sidebar.radio(
+    'Comparar por',
+    options=['country', 'city'],
+    format_func={'country': 'País', 'city': 'Cidade'}.get,
+    key='versoes_nivel'
+)
+
+
+
+#==================================
+# Layout Streamlit
+#==================================
+
+# Apenas os agregados guardados são lidos (uma linha por país/cidade)
+antes = load_snapshot_aggregates(antes_selectbox)
+depois = load_snapshot_aggregates(depois_selectbox)
+
+with st.container():
+    st.markdown("""---""")
+    total = snapshots.compare(antes, depois, 'total').iloc[0]
+
+    col1, col2, col3, col4 = st.columns(4, gap='large')
+    col1.metric('Restaurantes', f"{total['restaurants_depois']:,.0f}",
+                f"{total['restaurants_delta']:+,.0f}")
+    col2.metric('Avaliações', f"{total['votes_sum_depois']:,.0f}",
+                f"{total['votes_sum_delta']:+,.0f}")
+    col3.metric('Nota média', f"{total['rating_mean_depois']:.2f}",
+                f"{total['rating_mean_delta']:+.3f}")
+    col4.metric('Cidades', f"{total['n_cities_depois']:,.0f}",
+                f"{total['n_cities_delta']:+,.0f}")
+
+comparacao = snapshots.compare(antes, depois, nivel_radio)
+if nivel_radio == 'city':
+    comparacao.index = [f'{cidade} ({pais})' for pais, cidade in comparacao.index]
+comparacao = comparacao.rename_axis('local').reset_index()
+
+with st.container():
+    st.markdown("""---""")
+    col1, col2 = st.columns(2, gap='large')
+
+    with col1:
+        # Maiores variações (em módulo) no número de restaurantes
+        variacao = comparacao.reindex(
+            comparacao['restaurants_delta'].abs().sort_values(ascending=False).index).head(10)
+        fig_restaurantes = bar_chart(
+            variacao,
+            x='local',
+            y='restaurants_delta',
+            text='restaurants_delta',
+            labels={'local': 'Local', 'restaurants_delta': 'Variação de Restaurantes'},
+            title='Maiores Variações no Número de Restaurantes',
+            color='lightblue'
+        )
+        st.plotly_chart(fig_restaurantes, use_container_width=True)
+
+    with col2:
+        # Maiores variações (em módulo) na nota média
+        variacao = comparacao.dropna(subset=['rating_mean_delta'])
+        variacao = variacao.reindex(
+            variacao['rating_mean_delta'].abs().sort_values(ascending=False).index).head(10)
+        fig_notas = bar_chart(
+            variacao,
+            x='local',
+            y='rating_mean_delta',
+            text='rating_mean_delta',
+            labels={'local': 'Local', 'rating_mean_delta': 'Variação da Nota Média'},
+            title='Maiores Variações na Nota Média',
+            color='lightgreen',
+            line_color='white',
+            texttemplate='%{text:.3f}'
+        )
+        st.plotly_chart(fig_notas, use_container_width=True)
+
+with st.container():
+    st.markdown("""---""")
+
+    # Tabela completa da comparação
+    colunas = {
+        'local': 'Local',
+        'restaurants_antes': 'Restaurantes (antes)',
+        'restaurants_depois': 'Restaurantes (depois)',
+        'restaurants_delta': 'Δ Restaurantes',
+        'votes_sum_delta': 'Δ Avaliações',
+        'rating_mean_antes': 'Nota Média (antes)',
+        'rating_mean_depois': 'Nota Média (depois)',
+        'rating_mean_delta': 'Δ Nota Média',
+        'cost_mean_delta': 'Δ Preço Médio para Dois',
+    }
+    tabela = comparacao[list(colunas)].round(3).rename(columns=colunas)
+    st.dataframe(tabela, hide_index=True, use_container_width=True)
@@ -0,0 +1,7 @@
+"""
+Pacote de apoio do dashboard Elegant Restaurant.
+
+Reúne o pipeline de tratamento do dataset do Zomato e as rotinas
+compartilhadas entre `Home.py` e as páginas em `pages/`, evitando que cada
+página repita a mesma limpeza dos dados.
+"""
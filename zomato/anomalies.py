@@ -0,0 +1,177 @@
+"""
+Detecção de anomalias de nota e avaliações nos restaurantes tratados.
+
+`flag_anomalies` marca cada restaurante com uma máscara de bits de `FLAGS`
+(0 = nenhuma anomalia), gravada na coluna `anomaly_flags` do pipeline, para
+que os rankings possam deixar essas linhas de fora:
+- nota fora do padrão do grupo: z-score robusto da nota, com mediana e MAD
+  por (país, cidade, culinária), acima de `Z_LIMITE` em módulo, sem
+  avaliações que a sustentem (log das avaliações abaixo da mediana do
+  grupo); notas excepcionais com muitas avaliações não são anomalias
+- nota alta com poucas avaliações: nota >= `NOTA_ALTA` com menos de
+  `VOTOS_MINIMOS` avaliações
+- anúncio duplicado: restaurantes da mesma marca (`brand_id`) no mesmo
+  ponto do mapa; as coordenadas viram uma chave de bucket (grade de
+  `PRECISAO_COORDENADA` graus) e todos menos o mais avaliado são marcados
+- texto da avaliação incoerente com a nota: cada `rating_text` (em qualquer
+  idioma, como em `zomato.validation`) tem a faixa de nota da sua cor
+
+Tudo é vetorizado: os grupos são fatorizados uma vez, medianas e MADs saem
+do `groupby().transform('median')` do pandas e as colisões de um
+`groupby` sobre (bucket, marca), com custo linear no número de linhas.
+"""
+import numpy as np
+import pandas as pd
+
+# Nome da anomalia -> (bit da máscara, descrição)
+FLAGS = {
+    'rating_outlier': (1, 'Nota fora do padrão da cidade e culinária'),
+    'few_votes': (2, 'Nota alta com poucas avaliações'),
+    'duplicate_location': (4, 'Anúncio duplicado no mesmo local'),
+    'rating_text_mismatch': (8, 'Texto da avaliação incoerente com a nota'),
+}
+
+# Chave dos grupos dos z-scores
+CHAVE_GRUPOS = ['country', 'city', 'cuisines']
+
+# Limite do z-score robusto (Iglewicz e Hoaglin)
+Z_LIMITE = 3.5
+
+# Grupos com menos restaurantes avaliados não têm z-score
+GRUPO_MINIMO = 5
+
+# Nota a partir da qual poucas avaliações tornam o restaurante suspeito
+NOTA_ALTA = 4.5
+
+# Avaliações mínimas para uma nota alta ser considerada confiável
+VOTOS_MINIMOS = 20
+
+# Lado da célula da grade de coordenadas, em graus (cerca de 11 m no equador)
+PRECISAO_COORDENADA = 1e-4
+
+# Faixa de nota [mínimo, máximo) de cada cor de avaliação do Zomato
+FAIXAS_COR = {
+    '3F7E00': (4.5, 5.01), '5BA829': (4.0, 4.5), '9ACD32': (3.5, 4.0),
+    'CDD614': (3.0, 3.5), 'FFBA00': (2.5, 3.0), 'FF7800': (0.01, 2.5), 'CBCBC8': (0.0, 0.01),
+}
+
+
+def robust_zscores(valores, codigos):
+    """
+    Z-score robusto de cada valor dentro do seu grupo.
+
+    z = (x - mediana) / (1.4826 * MAD); quando o MAD do grupo é 0 (mais da
+    metade dos valores iguais), usa 1.2533 * desvio absoluto médio.
+
+    Parameters
+    ----------
+    valores : numpy.ndarray
+        Valores (NaN = fora do cálculo).
+    codigos : numpy.ndarray
+        Grupo de cada valor, como `GroupBy.ngroup`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Z-score de cada valor; NaN para valores nulos e grupos com menos de
+        `GRUPO_MINIMO` valores.
+    """
+    grupos = pd.Series(valores).groupby(codigos, sort=False)
+    mediana = grupos.transform('median').to_numpy()
+    desvio = pd.Series(np.abs(valores - mediana))
+    por_grupo = desvio.groupby(codigos, sort=False)
+    escala = 1.4826 * por_grupo.transform('median').to_numpy()
+    escala = np.where(escala > 0, escala, 1.2533 * por_grupo.transform('mean').to_numpy())
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(escala > 0, (valores - mediana) / escala, 0.0)
+    z[np.isnan(valores) | (grupos.transform('count').to_numpy() < GRUPO_MINIMO)] = np.nan
+    return z
+
+
+def _faixas_texto(textos):
+    """Faixa de nota [mínimo, máximo) de cada texto de avaliação (NaN quando desconhecido)."""
+    # zomato.validation importa zomato.pipeline, que importa este módulo
+    from zomato.validation import RATING_TEXT_COLORS
+
+    faixas = np.full((len(textos), 2), np.nan)
+    for i, texto in enumerate(textos):
+        cores = RATING_TEXT_COLORS.get(texto)
+        if cores is not None:
+            limites = [FAIXAS_COR[cor] for cor in np.atleast_1d(cores)]
+            faixas[i] = min(limite[0] for limite in limites), max(limite[1] for limite in limites)
+    return faixas
+
+
+def flag_anomalies(df):
+    """
+    Calcula a máscara de anomalias de cada restaurante.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado, com `brand_id` (`zomato.brands.assign_brands`).
+
+    Returns
+    -------
+    numpy.ndarray
+        Soma dos bits de `FLAGS` de cada linha (int64; 0 = normal).
+    """
+    flags = np.zeros(len(df), dtype='int64')
+    nota = df['aggregate_rating'].to_numpy(dtype='float64')
+    votos = df['votes'].to_numpy(dtype='float64')
+    codigos = df.groupby(CHAVE_GRUPOS, sort=False, dropna=False).ngroup().to_numpy()
+
+    # Notas 0 são restaurantes ainda não avaliados e ficam fora das medianas
+    avaliada = nota > 0
+    z_nota = robust_zscores(np.where(avaliada, nota, np.nan), codigos)
+    z_votos = robust_zscores(np.where(avaliada, np.log1p(votos), np.nan), codigos)
+    flags[(np.abs(z_nota) > Z_LIMITE) & (z_votos < 0)] |= FLAGS['rating_outlier'][0]
+    flags[(nota >= NOTA_ALTA) & (votos < VOTOS_MINIMOS)] |= FLAGS['few_votes'][0]
+
+    # Bucket = célula da grade; a mesma marca no mesmo bucket é o mesmo anúncio
+    celulas = pd.DataFrame({
+        'lat': np.floor(df['latitude'].to_numpy(dtype='float64') / PRECISAO_COORDENADA),
+        'lon': np.floor(df['longitude'].to_numpy(dtype='float64') / PRECISAO_COORDENADA),
+    })
+    chaves = pd.DataFrame({'bucket': pd.util.hash_pandas_object(celulas, index=False).to_numpy(),
+                           'marca': df['brand_id'].to_numpy()})
+    anuncios = chaves.groupby(['bucket', 'marca'], sort=False).ngroup().to_numpy()
+    # O anúncio mais avaliado de cada (bucket, marca) (no empate, o primeiro) fica sem marca
+    mantidos = pd.Series(np.nan_to_num(votos, nan=-1)).groupby(anuncios, sort=False).idxmax().to_numpy()
+    repetidos = np.ones(len(df), dtype=bool)
+    repetidos[mantidos] = False
+    flags[repetidos] |= FLAGS['duplicate_location'][0]
+
+    codigos_texto, textos = pd.factorize(df['rating_text'])
+    faixas = np.vstack([_faixas_texto(textos), [np.nan, np.nan]])[codigos_texto]
+    with np.errstate(invalid='ignore'):
+        incoerente = (nota < faixas[:, 0]) | (nota >= faixas[:, 1])
+    flags[incoerente] |= FLAGS['rating_text_mismatch'][0]
+    return flags
+
+
+def summarize(flags, counts=None):
+    """
+    Conta os restaurantes marcados por cada anomalia.
+
+    Parameters
+    ----------
+    flags : array-like
+        Coluna `anomaly_flags`.
+    counts : array-like, optional
+        Restaurantes de cada valor de `flags`, quando `flags` traz os valores
+        distintos (por exemplo de `zomato.storage.anomaly_counts`). None =
+        um restaurante por valor.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexado pelo nome da anomalia, com as colunas `description` e
+        `restaurants`.
+    """
+    flags = np.asarray(flags)
+    pesos = np.ones(len(flags), dtype='int64') if counts is None else np.asarray(counts, dtype='int64')
+    return pd.DataFrame({
+        'description': [descricao for _, descricao in FLAGS.values()],
+        'restaurants': [int(pesos[(flags & bit) > 0].sum()) for bit, _ in FLAGS.values()],
+    }, index=pd.Index(list(FLAGS), name='anomaly'))
@@ -0,0 +1,319 @@
+"""
+Detecção de redes (marcas) pelos nomes dos restaurantes.
+
+`assign_brands` atribui um `brand_id` a cada restaurante em três etapas:
+1. normalização do nome (sem acentos, pontuação, espaços e palavras
+   genéricas de `STOPWORDS`): "McDonald's" e "Mc Donalds" viram o mesmo nome
+2. nomes parecidos (erros de digitação) são unidos por comparação
+   aproximada (`difflib`, razão >= `SIMILARIDADE` e os mesmos números), mas
+   só dentro de blocos de candidatos: nomes com o mesmo prefixo ou o mesmo
+   sufixo de `TAMANHO_BLOCO` letras (mais letras em blocos grandes) e
+   tamanhos compatíveis com a razão mínima
+3. restaurantes de mesmo nome só ficam na mesma marca se estiverem ligados
+   por culinárias em comum (diretamente ou por outras filiais), para não
+   juntar restaurantes sem relação que só compartilham o nome
+
+As etapas 1 e 2 rodam sobre os nomes distintos e a etapa 3 sobre as
+combinações distintas de (nome, culinárias), então o custo é quase linear no
+número de restaurantes.
+"""
+import difflib
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+# Palavras ignoradas na comparação dos nomes
+STOPWORDS = {'the', 'and', 'restaurant', 'restaurants', 'restaurante', 'resto'}
+
+# Razão mínima do difflib para considerar dois nomes a mesma marca
+SIMILARIDADE = 0.92
+
+# Nomes normalizados menores que isso só se unem por igualdade exata
+TAMANHO_MINIMO = 5
+
+# Letras do prefixo/sufixo usadas como chave de bloco
+TAMANHO_BLOCO = 4
+
+# Blocos maiores que isso são divididos por um prefixo/sufixo mais longo
+BLOCO_MAXIMO = 200
+
+# Valor de `all_cuisines` sem culinária informada
+SEM_CULINARIA = 'Not Informed'
+
+
+def normalize_name(nome):
+    """
+    Normaliza um nome de restaurante para comparação.
+
+    >>> normalize_name("The Domino's  Pizza")
+    'dominospizza'
+    """
+    texto = unicodedata.normalize('NFKD', str(nome)).encode('ascii', 'ignore').decode('ascii').lower()
+    texto = texto.replace("'", '').replace('&', ' and ')
+    tokens = ''.join(c if c.isalnum() else ' ' for c in texto).split()
+    tokens = [token for token in tokens if token not in STOPWORDS] or tokens
+    return ''.join(tokens)
+
+
+class _UnionFind:
+    """União-busca simples sobre inteiros 0..n-1."""
+
+    def __init__(self, n):
+        self.pai = list(range(n))
+
+    def find(self, x):
+        while self.pai[x] != x:
+            self.pai[x] = self.pai[self.pai[x]]
+            x = self.pai[x]
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.pai[max(a, b)] = min(a, b)
+
+
+def candidate_blocks(nomes):
+    """
+    Agrupa os nomes normalizados em blocos de candidatos.
+
+    Returns
+    -------
+    list of list of int
+        Posições em `nomes` de cada bloco com mais de um nome (um nome pode
+        estar em dois blocos: o do prefixo e o do sufixo). Blocos com mais de
+        `BLOCO_MAXIMO` nomes são divididos por chaves mais longas.
+    """
+    pendentes = [(lado, TAMANHO_BLOCO, [p for p, nome in enumerate(nomes) if len(nome) >= TAMANHO_MINIMO])
+                 for lado in ('p', 's')]
+    resultado = []
+    while pendentes:
+        lado, tamanho, posicoes = pendentes.pop()
+        blocos = defaultdict(list)
+        for posicao in posicoes:
+            nome = nomes[posicao]
+            blocos[nome[:tamanho] if lado == 'p' else nome[-tamanho:]].append(posicao)
+        for chave, bloco in blocos.items():
+            if len(bloco) > BLOCO_MAXIMO and len(chave) == tamanho:
+                # Bloco grande demais: divide por uma chave mais longa
+                pendentes.append((lado, tamanho + 2, bloco))
+            elif len(bloco) > 1:
+                resultado.append(bloco)
+    return resultado
+
+
+def fuzzy_clusters(nomes):
+    """
+    Une nomes normalizados parecidos, comparando só dentro dos blocos.
+
+    Parameters
+    ----------
+    nomes : list of str
+        Nomes normalizados distintos.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, int)
+        O grupo de cada nome (o menor índice do grupo) e a quantidade de
+        pares comparados.
+    """
+    uniao = _UnionFind(len(nomes))
+    # Razão >= SIMILARIDADE exige tamanhos próximos: menor / maior >= s / (2 - s)
+    proporcao = SIMILARIDADE / (2 - SIMILARIDADE)
+    # Números no nome diferenciam filiais de marcas diferentes ("4 seasons" x "seasons")
+    digitos = [''.join(c for c in nome if c.isdigit()) for nome in nomes]
+    comparados = 0
+    for bloco in candidate_blocks(nomes):
+        bloco = sorted(bloco, key=lambda posicao: len(nomes[posicao]))
+        for i, a in enumerate(bloco):
+            comparador = difflib.SequenceMatcher(None, b=nomes[a], autojunk=False)
+            for b in bloco[i + 1:]:
+                if len(nomes[a]) < proporcao * len(nomes[b]):
+                    break
+                if uniao.find(a) == uniao.find(b) or digitos[a] != digitos[b]:
+                    continue
+                comparador.set_seq1(nomes[b])
+                comparados += 1
+                if (comparador.real_quick_ratio() >= SIMILARIDADE and comparador.quick_ratio() >= SIMILARIDADE
+                        and comparador.ratio() >= SIMILARIDADE):
+                    uniao.union(a, b)
+    return np.array([uniao.find(posicao) for posicao in range(len(nomes))], dtype='int64'), comparados
+
+
+def _connected_by_cuisine(grupo_combo, culinarias_combo):
+    """
+    Componentes das combinações (nome, culinárias) ligadas por culinária em comum.
+
+    Parameters
+    ----------
+    grupo_combo : numpy.ndarray
+        Grupo de nome de cada combinação.
+    culinarias_combo : list of numpy.ndarray
+        Códigos das culinárias de cada combinação (vazio = não informada).
+
+    Returns
+    -------
+    numpy.ndarray
+        Rótulo (menor combinação do componente) de cada combinação.
+    """
+    n = len(grupo_combo)
+    tamanhos = np.array([len(codigos) for codigos in culinarias_combo])
+    combos = np.repeat(np.arange(n), tamanhos)
+    codigos = np.concatenate(culinarias_combo) if n else np.empty(0, dtype='int64')
+    # Nó (grupo, culinária): combinações do mesmo grupo com a mesma culinária
+    nos, _ = pd.factorize(pd.MultiIndex.from_arrays([grupo_combo[combos], codigos]))
+
+    # Propagação do menor rótulo até estabilizar
+    rotulos = np.arange(n)
+    while len(nos):
+        rotulo_no = np.full(nos.max() + 1, n)
+        np.minimum.at(rotulo_no, nos, rotulos[combos])
+        novos = rotulos.copy()
+        np.minimum.at(novos, combos, rotulo_no[nos])
+        if np.array_equal(novos, rotulos):
+            break
+        rotulos = novos
+    return rotulos
+
+
+def assign_brands(df):
+    """
+    Calcula o `brand_id` de cada restaurante.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado (com `restaurant_name` e `all_cuisines`).
+
+    Returns
+    -------
+    numpy.ndarray
+        `brand_id` (int64 não negativo) de cada linha: hash do menor nome
+        normalizado e da menor lista de culinárias da marca, então o id de
+        uma marca não muda quando outras linhas entram ou saem.
+    """
+    # 1. Nomes normalizados, calculados só uma vez por nome distinto
+    codigos_nome, nomes = pd.factorize(df['restaurant_name'])
+    codigos_normalizado, normalizados = pd.factorize(pd.Series([normalize_name(nome) for nome in nomes]))
+
+    # 2. Nomes parecidos dentro dos blocos
+    grupos_normalizado, _ = fuzzy_clusters(list(normalizados))
+    grupo_linha = grupos_normalizado[codigos_normalizado[codigos_nome]]
+
+    # 3. Combinações distintas de (grupo, culinárias), ligadas por culinária em comum
+    codigos_culinarias, listas = pd.factorize(df['all_cuisines'])
+    combos, pares = pd.factorize(pd.MultiIndex.from_arrays([grupo_linha, codigos_culinarias]))
+    grupo_combo = pares.get_level_values(0).to_numpy()
+    _, vocabulario = pd.factorize(pd.Series([c for lista in listas for c in lista.split(', ')]))
+    culinarias_lista = [
+        vocabulario.get_indexer([c for c in lista.split(', ') if c != SEM_CULINARIA]) for lista in listas
+    ]
+    culinarias_combo = [culinarias_lista[codigo] for codigo in pares.get_level_values(1)]
+    rotulos = _connected_by_cuisine(grupo_combo, culinarias_combo)
+
+    # Combinações sem culinária vão para o maior componente do seu grupo
+    restaurantes = np.bincount(combos, minlength=len(pares))
+    tamanho_componente = np.bincount(rotulos, weights=restaurantes, minlength=len(pares))
+    sem_culinaria = np.array([len(codigos) == 0 for codigos in culinarias_combo], dtype=bool)
+    candidatos = pd.DataFrame({'grupo': grupo_combo, 'rotulo': rotulos,
+                               'tamanho': tamanho_componente[rotulos]})[~sem_culinaria]
+    maior = candidatos.sort_values(['tamanho', 'rotulo'], ascending=[False, True]).drop_duplicates('grupo')
+    maior = dict(zip(maior['grupo'], maior['rotulo']))
+    for combo in np.flatnonzero(sem_culinaria):
+        rotulos[combo] = maior.get(grupo_combo[combo], rotulos[combo])
+
+    # Id pelo conteúdo da marca: o menor nome normalizado do grupo e a menor
+    # lista de culinárias do componente, que não dependem da ordem das linhas
+    nome_grupo = pd.Series(np.asarray(normalizados, dtype=object)).groupby(grupos_normalizado).min()
+    textos_combo = pd.Series(np.asarray(listas, dtype=object)[pares.get_level_values(1)])
+    culinaria_rotulo = textos_combo[~sem_culinaria].groupby(rotulos[~sem_culinaria]).min()
+    chaves = pd.DataFrame({
+        'nome': nome_grupo.reindex(grupo_combo).to_numpy(),
+        'culinarias': culinaria_rotulo.reindex(rotulos).fillna('').to_numpy(),
+    })
+    marca_combo = (pd.util.hash_pandas_object(chaves, index=False).to_numpy() >> np.uint64(1)).astype('int64')
+    return marca_combo[combos]
+
+
+def build_brand_table(df):
+    """
+    Resumo de cada marca por país.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado (com `brand_id`).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por (brand_id, country) com 'brand_name' (nome mais comum
+        da marca), 'branches', 'cities', 'rated', 'rating_sum',
+        'rating_sq_sum', 'rating_min' e 'rating_max' (notas zero, sem
+        avaliação, ficam fora das estatísticas de nota).
+    """
+    notas = df['aggregate_rating'].where(df['aggregate_rating'] > 0)
+    base = pd.DataFrame({
+        'brand_id': df['brand_id'], 'country': df['country'], 'city': df['city'],
+        'rating': notas, 'rating_sq': notas ** 2,
+    })
+    tabela = base.groupby(['brand_id', 'country'], sort=True).agg(
+        branches=('city', 'size'),
+        cities=('city', 'nunique'),
+        rated=('rating', 'count'),
+        rating_sum=('rating', 'sum'),
+        rating_sq_sum=('rating_sq', 'sum'),
+        rating_min=('rating', 'min'),
+        rating_max=('rating', 'max'),
+    ).reset_index()
+    nomes = (df.groupby(['brand_id', 'restaurant_name']).size().reset_index(name='n')
+             .sort_values(['brand_id', 'n'], ascending=[True, False]).drop_duplicates('brand_id')
+             .set_index('brand_id')['restaurant_name'])
+    tabela.insert(1, 'brand_name', tabela['brand_id'].map(nomes))
+    return tabela
+
+
+def chains(tabela, countries=None, min_branches=2):
+    """
+    Estatísticas das redes, somando as linhas de cada marca.
+
+    Parameters
+    ----------
+    tabela : pandas.DataFrame
+        Resultado de `build_brand_table`.
+    countries : list of str, optional
+        Considera só as filiais destes países (None ou vazia = todos).
+    min_branches : int, optional
+        Quantidade mínima de filiais para uma marca ser considerada rede.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por marca, com 'brand_name', 'branches', 'countries',
+        'cities', 'rating_mean', 'rating_std', 'rating_min', 'rating_max' e
+        'rating_spread' (máximo - mínimo), da maior rede para a menor.
+    """
+    if countries:
+        tabela = tabela[tabela['country'].isin(countries)]
+    redes = tabela.groupby('brand_id').agg(
+        brand_name=('brand_name', 'first'),
+        branches=('branches', 'sum'),
+        countries=('country', 'size'),
+        cities=('cities', 'sum'),
+        rated=('rated', 'sum'),
+        rating_sum=('rating_sum', 'sum'),
+        rating_sq_sum=('rating_sq_sum', 'sum'),
+        rating_min=('rating_min', 'min'),
+        rating_max=('rating_max', 'max'),
+    )
+    redes = redes[redes['branches'] >= min_branches]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        media = redes['rating_sum'] / redes['rated']
+        variancia = (redes['rating_sq_sum'] / redes['rated'] - media ** 2).clip(lower=0)
+    redes = redes.assign(rating_mean=media, rating_std=np.sqrt(variancia),
+                         rating_spread=redes['rating_max'] - redes['rating_min'])
+    colunas = ['brand_name', 'branches', 'countries', 'cities', 'rating_mean', 'rating_std',
+               'rating_min', 'rating_max', 'rating_spread']
+    return redes.sort_values(['branches', 'brand_name'], ascending=[False, True])[colunas]
@@ -0,0 +1,366 @@
+"""
+Cache em disco dos artefatos derivados do dataset.
+
+Cada entrada é identificada por uma chave determinística:
+- o nome da derivação (por exemplo 'load_data' ou 'distributions')
+- o hash do conteúdo do arquivo de origem (`source_hash`)
+- a versão do código da derivação (`code_version`: hash do código-fonte
+  dos módulos envolvidos, que muda sozinha quando o código muda)
+- parâmetros extras da derivação
+
+Assim, um processo reiniciado ou uma nova réplica que aponte para a mesma
+pasta encontra os artefatos prontos, e qualquer mudança no CSV ou no código
+gera chaves novas em vez de reaproveitar resultados antigos.
+
+Cada entrada é um pickle `<chave>.pkl` com um `<chave>.json` ao lado
+(nome, versão, tamanho, acertos). As gravações são atômicas (arquivo
+temporário + rename). O horário de modificação do `.json` marca o último
+uso: acima de `MAX_BYTES` as entradas usadas há mais tempo são removidas.
+
+A pasta vem da variável ZOMATO_CACHE (padrão `dataset/cache`; vazia
+desativa o cache) e o limite de ZOMATO_CACHE_MAX_MB (padrão 2048).
+
+Uso pela linha de comando:
+    python -m zomato.cache info
+    python -m zomato.cache prune --max-mb 500
+    python -m zomato.cache clear --name load_data
+"""
+import hashlib
+import importlib
+import json
+import os
+import pickle
+import threading
+import time
+from collections import Counter
+
+# Módulos de que o dataset tratado depende: entram na versão de todo artefato derivado dele
+MODULOS_TRATAMENTO = ('zomato.pipeline', 'zomato.parallel', 'zomato.validation', 'zomato.sketches',
+                      'zomato.brands', 'zomato.anomalies')
+
+# Pasta do cache; vazia desativa
+CACHE_PATH = os.environ.get('ZOMATO_CACHE', 'dataset/cache')
+
+# Tamanho máximo do cache
+MAX_BYTES = int(float(os.environ.get('ZOMATO_CACHE_MAX_MB', '2048')) * 1024 ** 2)
+
+# Contadores deste processo: (nome, evento) -> quantidade
+COUNTERS = Counter()
+
+_lock = threading.Lock()
+
+# Hash dos arquivos já lidos: caminho -> ((mtime, tamanho), hash)
+_hashes = {}
+
+
+def _raiz(root=None):
+    """Pasta do cache (`CACHE_PATH` quando `root` é None)."""
+    return CACHE_PATH if root is None else root
+
+
+def _digest(*partes):
+    """Hash SHA-256 (hexadecimal) de uma sequência de valores."""
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(str(parte).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def source_hash(path):
+    """
+    Hash SHA-256 do conteúdo de um arquivo.
+
+    O resultado fica guardado enquanto a data de modificação e o tamanho do
+    arquivo não mudarem, para não reler o arquivo a cada chamada.
+    """
+    estado = os.stat(path)
+    assinatura = (estado.st_mtime_ns, estado.st_size)
+    with _lock:
+        if path in _hashes and _hashes[path][0] == assinatura:
+            return _hashes[path][1]
+    h = hashlib.sha256()
+    with open(path, 'rb') as arquivo:
+        for bloco in iter(lambda: arquivo.read(1024 ** 2), b''):
+            h.update(bloco)
+    with _lock:
+        _hashes[path] = (assinatura, h.hexdigest())
+    return h.hexdigest()
+
+
+def code_version(*modules):
+    """
+    Versão do código: hash do código-fonte dos módulos informados.
+
+    Parameters
+    ----------
+    *modules : module or str
+        Módulos (ou nomes de módulos, importados se preciso) de que a
+        derivação depende.
+
+    Returns
+    -------
+    str
+        Os primeiros 16 dígitos do hash.
+    """
+    arquivos = []
+    for modulo in modules:
+        modulo = importlib.import_module(modulo) if isinstance(modulo, str) else modulo
+        with open(modulo.__file__, 'rb') as arquivo:
+            arquivos.append(hashlib.sha256(arquivo.read()).hexdigest())
+    return _digest(*arquivos)[:16]
+
+
+def make_key(name, version, source=None, params=()):
+    """
+    Chave de uma entrada do cache.
+
+    Parameters
+    ----------
+    name : str
+        Nome da derivação.
+    version : str
+        Versão do código (`code_version`).
+    source : str, optional
+        Arquivo de origem; entra na chave pelo hash do conteúdo.
+    params : tuple, optional
+        Parâmetros extras (convertidos com `repr`).
+
+    Returns
+    -------
+    str
+        Chave em hexadecimal.
+    """
+    fonte = source_hash(source) if source else ''
+    return _digest(name, version, fonte, repr(tuple(params)))
+
+
+def _gravar_atomico(caminho, dados):
+    """Grava bytes de forma atômica (arquivo temporário + rename)."""
+    temporario = f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(dados)
+    os.replace(temporario, caminho)
+
+
+def _caminhos(chave, root=None):
+    """Caminhos do pickle e dos metadados de uma chave."""
+    base = os.path.join(_raiz(root), chave[:2], chave)
+    return base + '.pkl', base + '.json'
+
+
+def get(name, key, root=None):
+    """
+    Lê uma entrada do cache.
+
+    Returns
+    -------
+    tuple of (bool, object)
+        (True, valor) no acerto e (False, None) quando a entrada não existe
+        ou não pode ser lida.
+    """
+    dados, meta = _caminhos(key, root)
+    try:
+        with open(dados, 'rb') as arquivo:
+            valor = pickle.load(arquivo)
+        with open(meta, encoding='utf-8') as arquivo:
+            info = json.load(arquivo)
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError):
+        COUNTERS[name, 'misses'] += 1
+        return False, None
+
+    # Atualiza os acertos e o último uso (horário de modificação do .json)
+    info['hits'] = info.get('hits', 0) + 1
+    info['last_used'] = time.time()
+    try:
+        _gravar_atomico(meta, json.dumps(info).encode('utf-8'))
+    except OSError:
+        pass
+    COUNTERS[name, 'hits'] += 1
+    return True, valor
+
+
+def put(name, key, value, version='', root=None, max_bytes=None):
+    """
+    Grava uma entrada no cache e remove as menos usadas acima do limite.
+
+    Returns
+    -------
+    int
+        Tamanho da entrada em bytes.
+    """
+    dados, meta = _caminhos(key, root)
+    os.makedirs(os.path.dirname(dados), exist_ok=True)
+    conteudo = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    _gravar_atomico(dados, conteudo)
+    agora = time.time()
+    info = {'name': name, 'version': version, 'bytes': len(conteudo), 'hits': 0,
+            'created': agora, 'last_used': agora}
+    _gravar_atomico(meta, json.dumps(info).encode('utf-8'))
+    COUNTERS[name, 'writes'] += 1
+    prune(max_bytes, root)
+    return len(conteudo)
+
+
+def get_or_build(name, version, build, source=None, params=(), root=None):
+    """
+    Retorna o artefato do cache ou o calcula e grava.
+
+    Parameters
+    ----------
+    name : str
+        Nome da derivação.
+    version : str
+        Versão do código (`code_version`).
+    build : callable
+        Função sem argumentos que calcula o artefato.
+    source : str, optional
+        Arquivo de origem (entra na chave pelo hash do conteúdo).
+    params : tuple, optional
+        Parâmetros extras que mudam o resultado.
+    root : str, optional
+        Pasta do cache. Usa `CACHE_PATH` quando omitido; vazia desativa.
+
+    Returns
+    -------
+    object
+        O artefato.
+    """
+    if not _raiz(root):
+        return build()
+    chave = make_key(name, version, source, params)
+    encontrado, valor = get(name, chave, root)
+    if encontrado:
+        return valor
+    valor = build()
+    try:
+        put(name, chave, valor, version, root)
+    except OSError:
+        # Sem espaço ou sem permissão: segue sem cache
+        COUNTERS[name, 'errors'] += 1
+    return valor
+
+
+def entries(root=None):
+    """
+    Lista as entradas do cache, da usada mais recentemente para a mais antiga.
+
+    Returns
+    -------
+    list of dict
+        Metadados de cada entrada, com 'key' e 'path' acrescentados.
+    """
+    raiz = _raiz(root)
+    if not raiz or not os.path.isdir(raiz):
+        return []
+    lista = []
+    for pasta in os.listdir(raiz):
+        caminho_pasta = os.path.join(raiz, pasta)
+        if not os.path.isdir(caminho_pasta):
+            continue
+        for nome in os.listdir(caminho_pasta):
+            if not nome.endswith('.json'):
+                continue
+            meta = os.path.join(caminho_pasta, nome)
+            try:
+                with open(meta, encoding='utf-8') as arquivo:
+                    info = json.load(arquivo)
+                info['last_used'] = os.path.getmtime(meta)
+            except (OSError, ValueError):
+                continue
+            info['key'] = nome[:-len('.json')]
+            info['path'] = meta[:-len('.json')] + '.pkl'
+            lista.append(info)
+    return sorted(lista, key=lambda info: info['last_used'], reverse=True)
+
+
+def remove(key, root=None):
+    """Remove uma entrada (o pickle e os metadados)."""
+    for caminho in _caminhos(key, root):
+        try:
+            os.remove(caminho)
+        except FileNotFoundError:
+            pass
+
+
+def prune(max_bytes=None, root=None, name=None):
+    """
+    Remove as entradas usadas há mais tempo até o cache caber em `max_bytes`.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Limite. Usa `MAX_BYTES` quando omitido; 0 esvazia o cache.
+    root : str, optional
+        Pasta do cache.
+    name : str, optional
+        Remove só entradas desta derivação.
+
+    Returns
+    -------
+    list of dict
+        Metadados das entradas removidas.
+    """
+    limite = MAX_BYTES if max_bytes is None else max_bytes
+    lista = entries(root)
+    total = sum(info['bytes'] for info in lista)
+    removidas = []
+    for info in reversed(lista):
+        if total <= limite:
+            break
+        if name is not None and info['name'] != name:
+            continue
+        remove(info['key'], root)
+        total -= info['bytes']
+        removidas.append(info)
+        COUNTERS[info['name'], 'evictions'] += 1
+    return removidas
+
+
+def stats():
+    """
+    Contadores deste processo por derivação.
+
+    Returns
+    -------
+    dict
+        nome -> {'hits', 'misses', 'writes', 'evictions', 'errors'}.
+    """
+    resultado = {}
+    for (nome, evento), quantidade in COUNTERS.items():
+        resultado.setdefault(nome, dict.fromkeys(('hits', 'misses', 'writes', 'evictions', 'errors'), 0))
+        resultado[nome][evento] = quantidade
+    return resultado
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Inspeciona e limpa o cache de artefatos derivados.')
+    parser.add_argument('--root', default=None, help='pasta do cache (padrão: ZOMATO_CACHE)')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    comandos.add_parser('info', help='lista as entradas')
+    podar = comandos.add_parser('prune', help='remove as entradas menos usadas acima do limite')
+    podar.add_argument('--max-mb', type=float, default=MAX_BYTES / 1024 ** 2, help='limite em MB')
+    limpar = comandos.add_parser('clear', help='remove todas as entradas (ou só as de uma derivação)')
+    limpar.add_argument('--name', default=None, help='derivação')
+    args = parser.parse_args()
+
+    if args.comando == 'info':
+        lista = entries(args.root)
+        for info in lista:
+            uso = time.strftime('%Y-%m-%d %H:%M', time.localtime(info['last_used']))
+            print(f"{info['key'][:12]}  {info['name']:20s} {info['version'][:8]:8s} "
+                  f"{info['bytes'] / 1024 ** 2:9.1f} MB  {info.get('hits', 0):6d} acertos  último uso {uso}")
+        total = sum(info['bytes'] for info in lista)
+        print(f'{len(lista)} entradas, {total / 1024 ** 2:.1f} MB (limite {MAX_BYTES / 1024 ** 2:.0f} MB)')
+    else:
+        if args.comando == 'prune':
+            removidas = prune(int(args.max_mb * 1024 ** 2), args.root)
+        else:
+            removidas = prune(0, args.root, name=args.name)
+        liberados = sum(info['bytes'] for info in removidas)
+        print(f'{len(removidas)} entradas removidas, {liberados / 1024 ** 2:.1f} MB liberados')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,192 @@
+"""
+Camada de especificação de gráficos com o visual do Elegant Restaurant.
+
+O tema (fundo `rgb(22,31,44)`, textos brancos, barras com borda e sem
+grades) é registrado uma única vez em `plotly.io.templates` com o nome
+`TEMPLATE_NAME`. Os gráficos são descritos por dicionários simples
+(`bar_spec`, `heatmap_spec`) e convertidos em figura por `figure`, sem passar pela
+validação do Plotly: as especificações só usam propriedades conhecidas,
+então a validação a cada reexecução da página seria custo desperdiçado.
+
+O layout do tema também é copiado para cada especificação, porque o tema
+"streamlit" do `st.plotly_chart` substitui o template da figura no navegador.
+"""
+import copy
+
+import plotly.graph_objects as go
+import plotly.io as pio
+
+TEMPLATE_NAME = 'elegant'
+
+BACKGROUND = 'rgb(22,31,44)'
+
+# Layout comum a todos os gráficos das páginas
+BASE_LAYOUT = {
+    'plot_bgcolor': BACKGROUND,  # Cor de fundo do gráfico
+    'paper_bgcolor': BACKGROUND,  # Cor de fundo fora do gráfico
+    'font': {'color': 'white'},  # Cor do texto
+    'title': {'font': {'size': 18, 'color': 'white', 'family': 'Arial'}},
+    'xaxis': {'title': {'text': ''}, 'color': 'white', 'showgrid': False},  # Sem título e grades
+    'yaxis': {'title': {'text': ''}, 'color': 'white', 'showgrid': False},
+}
+
+# Aparência padrão das barras
+BASE_BAR = {
+    'type': 'bar',
+    'marker': {'color': 'blue', 'line': {'color': 'black', 'width': 1.5}},
+    'textposition': 'outside',  # Posição do texto fora das barras
+}
+
+
+def register_template():
+    """
+    Registra o tema `TEMPLATE_NAME` em `plotly.io.templates` (uma única vez).
+
+    Returns
+    -------
+    plotly.graph_objects.layout.Template
+        O tema registrado.
+    """
+    if TEMPLATE_NAME not in pio.templates:
+        barra = {chave: valor for chave, valor in BASE_BAR.items() if chave != 'type'}
+        pio.templates[TEMPLATE_NAME] = go.layout.Template(layout=BASE_LAYOUT, data={'bar': [barra]})
+    return pio.templates[TEMPLATE_NAME]
+
+
+# JSON do tema resolvido uma vez; as figuras só guardam a referência
+TEMPLATE_JSON = register_template().to_plotly_json()
+
+
+def _merge(base, extra):
+    """Combina dicionários aninhados sem alterar `base`."""
+    resultado = copy.deepcopy(base)
+    for chave, valor in extra.items():
+        if isinstance(valor, dict) and isinstance(resultado.get(chave), dict):
+            resultado[chave] = _merge(resultado[chave], valor)
+        else:
+            resultado[chave] = valor
+    return resultado
+
+
+def bar_spec(data, x, y, title='', text=None, labels=None, color='blue', line_color='black',
+             texttemplate=None, textposition='outside', layout=None):
+    """
+    Descreve um gráfico de barras no visual padrão das páginas.
+
+    Parameters
+    ----------
+    data : pandas.DataFrame
+        Dados do gráfico.
+    x, y : str
+        Colunas dos eixos x e y.
+    title : str, optional
+        Título do gráfico.
+    text : str, optional
+        Coluna exibida sobre as barras.
+    labels : dict, optional
+        Nomes exibidos no hover para cada coluna.
+    color, line_color : str, optional
+        Cor das barras e da borda.
+    texttemplate : str, optional
+        Formato do texto das barras (por exemplo '%{text:.2f}').
+    textposition : str, optional
+        Posição do texto ('outside', 'auto', ...).
+    layout : dict, optional
+        Propriedades extras de layout, combinadas com `BASE_LAYOUT`.
+
+    Returns
+    -------
+    dict
+        Especificação da figura, no formato aceito por `figure`.
+    """
+    labels = labels or {}
+    trace = _merge(BASE_BAR, {
+        'x': data[x].to_numpy(),
+        'y': data[y].to_numpy(),
+        'marker': {'color': color, 'line': {'color': line_color}},
+        'textposition': textposition,
+        'hovertemplate': f'{labels.get(x, x)}=%{{x}}<br>{labels.get(y, y)}=%{{y}}<extra></extra>',
+    })
+    if text is not None:
+        trace['text'] = data[text].to_numpy()
+    if texttemplate is not None:
+        trace['texttemplate'] = texttemplate
+
+    figura_layout = _merge(BASE_LAYOUT, layout or {})
+    figura_layout['title']['text'] = title
+    figura_layout['template'] = TEMPLATE_JSON
+    return {'data': [trace], 'layout': figura_layout}
+
+
+def heatmap_spec(matriz, title='', labels=None, colorscale='YlOrRd', texttemplate=None, layout=None):
+    """
+    Descreve um mapa de calor no visual padrão das páginas.
+
+    Parameters
+    ----------
+    matriz : pandas.DataFrame
+        Valores do mapa; o índice vira o eixo y e as colunas o eixo x.
+        Células NaN ficam vazias.
+    title : str, optional
+        Título do gráfico.
+    labels : dict, optional
+        Nomes exibidos no hover para 'x', 'y' e 'z'.
+    colorscale : str, optional
+        Escala de cores do Plotly.
+    texttemplate : str, optional
+        Formato do texto das células (por exemplo '%{z:.0f}').
+    layout : dict, optional
+        Propriedades extras de layout, combinadas com `BASE_LAYOUT`.
+
+    Returns
+    -------
+    dict
+        Especificação da figura, no formato aceito por `figure`.
+    """
+    labels = labels or {}
+    trace = {
+        'type': 'heatmap',
+        'z': matriz.to_numpy(),
+        'x': matriz.columns.to_numpy(),
+        'y': matriz.index.to_numpy(),
+        'colorscale': colorscale,
+        'hoverongaps': False,
+        'hovertemplate': f"{labels.get('y', 'y')}=%{{y}}<br>{labels.get('x', 'x')}=%{{x}}"
+                         f"<br>{labels.get('z', 'z')}=%{{z}}<extra></extra>",
+    }
+    if texttemplate is not None:
+        trace['texttemplate'] = texttemplate
+
+    figura_layout = _merge(BASE_LAYOUT, _merge({'yaxis': {'autorange': 'reversed'}}, layout or {}))
+    figura_layout['title']['text'] = title
+    figura_layout['template'] = TEMPLATE_JSON
+    return {'data': [trace], 'layout': figura_layout}
+
+
+def figure(spec):
+    """
+    Converte uma especificação em figura do Plotly sem validação.
+
+    Parameters
+    ----------
+    spec : dict
+        Especificação com as chaves 'data' e 'layout' (ver `bar_spec`).
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        Figura pronta para `st.plotly_chart`.
+    """
+    return go.Figure(spec, _validate=False)
+
+
+def bar_chart(data, x, y, **kwargs):
+    """
+    Atalho para `figure(bar_spec(data, x, y, **kwargs))`.
+
+    Returns
+    -------
+    plotly.graph_objects.Figure
+        Gráfico de barras no visual padrão.
+    """
+    return figure(bar_spec(data, x, y, **kwargs))
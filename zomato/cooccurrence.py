@@ -0,0 +1,152 @@
+"""
+Culinárias servidas juntas: matriz de coocorrência culinária x culinária.
+
+A matriz de incidência restaurante x culinária (A) vem da lista completa de
+culinárias (`all_cuisines`) e é guardada esparsa, como pares (linha, código)
+em ordem de linha (`zomato.similarity.cuisine_vectors`). A coocorrência é o
+produto AᵀA: a célula (a, b) conta os restaurantes que servem a e b, e a
+diagonal conta os restaurantes de cada culinária.
+
+O produto é feito só sobre as entradas não nulas: como as entradas de um
+restaurante são consecutivas, os pares de culinárias de um mesmo
+restaurante são as entradas a distância d = 1, 2, ... que têm a mesma linha,
+contados com `np.bincount`. O custo é O(entradas x culinárias por
+restaurante), sem nenhuma matriz densa restaurante x culinária. Cada país
+ou cidade é calculado quando pedido e guardado em um cache pequeno.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from zomato.similarity import cuisine_vectors
+
+# Quantidade de matrizes guardadas no cache
+CACHE_SIZE = 32
+
+_cache_lock = threading.Lock()
+
+
+def build_incidence(df):
+    """
+    Monta a matriz de incidência restaurante x culinária (esparsa).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado (com `all_cuisines`).
+
+    Returns
+    -------
+    dict
+        'rows' e 'codes': linha e código da culinária de cada entrada;
+        'cuisines': nome de cada código; 'entry_country' e 'entry_city':
+        código do país e da cidade de cada entrada; 'countries' e 'cities':
+        nome de cada código (as cidades como pares (país, cidade));
+        'cache': matrizes já calculadas por `cooccurrence`.
+    """
+    linhas, codigos, nomes = cuisine_vectors(df)
+    codigos_pais, paises = pd.factorize(df['country'])
+    codigos_cidade, cidades = pd.factorize(pd.MultiIndex.from_frame(df[['country', 'city']]))
+    return {
+        'rows': linhas,
+        'codes': codigos.astype('int64'),
+        'cuisines': nomes,
+        'entry_country': codigos_pais[linhas],
+        'entry_city': codigos_cidade[linhas],
+        'countries': pd.Index(paises),
+        'cities': pd.Index(cidades),
+        'cache': OrderedDict(),
+    }
+
+
+def _pair_counts(linhas, codigos, n):
+    """Produto AᵀA (n x n) a partir das entradas (linha, código) em ordem de linha."""
+    contagens = np.bincount(codigos * n + codigos, minlength=n * n)
+    distancia = 1
+    while distancia < len(linhas):
+        # Entradas a `distancia` posições uma da outra no mesmo restaurante
+        mesma = linhas[distancia:] == linhas[:-distancia]
+        if not mesma.any():
+            break
+        a = codigos[:-distancia][mesma]
+        b = codigos[distancia:][mesma]
+        contagens += np.bincount(a * n + b, minlength=n * n)
+        contagens += np.bincount(b * n + a, minlength=n * n)
+        distancia += 1
+    return contagens.reshape(n, n)
+
+
+def cooccurrence(incidencia, country=None, city=None):
+    """
+    Matriz de coocorrência de um país, de uma cidade ou de todo o dataset.
+
+    Parameters
+    ----------
+    incidencia : dict
+        Resultado de `build_incidence`.
+    country : str, optional
+        País (None = todos).
+    city : str, optional
+        Cidade do país informado (None = todas).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Matriz quadrada de contagens, só com as culinárias presentes no
+        recorte, da mais frequente para a menos.
+    """
+    cache = incidencia['cache']
+    chave_cache = (country, city)
+    with _cache_lock:
+        if chave_cache in cache:
+            cache.move_to_end(chave_cache)
+            return cache[chave_cache]
+
+    mascara = np.ones(len(incidencia['rows']), dtype=bool)
+    if country is not None and city is not None:
+        mascara = incidencia['entry_city'] == incidencia['cities'].get_indexer([(country, city)])[0]
+    elif country is not None:
+        mascara = incidencia['entry_country'] == incidencia['countries'].get_indexer([country])[0]
+
+    n = len(incidencia['cuisines'])
+    contagens = _pair_counts(incidencia['rows'][mascara], incidencia['codes'][mascara], n)
+    presentes = np.flatnonzero(np.diag(contagens))
+    presentes = presentes[np.argsort(-np.diag(contagens)[presentes], kind='stable')]
+    nomes = incidencia['cuisines'][presentes]
+    matriz = pd.DataFrame(contagens[np.ix_(presentes, presentes)], index=nomes, columns=nomes)
+
+    with _cache_lock:
+        cache[chave_cache] = matriz
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    return matriz
+
+
+def top_matrix(matriz, n=15):
+    """Recorte das `n` culinárias mais frequentes, com a diagonal vazia (NaN)."""
+    recorte = matriz.iloc[:n, :n].astype('float64')
+    np.fill_diagonal(recorte.values, np.nan)
+    return recorte
+
+
+def partners(matriz, cuisine, n=10):
+    """
+    Culinárias servidas junto com `cuisine`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        'cuisine', 'restaurants' (restaurantes que servem as duas) e 'share'
+        (fração dos restaurantes de `cuisine`), em ordem decrescente.
+    """
+    if cuisine not in matriz.index:
+        return pd.DataFrame(columns=['cuisine', 'restaurants', 'share'])
+    linha = matriz.loc[cuisine].drop(cuisine)
+    linha = linha[linha > 0].sort_values(ascending=False, kind='stable').head(n)
+    return pd.DataFrame({
+        'cuisine': linha.index,
+        'restaurants': linha.to_numpy(),
+        'share': linha.to_numpy() / matriz.at[cuisine, cuisine],
+    })
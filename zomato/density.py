@@ -0,0 +1,217 @@
+"""
+Densidade de restaurantes e pontos quentes de nota por estimativa de kernel.
+
+A estimativa é feita em grade, sem laço por ponto:
+1. os pontos são contados em uma grade regular com `np.histogram2d`
+   (e, para as notas, também a soma das notas de cada célula)
+2. a grade é suavizada por um kernel gaussiano separável, aplicado como
+   duas multiplicações de matriz (linhas e colunas)
+3. a densidade vira uma imagem RGBA sobreposta ao mapa do folium
+
+O custo depende do número de pontos só no passo 1 (linear); os passos 2 e 3
+dependem apenas do tamanho da grade. O HTML final fica no cache comprimido
+de `zomato.mapa`, por filtro, camada e largura de banda.
+"""
+import math
+
+import folium
+import numpy as np
+from folium.raster_layers import ImageOverlay
+from matplotlib import colormaps
+
+from zomato.mapa import cached_html
+
+# Células no lado maior da grade
+GRID_SIZE = 256
+
+# Quilômetros por grau de latitude
+KM_POR_GRAU = 111.32
+
+# Percentis usados para o enquadramento (ignora coordenadas isoladas)
+PERCENTIS = (0.5, 99.5)
+
+# Camadas disponíveis: nome -> descrição exibida
+CAMADAS = {
+    'density': 'Densidade de restaurantes',
+    'rating': 'Nota média (pontos quentes)',
+}
+
+# Escala de cores da nota média
+NOTA_MINIMA, NOTA_MAXIMA = 2.5, 5.0
+
+
+def _kernel_matrix(n, sigma):
+    """
+    Matriz (n x n) da convolução gaussiana 1D com desvio `sigma` em células.
+
+    Cada coluna (a massa espalhada a partir de uma célula) soma 1: com os
+    pesos discretos normalizados, a grade suavizada conserva a contagem
+    mesmo com `sigma` menor que uma célula e nas bordas da grade.
+    """
+    distancias = np.arange(n)[:, None] - np.arange(n)[None, :]
+    matriz = np.exp(-0.5 * (distancias / max(sigma, 1e-6)) ** 2)
+    return matriz / matriz.sum(axis=0, keepdims=True)
+
+
+def bounds_for(latitude, longitude, bandwidth_km):
+    """
+    Enquadramento da grade: percentis das coordenadas com margem de 3 bandas.
+
+    Returns
+    -------
+    tuple of (float, float, float, float)
+        (lat_min, lat_max, lon_min, lon_max).
+    """
+    lat_min, lat_max = np.percentile(latitude, PERCENTIS)
+    lon_min, lon_max = np.percentile(longitude, PERCENTIS)
+    margem_lat = 3 * bandwidth_km / KM_POR_GRAU
+    cos_lat = max(math.cos(math.radians((lat_min + lat_max) / 2)), 0.01)
+    margem_lon = margem_lat / cos_lat
+    return (max(lat_min - margem_lat, -85.0), min(lat_max + margem_lat, 85.0),
+            max(lon_min - margem_lon, -180.0), min(lon_max + margem_lon, 180.0))
+
+
+def density_grid(latitude, longitude, bandwidth_km, weights=None, grid_size=GRID_SIZE, bounds=None):
+    """
+    Estima a densidade de pontos em uma grade por kernel gaussiano.
+
+    Parameters
+    ----------
+    latitude, longitude : numpy.ndarray
+        Coordenadas dos pontos.
+    bandwidth_km : float
+        Desvio padrão do kernel em quilômetros.
+    weights : numpy.ndarray, optional
+        Peso de cada ponto (por exemplo a nota). Sem pesos, conta pontos.
+    grid_size : int, optional
+        Células no lado maior da grade.
+    bounds : tuple, optional
+        (lat_min, lat_max, lon_min, lon_max). Usa `bounds_for` quando omitido.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, tuple, float)
+        A grade suavizada (linha 0 = latitude mínima) em pontos (ou soma dos
+        pesos) por km², o enquadramento usado e a área de uma célula em km².
+        A soma da grade x área é a quantidade de pontos (ou soma dos pesos)
+        dentro do enquadramento.
+    """
+    latitude = np.asarray(latitude, dtype='float64')
+    longitude = np.asarray(longitude, dtype='float64')
+    lat_min, lat_max, lon_min, lon_max = bounds or bounds_for(latitude, longitude, bandwidth_km)
+
+    # Células aproximadamente quadradas em km
+    cos_lat = max(math.cos(math.radians((lat_min + lat_max) / 2)), 0.01)
+    altura_km = max(lat_max - lat_min, 1e-6) * KM_POR_GRAU
+    largura_km = max(lon_max - lon_min, 1e-6) * KM_POR_GRAU * cos_lat
+    celula_km = max(altura_km, largura_km) / grid_size
+    n_linhas = max(1, round(altura_km / celula_km))
+    n_colunas = max(1, round(largura_km / celula_km))
+
+    contagens, _, _ = np.histogram2d(latitude, longitude, bins=[n_linhas, n_colunas],
+                                     range=[[lat_min, lat_max], [lon_min, lon_max]], weights=weights)
+    sigma = bandwidth_km / celula_km
+    suavizada = _kernel_matrix(n_linhas, sigma) @ contagens @ _kernel_matrix(n_colunas, sigma).T
+    area = celula_km ** 2
+    return suavizada / area, (lat_min, lat_max, lon_min, lon_max), area
+
+
+def _rgba(valores, mapa_cores, alpha):
+    """Imagem RGBA (uint8, linha 0 = norte) a partir de valores entre 0 e 1."""
+    imagem = mapa_cores(np.clip(valores, 0, 1))
+    imagem[..., 3] = np.clip(alpha, 0, 1)
+    return (np.flipud(imagem) * 255).astype('uint8')
+
+
+def density_image(df, camada, bandwidth_km, grid_size=GRID_SIZE):
+    """
+    Monta a imagem da camada de densidade ou de nota média.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados (com `latitude`, `longitude` e `aggregate_rating`).
+    camada : str
+        'density' ou 'rating' (ver `CAMADAS`).
+    bandwidth_km : float
+        Desvio padrão do kernel em quilômetros.
+    grid_size : int, optional
+        Células no lado maior da grade.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, tuple, dict)
+        A imagem RGBA, o enquadramento e um relatório com `max_density`
+        (restaurantes por km²) e, na camada 'rating', `rating_range`.
+    """
+    latitude = df['latitude'].to_numpy()
+    longitude = df['longitude'].to_numpy()
+    densidade, limites, _ = density_grid(latitude, longitude, bandwidth_km, grid_size=grid_size)
+    maximo = float(densidade.max())
+    relatorio = {'max_density': maximo}
+    relativa = densidade / maximo if maximo > 0 else densidade
+
+    if camada == 'rating':
+        # Nota média suavizada (soma das notas / contagem), só onde há restaurantes
+        somas, _, _ = density_grid(latitude, longitude, bandwidth_km, weights=df['aggregate_rating'].to_numpy(),
+                                   grid_size=grid_size, bounds=limites)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            notas = np.where(densidade > 0, somas / densidade, np.nan)
+        valida = relativa > 0.02
+        escala = (np.nan_to_num(notas) - NOTA_MINIMA) / (NOTA_MAXIMA - NOTA_MINIMA)
+        imagem = _rgba(escala, colormaps['RdYlGn'], np.where(valida, 0.75, 0.0))
+        if valida.any():
+            relatorio['rating_range'] = (float(np.nanmin(notas[valida])), float(np.nanmax(notas[valida])))
+    else:
+        # Raiz quadrada realça as regiões de densidade média
+        imagem = _rgba(np.sqrt(relativa), colormaps['YlOrRd'], np.where(relativa > 0.01, 0.25 + 0.6 * np.sqrt(relativa), 0.0))
+    return imagem, limites, relatorio
+
+
+def build_density_map(df, camada, bandwidth_km, grid_size=GRID_SIZE):
+    """
+    Monta o mapa do folium com a camada de densidade sobreposta.
+
+    Returns
+    -------
+    tuple of (folium.Map, dict)
+        O mapa e o relatório de `density_image`, com `mode` = camada e
+        `total` = quantidade de restaurantes.
+    """
+    imagem, (lat_min, lat_max, lon_min, lon_max), relatorio = density_image(df, camada, bandwidth_km, grid_size)
+    mapa = folium.Map(location=[(lat_min + lat_max) / 2, (lon_min + lon_max) / 2], zoom_start=5)
+    mapa.fit_bounds([[lat_min, lon_min], [lat_max, lon_max]])
+    ImageOverlay(
+        image=imagem,
+        bounds=[[lat_min, lon_min], [lat_max, lon_max]],
+        mercator_project=True,
+        pixelated=False,
+        name=CAMADAS[camada],
+    ).add_to(mapa)
+    return mapa, dict(relatorio, mode=camada, total=len(df))
+
+
+def render_density_html(df, chave, camada='density', bandwidth_km=2.0, grid_size=GRID_SIZE):
+    """
+    Retorna o HTML do mapa de densidade, usando o cache de `zomato.mapa`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados (não vazio).
+    chave : hashable
+        Identifica o filtro que gerou `df` (por exemplo país e cidade).
+    camada : str, optional
+        'density' ou 'rating'.
+    bandwidth_km : float, optional
+        Desvio padrão do kernel em quilômetros.
+    grid_size : int, optional
+        Células no lado maior da grade.
+
+    Returns
+    -------
+    tuple of (str, dict)
+        O HTML e o relatório de `build_density_map`.
+    """
+    chave_cache = ('densidade', chave, len(df), camada, float(bandwidth_km), grid_size)
+    return cached_html(chave_cache, lambda: build_density_map(df, camada, bandwidth_km, grid_size))
@@ -0,0 +1,221 @@
+"""
+Distribuições de nota, preço e avaliações por país, cidade e faixa de preço.
+
+Cada restaurante recebe, uma única vez, um código de bucket por métrica:
+- nota: buckets exatos de 0.1 (0.0 a 5.0)
+- preço para dois e avaliações: buckets logarítmicos de razão `GAMMA`, com
+  erro relativo máximo de sqrt(GAMMA) - 1 (cerca de 1%) no representante, mais um
+  bucket para o zero
+
+Com os códigos, `np.bincount` monta uma matriz de contagens por grupo
+(país, cidade, faixa de preço) x bucket. Essas contagens funcionam como
+esboços de quantis combináveis: o histograma de qualquer combinação de
+filtros é a soma das linhas dos grupos selecionados, e a mediana e o p90
+saem da soma acumulada dos buckets. Nada é ordenado nem filtrado linha a
+linha depois da montagem.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Razão entre as bordas de buckets logarítmicos consecutivos
+GAMMA = 1.02
+
+# Ordem das faixas de preço de `zomato.pipeline.create_price_type`
+PRICE_CATEGORIES = ['cheap', 'normal', 'expensive', 'gourmet']
+
+# Métricas com distribuição: coluna -> (nome exibido, tipo de bucket)
+METRICAS = {
+    'aggregate_rating': ('Nota', 'linear'),
+    'average_cost_for_two': ('Preço para Dois', 'log'),
+    'votes': ('Avaliações', 'log'),
+}
+
+# Chave de cada grupo de contagens
+CHAVE_GRUPOS = ['country', 'city', 'price_category']
+
+
+def bucket_codes(valores, tipo):
+    """
+    Calcula o código de bucket de cada valor.
+
+    Parameters
+    ----------
+    valores : numpy.ndarray
+        Valores da métrica (não negativos).
+    tipo : str
+        'linear' (buckets de 0.1 entre 0 e 5) ou 'log' (razão `GAMMA`).
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray)
+        O código (int64) de cada valor e o valor representante de cada
+        bucket (o próprio valor nos buckets lineares e o ponto médio
+        geométrico nos logarítmicos; o bucket 0 representa o zero).
+    """
+    valores = np.asarray(valores, dtype='float64')
+    if tipo == 'linear':
+        codigos = np.clip(np.rint(valores * 10), 0, 50).astype('int64')
+        return codigos, np.arange(51) / 10
+
+    positivos = valores >= 1
+    logs = np.log(np.where(positivos, valores, 1)) / math.log(GAMMA)
+    codigos = np.where(positivos, np.floor(logs).astype('int64') + 1, 0)
+    n_buckets = int(codigos.max()) + 1 if len(codigos) else 1
+    representantes = np.concatenate([[0.0], GAMMA ** (np.arange(n_buckets - 1) + 0.5)])
+    return codigos, representantes
+
+
+def build_distributions(df):
+    """
+    Monta as contagens por grupo e bucket de cada métrica de `METRICAS`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+
+    Returns
+    -------
+    dict
+        'groups': DataFrame com `CHAVE_GRUPOS`, uma linha por grupo (a
+        posição da linha é o id do grupo); e, para cada métrica, um
+        dicionário com 'counts' (matriz grupos x buckets) e 'values'
+        (representante de cada bucket).
+    """
+    grupos = df[CHAVE_GRUPOS].drop_duplicates().sort_values(CHAVE_GRUPOS, ignore_index=True)
+    ids = pd.MultiIndex.from_frame(grupos).get_indexer(pd.MultiIndex.from_frame(df[CHAVE_GRUPOS]))
+
+    distribuicoes = {'groups': grupos}
+    for coluna, (_, tipo) in METRICAS.items():
+        codigos, representantes = bucket_codes(df[coluna].to_numpy(), tipo)
+        n_buckets = len(representantes)
+        contagens = np.bincount(ids * n_buckets + codigos, minlength=len(grupos) * n_buckets)
+        distribuicoes[coluna] = {
+            'counts': contagens.reshape(len(grupos), n_buckets),
+            'values': representantes,
+        }
+    return distribuicoes
+
+
+def select_groups(distribuicoes, countries=None, cities=None, prices=None):
+    """
+    Seleciona os grupos que passam pelos filtros (listas vazias ou None = todos).
+
+    Returns
+    -------
+    numpy.ndarray
+        Máscara booleana sobre `distribuicoes['groups']`.
+    """
+    grupos = distribuicoes['groups']
+    mascara = np.ones(len(grupos), dtype=bool)
+    for coluna, selecao in (('country', countries), ('city', cities), ('price_category', prices)):
+        if selecao:
+            mascara &= grupos[coluna].isin(selecao).to_numpy()
+    return mascara
+
+
+def histogram(distribuicoes, metrica, mascara):
+    """
+    Soma as contagens dos grupos selecionados.
+
+    Returns
+    -------
+    numpy.ndarray
+        Contagem de restaurantes em cada bucket da métrica.
+    """
+    return distribuicoes[metrica]['counts'][mascara].sum(axis=0)
+
+
+def quantile(contagens, representantes, q):
+    """
+    Calcula quantis a partir das contagens por bucket.
+
+    Parameters
+    ----------
+    contagens : numpy.ndarray
+        Contagens por bucket; com duas dimensões, cada linha é um histograma.
+    representantes : numpy.ndarray
+        Valor representante de cada bucket.
+    q : float
+        Quantil entre 0 e 1 (0.5 para a mediana).
+
+    Returns
+    -------
+    float or numpy.ndarray
+        O representante do bucket que contém o quantil (NaN para histogramas
+        vazios); um valor por linha quando `contagens` tem duas dimensões.
+    """
+    acumulado = np.cumsum(contagens, axis=-1)
+    total = acumulado[..., -1:]
+    # Primeiro bucket em que a contagem acumulada alcança q * total
+    posicao = np.argmax(acumulado >= np.maximum(q * total, 1), axis=-1)
+    resultado = np.where(total[..., 0] > 0, representantes[posicao], np.nan)
+    return resultado if resultado.ndim else float(resultado)
+
+
+def summarize(distribuicoes, metrica, mascara, nivel):
+    """
+    Contagem, mediana e p90 da métrica para cada valor de um nível.
+
+    Parameters
+    ----------
+    distribuicoes : dict
+        Resultado de `build_distributions`.
+    metrica : str
+        Coluna de `METRICAS`.
+    mascara : numpy.ndarray
+        Grupos selecionados (`select_groups`).
+    nivel : str
+        'country', 'city' ou 'price_category'.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexado pelo nível, com as colunas `restaurants`, `median` e `p90`.
+    """
+    dados = distribuicoes[metrica]
+    rotulos = distribuicoes['groups'][nivel].to_numpy()[mascara]
+    contagens = pd.DataFrame(dados['counts'][mascara]).groupby(rotulos, sort=True).sum()
+    matriz = contagens.to_numpy()
+    return pd.DataFrame({
+        'restaurants': matriz.sum(axis=1),
+        'median': quantile(matriz, dados['values'], 0.5),
+        'p90': quantile(matriz, dados['values'], 0.9),
+    }, index=contagens.index.rename(nivel))
+
+
+def rebin(contagens, representantes, bins=30):
+    """
+    Reagrupa os buckets ocupados em até `bins` barras para exibição.
+
+    O intervalo das barras acompanha os buckets ocupados (mudando com os
+    filtros); quando os valores cobrem mais de duas ordens de grandeza as
+    barras são logarítmicas.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray)
+        As bordas (len = barras + 1) e as contagens de cada barra.
+    """
+    ocupados = np.flatnonzero(contagens)
+    if len(ocupados) == 0:
+        return np.array([0.0, 1.0]), np.array([0])
+    minimo, maximo = representantes[ocupados[0]], representantes[ocupados[-1]]
+    positivos = representantes[ocupados][representantes[ocupados] > 0]
+    passo = 0.1 if np.allclose(np.diff(representantes), 0.1) else 0
+    if passo:
+        # Buckets lineares: cada barra junta um número inteiro de buckets
+        n_buckets = int(round((maximo - minimo) / passo)) + 1
+        por_barra = math.ceil(n_buckets / bins)
+        n_barras = math.ceil(n_buckets / por_barra)
+        bordas = minimo - passo / 2 + np.arange(n_barras + 1) * por_barra * passo
+    elif len(positivos) and positivos[-1] / positivos[0] > 100:
+        # Os zeros (se houver) entram na primeira barra
+        bordas = np.geomspace(positivos[0] / GAMMA, maximo * GAMMA, bins + 1)
+        bordas[0] = min(bordas[0], minimo)
+    else:
+        bordas = np.linspace(minimo, maximo * GAMMA, bins + 1)
+    barras, _ = np.histogram(representantes, bins=bordas, weights=contagens)
+    return bordas, barras.astype('int64')
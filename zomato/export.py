@@ -0,0 +1,311 @@
+"""
+Exportação de recortes do dataset tratado em CSV, Parquet ou Excel.
+
+O filtro (`filter_positions`) produz só as posições das linhas escolhidas;
+as linhas são lidas do DataFrame compartilhado em blocos de `CHUNK_ROWS` e
+cada bloco é gravado e descartado antes do próximo. Assim a memória extra
+da exportação fica limitada a um bloco, mesmo para "Todos os Países" com
+milhões de linhas.
+
+O Excel usa o `xlsxwriter` (modo de memória constante, em
+requirements.txt) ou, na falta dele, o `openpyxl` (modo write-only). Sem
+nenhum deles o formato 'xlsx' não é oferecido, nem na página nem na linha
+de comando (`available_formats`).
+
+Os três formatos gravam o cabeçalho mesmo sem nenhuma linha. O Parquet usa
+um schema fixo desde o início (`schema_for`, a partir das colunas do
+DataFrame ou do banco), e não o do primeiro bloco: um filtro vazio gera um
+arquivo válido, e uma coluna só com nulos em um bloco não muda de tipo.
+
+A geração é limitada a um bloco, mas o download do Streamlit não é: o
+`st.download_button` recebe o conteúdo inteiro do arquivo, então o arquivo
+pronto fica em memória enquanto o botão existe (veja
+`zomato.ui.download_buttons`). Para recortes muito grandes, prefira a linha
+de comando, que grava direto no disco.
+
+Uso pela linha de comando:
+    python -m zomato.export restaurantes.parquet --country India --min-rating 4.5
+"""
+import csv
+import io
+import os
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Linhas lidas e gravadas por vez
+CHUNK_ROWS = 50_000
+
+# Limite de linhas de uma planilha do Excel (uma linha fica para o cabeçalho)
+EXCEL_MAX_ROWS = 1_048_576
+
+# Colunas exportadas por padrão
+EXPORT_COLUMNS = ['restaurant_id', 'restaurant_name', 'country', 'city', 'locality', 'cuisines',
+                  'average_cost_for_two', 'currency', 'price_category', 'aggregate_rating',
+                  'rating_text', 'votes', 'latitude', 'longitude']
+
+# Formato -> (extensão, tipo MIME)
+FORMATOS = {
+    'csv': ('csv', 'text/csv'),
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'xlsx': ('xlsx', 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
+
+
+def _excel_backend():
+    """Nome do pacote usado para o Excel ('xlsxwriter', 'openpyxl' ou None)."""
+    for pacote in ('xlsxwriter', 'openpyxl'):
+        try:
+            __import__(pacote)
+            return pacote
+        except ImportError:
+            continue
+    return None
+
+
+def available_formats():
+    """Formatos de `FORMATOS` disponíveis no ambiente atual."""
+    return [formato for formato in FORMATOS if formato != 'xlsx' or _excel_backend()]
+
+
+def filter_positions(df, countries=None, cities=None, cuisines=None, min_rating=None, max_rating=None):
+    """
+    Posições das linhas que passam pelos filtros (None ou lista vazia = todos).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    countries, cities, cuisines : list of str, optional
+        Valores aceitos de `country`, `city` e `cuisines`.
+    min_rating, max_rating : float, optional
+        Limites (inclusivos) de `aggregate_rating`.
+
+    Returns
+    -------
+    numpy.ndarray
+        Posições (int64) em ordem crescente.
+    """
+    mascara = np.ones(len(df), dtype=bool)
+    for coluna, valores in (('country', countries), ('city', cities), ('cuisines', cuisines)):
+        if valores:
+            mascara &= df[coluna].isin(valores).to_numpy()
+    notas = df['aggregate_rating'].to_numpy()
+    if min_rating is not None:
+        mascara &= notas >= min_rating
+    if max_rating is not None:
+        mascara &= notas <= max_rating
+    return np.flatnonzero(mascara)
+
+
+def iter_chunks(df, posicoes, columns=None, chunk_rows=CHUNK_ROWS):
+    """
+    Percorre as linhas de `posicoes` em blocos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    posicoes : numpy.ndarray
+        Posições das linhas, na ordem de saída.
+    columns : list of str, optional
+        Colunas exportadas. Usa `EXPORT_COLUMNS` quando omitido.
+    chunk_rows : int, optional
+        Linhas por bloco.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Um bloco com no máximo `chunk_rows` linhas.
+    """
+    colunas = [df.columns.get_loc(coluna) for coluna in (columns or EXPORT_COLUMNS)]
+    for inicio in range(0, len(posicoes), chunk_rows):
+        yield df.iloc[posicoes[inicio:inicio + chunk_rows], colunas]
+
+
+def schema_for(modelo):
+    """
+    Schema Arrow da exportação a partir das colunas e tipos de `modelo`.
+
+    Basta um DataFrame vazio (por exemplo `df.iloc[:0][colunas]`). Colunas
+    `object` sem nenhum valor não têm tipo para o pyarrow e viram texto.
+    """
+    # Sem os metadados do pandas: os tipos lidos de volta vêm só do Arrow
+    esquema = pa.Schema.from_pandas(modelo.iloc[:0], preserve_index=False).remove_metadata()
+    for posicao, campo in enumerate(esquema):
+        if pa.types.is_null(campo.type):
+            esquema = esquema.set(posicao, campo.with_type(pa.string()))
+    return esquema
+
+
+def write_csv(blocos, destino, schema=None):
+    """Grava os blocos em CSV (UTF-8, cabeçalho só no primeiro bloco ou de `schema` sem blocos)."""
+    texto = io.TextIOWrapper(destino, encoding='utf-8', newline='', write_through=True)
+    try:
+        numero = -1
+        for numero, bloco in enumerate(blocos):
+            bloco.to_csv(texto, header=numero == 0, index=False, quoting=csv.QUOTE_MINIMAL)
+        if numero < 0 and schema is not None:
+            csv.writer(texto).writerow(schema.names)
+    finally:
+        texto.detach()
+
+
+def write_parquet(blocos, destino, schema=None):
+    """Grava os blocos em Parquet, um grupo de linhas por bloco (schema do primeiro bloco sem `schema`)."""
+    escritor = None if schema is None else pq.ParquetWriter(destino, schema)
+    try:
+        for bloco in blocos:
+            if escritor is None:
+                escritor = pq.ParquetWriter(destino, schema_for(bloco))
+            escritor.write_table(pa.Table.from_pandas(bloco, schema=escritor.schema, preserve_index=False))
+        if escritor is None:
+            escritor = pq.ParquetWriter(destino, pa.schema([]))
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+
+def _valor_excel(valor):
+    """Converte escalares do numpy para tipos que os pacotes do Excel aceitam."""
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    return None if isinstance(valor, float) and valor != valor else valor
+
+
+def write_xlsx(blocos, destino, schema=None):
+    """
+    Grava os blocos em Excel, abrindo outra planilha a cada `EXCEL_MAX_ROWS`.
+
+    Sem blocos, a planilha fica só com o cabeçalho de `schema`.
+
+    Raises
+    ------
+    ImportError
+        Se nem `xlsxwriter` nem `openpyxl` estiverem instalados.
+    """
+    pacote = _excel_backend()
+    if pacote is None:
+        raise ImportError("a exportação para Excel precisa do pacote 'xlsxwriter' ou 'openpyxl'")
+
+    if pacote == 'xlsxwriter':
+        import xlsxwriter
+        livro = xlsxwriter.Workbook(destino, {'constant_memory': True})
+        nova_planilha = livro.add_worksheet
+
+        def escrever(planilha, linha, valores):
+            planilha.write_row(linha, 0, valores)
+    else:
+        import openpyxl
+        livro = openpyxl.Workbook(write_only=True)
+        nova_planilha = livro.create_sheet
+
+        def escrever(planilha, linha, valores):
+            planilha.append(valores)
+
+    planilha, linha, cabecalho = None, EXCEL_MAX_ROWS, None
+    for bloco in blocos:
+        cabecalho = list(bloco.columns)
+        for registro in bloco.itertuples(index=False, name=None):
+            if linha >= EXCEL_MAX_ROWS:
+                planilha, linha = nova_planilha(), 0
+                escrever(planilha, linha, cabecalho)
+                linha += 1
+            escrever(planilha, linha, [_valor_excel(valor) for valor in registro])
+            linha += 1
+    if planilha is None:
+        planilha = nova_planilha()
+        if schema is not None:
+            escrever(planilha, 0, schema.names)
+    if pacote == 'xlsxwriter':
+        livro.close()
+    else:
+        livro.save(destino)
+
+
+ESCRITORES = {'csv': write_csv, 'parquet': write_parquet, 'xlsx': write_xlsx}
+
+
+def export(df, posicoes, formato, destino, columns=None, chunk_rows=CHUNK_ROWS):
+    """
+    Exporta as linhas de `posicoes` em blocos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    posicoes : numpy.ndarray
+        Posições das linhas (por exemplo de `filter_positions`).
+    formato : str
+        'csv', 'parquet' ou 'xlsx'.
+    destino : str or file-like
+        Caminho ou arquivo binário aberto para escrita.
+    columns : list of str, optional
+        Colunas exportadas. Usa `EXPORT_COLUMNS` quando omitido.
+    chunk_rows : int, optional
+        Linhas por bloco.
+
+    Returns
+    -------
+    int
+        Quantidade de linhas exportadas.
+    """
+    schema = schema_for(df.iloc[:0][columns or EXPORT_COLUMNS])
+    write(iter_chunks(df, posicoes, columns, chunk_rows), formato, destino, schema)
+    return len(posicoes)
+
+
+def write(blocos, formato, destino, schema=None):
+    """
+    Grava blocos de linhas (de `iter_chunks` ou de outra origem) no formato pedido.
+
+    Parameters
+    ----------
+    blocos : iterable of pandas.DataFrame
+        Blocos com as mesmas colunas, na ordem de saída.
+    formato : str
+        'csv', 'parquet' ou 'xlsx'.
+    destino : str or file-like
+        Caminho ou arquivo binário aberto para escrita.
+    schema : pyarrow.Schema, optional
+        Colunas e tipos da saída (`schema_for`). Sem ele, um arquivo sem
+        blocos sai sem cabeçalho e o Parquet usa o schema do primeiro bloco.
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f'formato desconhecido: {formato!r} (use {", ".join(ESCRITORES)})')
+    if formato == 'csv' and isinstance(destino, (str, os.PathLike)):
+        with open(destino, 'wb') as arquivo:
+            write_csv(blocos, arquivo, schema)
+    else:
+        ESCRITORES[formato](blocos, destino, schema)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Exporta um recorte do dataset tratado.')
+    parser.add_argument('destino', help='arquivo de saída (.csv, .parquet ou .xlsx)')
+    parser.add_argument('--format', default=None, choices=available_formats(),
+                        help='formato (padrão: pela extensão do destino)')
+    parser.add_argument('--country', nargs='+', default=None, help='países')
+    parser.add_argument('--city', nargs='+', default=None, help='cidades')
+    parser.add_argument('--cuisine', nargs='+', default=None, help='culinárias')
+    parser.add_argument('--min-rating', type=float, default=None, help='nota mínima')
+    parser.add_argument('--max-rating', type=float, default=None, help='nota máxima')
+    parser.add_argument('--columns', nargs='+', default=None, help='colunas (padrão: EXPORT_COLUMNS)')
+    args = parser.parse_args()
+
+    from zomato import parallel
+    formato = args.format or os.path.splitext(args.destino)[1].lstrip('.').lower()
+    if formato not in available_formats():
+        motivo = (" (instale 'xlsxwriter' ou 'openpyxl')" if formato == 'xlsx'
+                  else f' (use {", ".join(available_formats())})')
+        parser.error(f'formato indisponível: {formato!r}{motivo}')
+    df, _, _ = parallel.load_data()
+    posicoes = filter_positions(df, args.country, args.city, args.cuisine, args.min_rating, args.max_rating)
+    linhas = export(df, posicoes, formato, args.destino, args.columns)
+    print(f'{linhas:,} linhas exportadas para {args.destino}')
+
+
+if __name__ == '__main__':
+    main()
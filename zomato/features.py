@@ -0,0 +1,174 @@
+"""
+Matriz de características por país para a página de comparação.
+
+`build_country_features` percorre o dataset uma única vez e monta uma linha
+por país, com colunas organizadas nos grupos de `GRUPOS`:
+- resumo: restaurantes, cidades, avaliações (total e média por restaurante),
+  nota média dos restaurantes avaliados, faixa de preço média e preço
+  mediano para dois
+- distribuição das notas pelas faixas de `FAIXAS_NOTA`
+- distribuição das categorias de preço (`zomato.distributions.PRICE_CATEGORIES`)
+- taxas dos serviços de `zomato.services.SERVICOS`
+- mix de culinárias: fração das `N_CULINARIAS` culinárias mais comuns no
+  dataset e das demais ('Outras')
+
+O preço para dois está na moeda de cada país e os dados não trazem câmbio:
+a comparação normalizada usa a faixa de preço média (1 a 4), que o Zomato
+já define relativa a cada mercado. O preço mediano fica na tabela só como
+referência, ao lado da moeda.
+
+As somas por país saem de `np.bincount` sobre os códigos do país (e, nas
+distribuições, de código do país x código da faixa). Comparar países é só
+selecionar linhas da matriz (`compare_countries`), então o custo de cada
+interação não depende da quantidade de restaurantes.
+"""
+import numpy as np
+import pandas as pd
+
+from zomato.distributions import PRICE_CATEGORIES
+from zomato.services import SERVICOS
+
+# Faixas de nota: coluna -> nome exibido; limites inferiores a partir da segunda
+FAIXAS_NOTA = {
+    'rating_none': 'Sem nota',
+    'rating_poor': 'Abaixo de 2.5',
+    'rating_average': '2.5 a 3.4',
+    'rating_good': '3.5 a 3.9',
+    'rating_very_good': '4.0 a 4.4',
+    'rating_excellent': '4.5 ou mais',
+}
+LIMITES_NOTA = [0.01, 2.5, 3.5, 4.0, 4.5]
+
+# Nomes exibidos das categorias de preço
+NOMES_PRECO = {'cheap': 'Barato', 'normal': 'Normal', 'expensive': 'Caro', 'gourmet': 'Gourmet'}
+
+# Culinárias com coluna própria no mix; as demais somam em 'Outras'
+N_CULINARIAS = 10
+
+# Colunas do resumo -> nome exibido
+RESUMO = {
+    'restaurants': 'Restaurantes',
+    'cities': 'Cidades',
+    'votes': 'Avaliações',
+    'votes_mean': 'Avaliações por Restaurante',
+    'rating_mean': 'Nota Média',
+    'price_range_mean': 'Faixa de Preço Média (1 a 4)',
+    'cost_median': 'Preço Mediano para Dois (moeda local)',
+}
+
+# Grupos de colunas da matriz, na ordem da página
+GRUPOS = ['summary', 'rating', 'price', 'services', 'cuisines']
+
+
+def build_country_features(df):
+    """
+    Monta a matriz de características por país.
+
+    Notas iguais a zero (restaurantes sem avaliação) ficam fora da nota
+    média e preços iguais a zero (não informados) fora do preço mediano.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+
+    Returns
+    -------
+    dict
+        'matrix' (DataFrame indexado pelo país, uma coluna por
+        característica; distribuições e taxas em frações de 0 a 1),
+        'currency' (Series país -> moeda mais comum), 'groups' (grupo de
+        `GRUPOS` -> colunas da matriz) e 'labels' (coluna -> nome exibido).
+    """
+    codigos, paises = pd.factorize(df['country'], sort=True)
+    n = len(paises)
+    restaurantes = np.bincount(codigos, minlength=n)
+
+    def somar(pesos):
+        return np.bincount(codigos, weights=pesos, minlength=n)
+
+    def distribuir(faixas, k):
+        """Fração dos restaurantes de cada país em cada uma das k faixas."""
+        contagens = np.bincount(codigos * k + faixas, minlength=n * k).reshape(n, k)
+        return contagens / restaurantes[:, None]
+
+    nota = df['aggregate_rating'].fillna(0).to_numpy(dtype='float64')
+    avaliada = nota > 0
+    preco = df['average_cost_for_two'].to_numpy(dtype='float64')
+    por_pais = pd.DataFrame({'city': df['city'].to_numpy(),
+                             'cost': np.where(preco > 0, preco, np.nan)}).groupby(codigos)
+
+    matriz = pd.DataFrame(index=pd.Index(paises, name='country'))
+    matriz['restaurants'] = restaurantes
+    matriz['cities'] = por_pais['city'].nunique().to_numpy()
+    matriz['votes'] = np.rint(somar(df['votes'].fillna(0).to_numpy(dtype='float64'))).astype('int64')
+    matriz['votes_mean'] = matriz['votes'] / restaurantes
+    with np.errstate(invalid='ignore', divide='ignore'):
+        matriz['rating_mean'] = somar(nota) / somar(avaliada)
+    matriz['price_range_mean'] = somar(df['price_range'].to_numpy(dtype='float64')) / restaurantes
+    matriz['cost_median'] = por_pais['cost'].median().to_numpy()
+    moedas = df.groupby(codigos)['currency'].agg(lambda moeda: moeda.mode().iat[0]).to_numpy()
+
+    faixas_nota = np.searchsorted(LIMITES_NOTA, nota, side='right')
+    matriz[list(FAIXAS_NOTA)] = distribuir(faixas_nota, len(FAIXAS_NOTA))
+
+    colunas_preco = [f'price_{categoria}' for categoria in PRICE_CATEGORIES]
+    faixas_preco = pd.Categorical(df['price_category'], categories=PRICE_CATEGORIES).codes
+    matriz[colunas_preco] = distribuir(faixas_preco, len(PRICE_CATEGORIES))
+
+    servicos = df[list(SERVICOS)].to_numpy(dtype='uint8')
+    for coluna, servico in zip(SERVICOS, servicos.T):
+        matriz[coluna] = somar(servico) / restaurantes
+
+    # As culinárias mais comuns do dataset inteiro, para todos os países terem as mesmas colunas
+    culinarias = df['cuisines'].value_counts().head(N_CULINARIAS).index
+    colunas_culinaria = [f'cuisine_{culinaria}' for culinaria in culinarias] + ['cuisine_other']
+    faixas_culinaria = culinarias.get_indexer(df['cuisines'])
+    faixas_culinaria[faixas_culinaria < 0] = len(culinarias)
+    matriz[colunas_culinaria] = distribuir(faixas_culinaria, len(colunas_culinaria))
+
+    labels = {
+        **RESUMO,
+        **FAIXAS_NOTA,
+        **{f'price_{categoria}': NOMES_PRECO[categoria] for categoria in PRICE_CATEGORIES},
+        **SERVICOS,
+        **{f'cuisine_{culinaria}': culinaria for culinaria in culinarias},
+        'cuisine_other': 'Outras',
+    }
+    return {
+        'matrix': matriz,
+        'currency': pd.Series(moedas, index=matriz.index),
+        'groups': {
+            'summary': list(RESUMO),
+            'rating': list(FAIXAS_NOTA),
+            'price': colunas_preco,
+            'services': list(SERVICOS),
+            'cuisines': colunas_culinaria,
+        },
+        'labels': labels,
+    }
+
+
+def compare_countries(features, countries, group=None):
+    """
+    Seleciona os países a comparar na matriz de características.
+
+    Parameters
+    ----------
+    features : dict
+        Resultado de `build_country_features`.
+    countries : list of str
+        Países, na ordem de exibição; países fora da matriz são ignorados.
+    group : str, optional
+        Grupo de `GRUPOS` (None = todas as colunas).
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por país, com as colunas do grupo renomeadas para os
+        nomes exibidos.
+    """
+    matriz = features['matrix']
+    colunas = features['groups'][group] if group is not None else list(matriz.columns)
+    paises = [pais for pais in countries if pais in matriz.index]
+    return matriz.loc[paises, colunas].rename(columns=features['labels'])
@@ -0,0 +1,335 @@
+"""
+Renderização do mapa de restaurantes com limite de tamanho do HTML.
+
+O mapa do folium embute cada marcador e cada popup no HTML enviado ao
+navegador, então o tamanho da página cresce com o número de restaurantes.
+Antes de desenhar, o tamanho do HTML é estimado; se passar do limite
+(`MAP_BUDGET_BYTES`), o mapa troca para um de dois modos:
+- 'sample': amostra estratificada por cidade, mantendo em cada cidade os
+  restaurantes mais bem avaliados e os com mais votos
+- 'hexbin': agregação em hexágonos, com a contagem e a nota média de cada um
+
+O HTML gerado é guardado comprimido (gzip) em um cache em memória, de modo
+que reexecuções da página com o mesmo filtro não redesenham o mapa, e também
+no cache em disco de `zomato.cache`, reaproveitado depois de reiniciar.
+"""
+import gzip
+import math
+import os
+import threading
+from collections import OrderedDict
+
+import folium
+import numpy as np
+import pandas as pd
+from folium.plugins import MarkerCluster
+
+from zomato import cache, pipeline
+
+# Limite padrão do HTML do mapa; pode ser trocado pela variável ZOMATO_MAP_BUDGET
+MAP_BUDGET_BYTES = int(os.environ.get('ZOMATO_MAP_BUDGET', 3_000_000))
+
+# Modo usado acima do limite ('auto', 'sample' ou 'hexbin'); variável ZOMATO_MAP_MODE
+MAP_MODE = os.environ.get('ZOMATO_MAP_MODE', 'auto')
+
+# Custos aproximados medidos no HTML do folium (bytes)
+BASE_BYTES = 6_000
+BYTES_PER_MARKER = 1_100
+BYTES_PER_HEXAGON = 1_500
+
+# No modo 'auto', a amostra é usada se mantiver pelo menos esta fração dos pontos
+MIN_SAMPLE_FRACTION = 0.25
+
+# Quantidade de mapas guardados no cache
+CACHE_SIZE = 64
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def estimate_size(df):
+    """
+    Estima o tamanho em bytes do HTML com um marcador por restaurante.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes a serem exibidos (com a coluna `restaurant_name`).
+
+    Returns
+    -------
+    int
+        Tamanho estimado do HTML.
+    """
+    popups = df['restaurant_name'].str.len().sum() if len(df) else 0
+    return int(BASE_BYTES + len(df) * BYTES_PER_MARKER + popups)
+
+
+def stratified_sample(df, n_max):
+    """
+    Seleciona até `n_max` restaurantes, estratificando por cidade.
+
+    Cada cidade recebe 1 restaurante e as `n_max` menos o número de cidades
+    vagas restantes são divididas em proporção ao tamanho de cada cidade
+    (pelos maiores restos), então a soma das cotas é exatamente `n_max`. Com
+    mais cidades que `n_max`, só as `n_max` maiores cidades entram, com 1
+    restaurante cada (`choose_mode` usa o hexbin nesse caso). Metade da cota
+    vai para as maiores notas e a outra metade para os restaurantes com mais
+    votos.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados.
+    n_max : int
+        Quantidade máxima de restaurantes na amostra.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Subconjunto de `df` com no máximo `n_max` linhas.
+    """
+    if len(df) <= n_max:
+        return df
+
+    codigos, _ = pd.factorize(df['city'], use_na_sentinel=False)
+    tamanhos = np.bincount(codigos)
+    if len(tamanhos) >= n_max:
+        cota_cidade = np.zeros(len(tamanhos), dtype='int64')
+        cota_cidade[np.argsort(-tamanhos, kind='stable')[:n_max]] = 1
+    else:
+        # Maiores restos: as vagas que o arredondamento deixa vão para as maiores frações
+        proporcional = tamanhos * (n_max - len(tamanhos)) / len(df)
+        cota_cidade = 1 + np.floor(proporcional).astype('int64')
+        sobra = n_max - cota_cidade.sum()
+        cota_cidade[np.argsort(np.floor(proporcional) - proporcional, kind='stable')[:sobra]] += 1
+    cota = cota_cidade[codigos]
+    cota_nota = (cota + 1) // 2
+    cota_votos = cota // 2
+
+    ordem_nota = df.sort_values(['aggregate_rating', 'votes'], ascending=False, kind='stable')
+    posicao_nota = ordem_nota.groupby('city', dropna=False).cumcount().reindex(df.index).to_numpy()
+    ordem_votos = df.sort_values(['votes', 'aggregate_rating'], ascending=False, kind='stable')
+    posicao_votos = ordem_votos.groupby('city', dropna=False).cumcount().reindex(df.index).to_numpy()
+
+    manter = (posicao_nota < cota_nota) | (posicao_votos < cota_votos)
+    return df[manter]
+
+
+def hexbin(df, n_cells):
+    """
+    Agrega os restaurantes em hexágonos de lado fixo (em graus).
+
+    O lado é escolhido para que a caixa que envolve os pontos tenha cerca de
+    `n_cells` hexágonos. As coordenadas axiais de cada ponto são calculadas
+    de forma vetorizada e arredondadas para o hexágono mais próximo.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados, com `latitude`, `longitude` e `aggregate_rating`.
+    n_cells : int
+        Quantidade aproximada de hexágonos.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, float)
+        Uma linha por hexágono ocupado (colunas `latitude`, `longitude`,
+        `restaurants` e `rating_mean`) e o lado do hexágono.
+    """
+    x = df['longitude'].to_numpy()
+    y = df['latitude'].to_numpy()
+    area = max(np.ptp(x) * np.ptp(y), 1e-6)
+    lado = math.sqrt(area / (max(n_cells, 1) * 3 * math.sqrt(3) / 2))
+
+    # Coordenadas axiais (hexágonos com vértice para cima) e arredondamento cúbico
+    q = (math.sqrt(3) / 3 * x - y / 3) / lado
+    r = (2 / 3 * y) / lado
+    s = -q - r
+    q_r, r_r, s_r = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(q_r - q), np.abs(r_r - r), np.abs(s_r - s)
+    ajusta_q = (dq > dr) & (dq > ds)
+    ajusta_r = ~ajusta_q & (dr > ds)
+    q_r = np.where(ajusta_q, -r_r - s_r, q_r)
+    r_r = np.where(ajusta_r, -q_r - s_r, r_r)
+
+    celulas = pd.DataFrame({'q': q_r, 'r': r_r, 'rating': df['aggregate_rating'].to_numpy()})
+    celulas = celulas.groupby(['q', 'r']).agg(restaurants=('rating', 'size'), rating_mean=('rating', 'mean'))
+    celulas = celulas.reset_index()
+    celulas['longitude'] = lado * math.sqrt(3) * (celulas['q'] + celulas['r'] / 2)
+    celulas['latitude'] = lado * 1.5 * celulas['r']
+    return celulas, lado
+
+
+def _hexagono(latitude, longitude, lado):
+    """Vértices (lat, lon) de um hexágono com vértice para cima."""
+    angulos = np.radians(np.arange(6) * 60 + 30)
+    return list(zip(latitude + lado * np.sin(angulos), longitude + lado * np.cos(angulos)))
+
+
+def choose_mode(df, budget=None, mode=None):
+    """
+    Decide como o mapa será desenhado dentro do limite de tamanho.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados.
+    budget : int, optional
+        Limite do HTML em bytes. Usa `MAP_BUDGET_BYTES` quando omitido.
+    mode : str, optional
+        'auto', 'sample' ou 'hexbin'. Usa `MAP_MODE` quando omitido.
+
+    Returns
+    -------
+    tuple of (str, int)
+        O modo escolhido ('markers', 'sample' ou 'hexbin') e a quantidade de
+        marcadores/hexágonos que cabe no limite.
+    """
+    budget = budget or MAP_BUDGET_BYTES
+    mode = mode or MAP_MODE
+    estimado = estimate_size(df)
+    if estimado <= budget:
+        return 'markers', len(df)
+
+    popup_medio = estimado / max(len(df), 1) - BYTES_PER_MARKER
+    n_marcadores = max(1, int((budget - BASE_BYTES) // (BYTES_PER_MARKER + popup_medio)))
+    n_hexagonos = max(1, int((budget - BASE_BYTES) // BYTES_PER_HEXAGON))
+    if mode == 'auto':
+        # Com mais cidades que marcadores, a amostra deixaria cidades inteiras de fora
+        cabe = n_marcadores >= MIN_SAMPLE_FRACTION * len(df) and n_marcadores >= df['city'].nunique(dropna=False)
+        mode = 'sample' if cabe else 'hexbin'
+    return mode, n_marcadores if mode == 'sample' else n_hexagonos
+
+
+def build_map(df, titulo, budget=None, mode=None):
+    """
+    Monta o mapa do folium respeitando o limite de tamanho.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados (não vazio).
+    titulo : str
+        Nome exibido no marcador central (por exemplo o país selecionado).
+    budget : int, optional
+        Limite do HTML em bytes. Usa `MAP_BUDGET_BYTES` quando omitido.
+    mode : str, optional
+        'auto', 'sample' ou 'hexbin'. Usa `MAP_MODE` quando omitido.
+
+    Returns
+    -------
+    tuple of (folium.Map, dict)
+        O mapa e um relatório com as chaves `mode`, `shown` (restaurantes
+        representados por marcadores ou hexágonos), `omitted` e `total`.
+    """
+    modo, limite = choose_mode(df, budget, mode)
+    central_location = [df['latitude'].mean(), df['longitude'].mean()]
+    mapa = folium.Map(location=central_location, zoom_start=5)
+
+    if modo == 'hexbin':
+        celulas, lado = hexbin(df, limite)
+        maximo = celulas['restaurants'].max()
+        for celula in celulas.itertuples():
+            folium.Polygon(
+                locations=_hexagono(celula.latitude, celula.longitude, lado),
+                color='blue',
+                weight=1,
+                fill=True,
+                fill_opacity=0.2 + 0.6 * celula.restaurants / maximo,
+                popup=f"{celula.restaurants} restaurantes - nota média {celula.rating_mean:.2f}"
+            ).add_to(mapa)
+        exibidos = len(df)
+    else:
+        pontos = stratified_sample(df, limite) if modo == 'sample' else df
+
+        # Cluster de marcadores para agrupar os pontos dos restaurantes
+        marker_cluster = MarkerCluster().add_to(mapa)
+        for latitude, longitude, nome in zip(pontos['latitude'], pontos['longitude'],
+                                             pontos['restaurant_name']):
+            folium.Marker(
+                location=[latitude, longitude],
+                popup=f"{nome}",
+                icon=folium.Icon(color='blue', icon='info-sign')
+            ).add_to(marker_cluster)
+        exibidos = len(pontos)
+
+    # Adiciona marcador central com a contagem de restaurantes
+    folium.Marker(
+        location=central_location,
+        popup=f"Total de restaurantes em {titulo}: {len(df)}",
+        icon=folium.Icon(color='red', icon='info-sign')
+    ).add_to(mapa)
+
+    relatorio = {'mode': modo, 'shown': exibidos, 'omitted': len(df) - exibidos, 'total': len(df)}
+    return mapa, relatorio
+
+
+def render_map_html(df, titulo, chave, budget=None, mode=None):
+    """
+    Retorna o HTML do mapa, usando o cache comprimido quando possível.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Restaurantes filtrados (não vazio).
+    titulo : str
+        Nome exibido no marcador central.
+    chave : hashable
+        Identifica o filtro que gerou `df` (por exemplo o país selecionado).
+    budget : int, optional
+        Limite do HTML em bytes. Usa `MAP_BUDGET_BYTES` quando omitido.
+    mode : str, optional
+        'auto', 'sample' ou 'hexbin'. Usa `MAP_MODE` quando omitido.
+
+    Returns
+    -------
+    tuple of (str, dict)
+        O HTML completo do mapa e o relatório de `build_map`, acrescido de
+        `bytes` (tamanho do HTML) e `compressed_bytes` (tamanho no cache).
+    """
+    chave_cache = ('mapa', chave, titulo, len(df), budget or MAP_BUDGET_BYTES, mode or MAP_MODE)
+    return cached_html(chave_cache, lambda: build_map(df, titulo, budget, mode))
+
+
+def cached_html(chave_cache, construir):
+    """
+    Renderiza um mapa do folium uma única vez por chave, guardando o HTML comprimido.
+
+    Procura primeiro no cache em memória e depois no cache em disco.
+
+    Parameters
+    ----------
+    chave_cache : hashable
+        Identifica o mapa (filtro e parâmetros que mudam o resultado).
+    construir : callable
+        Função sem argumentos que retorna (folium.Map, dict de relatório).
+
+    Returns
+    -------
+    tuple of (str, dict)
+        O HTML do mapa e o relatório, acrescido de `bytes` e `compressed_bytes`.
+    """
+    with _cache_lock:
+        if chave_cache in _cache:
+            _cache.move_to_end(chave_cache)
+            comprimido, relatorio = _cache[chave_cache]
+            return gzip.decompress(comprimido).decode('utf-8'), relatorio
+
+    def renderizar():
+        mapa, relatorio = construir()
+        html = mapa.get_root().render()
+        comprimido = gzip.compress(html.encode('utf-8'))
+        return comprimido, dict(relatorio, bytes=len(html.encode('utf-8')), compressed_bytes=len(comprimido))
+
+    # O mapa depende do dataset atual, de todo o tratamento e do módulo que o desenha
+    versao = cache.code_version(__name__, construir.__module__, *cache.MODULOS_TRATAMENTO)
+    comprimido, relatorio = cache.get_or_build('map_html', versao, renderizar,
+                                               source=pipeline.DATASET_PATH, params=chave_cache)
+    html = gzip.decompress(comprimido).decode('utf-8')
+
+    with _cache_lock:
+        _cache[chave_cache] = (comprimido, relatorio)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return html, relatorio
@@ -0,0 +1,141 @@
+"""
+Tabela paginada sobre índices pré-ordenados.
+
+A ordem de todos os restaurantes por cada chave de `SORT_KEYS` é calculada
+uma única vez (`build_sort_index`), inclusive separada por país. Um filtro
+de culinárias só seleciona, em uma passada vetorizada, as posições da ordem
+já pronta (sem reordenar), e o resultado fica em um cache pequeno. A partir
+daí cada página é uma fatia da ordem: custa o mesmo qualquer que seja o
+número da página, e só as linhas visíveis saem do DataFrame.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+# Chaves de ordenação: coluna -> nome exibido
+SORT_KEYS = {
+    'aggregate_rating': 'Nota',
+    'votes': 'Avaliações',
+    'average_cost_for_two': 'Preço para Dois',
+}
+
+# Quantidade de ordens filtradas guardadas no cache
+CACHE_SIZE = 32
+
+_cache_lock = threading.Lock()
+
+
+def build_sort_index(df, keys=None):
+    """
+    Pré-calcula a ordem decrescente dos restaurantes por cada chave.
+
+    Empates mantêm a ordem do DataFrame tratado (`restaurant_id` crescente).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    keys : list of str, optional
+        Colunas de ordenação. Usa `SORT_KEYS` quando omitido.
+
+    Returns
+    -------
+    dict
+        'orders': posições em ordem decrescente por chave; 'by_country': a
+        mesma ordem separada por país; 'cuisine_codes' e 'cuisines': código
+        da culinária de cada linha e nome de cada código; 'cache': ordens
+        filtradas já calculadas por `filtered_order`.
+    """
+    paises = df['country'].to_numpy()
+    codigos_culinaria, culinarias = pd.factorize(df['cuisines'])
+    indice = {'orders': {}, 'by_country': {}, 'cuisine_codes': codigos_culinaria,
+              'cuisines': pd.Index(culinarias), 'cache': OrderedDict()}
+    for chave in keys or SORT_KEYS:
+        ordem = np.argsort(-df[chave].to_numpy(dtype='float64'), kind='stable')
+        indice['orders'][chave] = ordem
+        paises_ordenados = paises[ordem]
+        indice['by_country'][chave] = {
+            pais: ordem[paises_ordenados == pais] for pais in np.unique(paises)
+        }
+    return indice
+
+
+def filtered_order(indice, key, country=None, cuisines=None, ascending=False):
+    """
+    Posições dos restaurantes do filtro, já na ordem pedida.
+
+    Parameters
+    ----------
+    indice : dict
+        Resultado de `build_sort_index`.
+    key : str
+        Chave de ordenação.
+    country : str, optional
+        País (None = todos).
+    cuisines : list of str, optional
+        Culinárias aceitas (None ou vazia = todas).
+    ascending : bool, optional
+        Ordem crescente (a ordem decrescente percorrida ao contrário).
+
+    Returns
+    -------
+    numpy.ndarray
+        Posições das linhas no DataFrame tratado.
+    """
+    cache = indice['cache']
+    chave_cache = (key, country, tuple(sorted(cuisines or ())))
+    with _cache_lock:
+        if chave_cache in cache:
+            cache.move_to_end(chave_cache)
+            ordem = cache[chave_cache]
+            return ordem[::-1] if ascending else ordem
+
+    if country is None:
+        ordem = indice['orders'][key]
+    else:
+        ordem = indice['by_country'][key].get(country, np.empty(0, dtype='int64'))
+    if cuisines:
+        codigos = indice['cuisines'].get_indexer(list(cuisines))
+        ordem = ordem[np.isin(indice['cuisine_codes'][ordem], codigos[codigos >= 0])]
+
+    with _cache_lock:
+        cache[chave_cache] = ordem
+        while len(cache) > CACHE_SIZE:
+            cache.popitem(last=False)
+    return ordem[::-1] if ascending else ordem
+
+
+def n_pages(total, page_size):
+    """Quantidade de páginas (no mínimo 1) para `total` linhas."""
+    return max(1, -(-total // page_size))
+
+
+def get_page(df, ordem, page, page_size, columns):
+    """
+    Linhas de uma página.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    ordem : numpy.ndarray
+        Posições ordenadas (`filtered_order`).
+    page : int
+        Número da página, começando em 1.
+    page_size : int
+        Linhas por página.
+    columns : list of str
+        Colunas exibidas.
+
+    Returns
+    -------
+    pandas.DataFrame
+        No máximo `page_size` linhas, indexadas pela posição no ranking
+        (começando em 1).
+    """
+    inicio = (page - 1) * page_size
+    posicoes = ordem[inicio:inicio + page_size]
+    pagina = df.iloc[posicoes, [df.columns.get_loc(coluna) for coluna in columns]]
+    return pagina.set_axis(pd.RangeIndex(inicio + 1, inicio + 1 + len(posicoes)), axis=0)
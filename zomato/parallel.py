@@ -0,0 +1,279 @@
+"""
+Modo paralelo do pipeline de tratamento e das agregações por país/cidade.
+
+Os dados brutos são particionados por `Country Code` e cada partição é
+tratada (passos 2 a 7 de `zomato.pipeline`) e agregada em um processo do
+`ProcessPoolExecutor`. Os resultados parciais são combinados com as regras
+de cada métrica:
+- somas e contagens são somadas
+- médias são calculadas no final como soma / contagem
+- contagens distintas vêm da combinação dos esboços (`zomato.sketches`) de
+  cada partição, exatos para poucos valores e HyperLogLog acima disso
+
+As partições são sempre processadas e combinadas na mesma ordem (código do
+país crescente), e o DataFrame tratado é idêntico ao de
+`zomato.pipeline.clean_data`, que não passa por este módulo
+(`benchmarks.differential` compara os dois coluna a coluna, e as colunas
+originais com `benchmarks/reference.py`).
+
+Só os passos por linha e as agregações rodam em paralelo: `pipeline.finalize`
+(ordenação, marcas e anomalias) roda no processo principal depois da
+combinação. As marcas agrupam nomes parecidos de qualquer país (uma rede
+pode estar em vários) e o anúncio duplicado das anomalias depende das
+marcas, então essa etapa não é particionável por país sem mudar o
+resultado. Como ela e a criação do pool têm custo fixo, abaixo de
+`MIN_PARALLEL_ROWS` linhas o tratamento roda no processo atual mesmo com
+`workers > 1` (`benchmarks.bench_pipeline` mede as duas partes).
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from zomato import pipeline, sketches, validation
+
+# Número de processos padrão; pode ser trocado pela variável ZOMATO_WORKERS
+DEFAULT_WORKERS = int(os.environ.get('ZOMATO_WORKERS', '1'))
+
+# Tamanho máximo de cada partição. É fixo (não depende do número de
+# processos) para que a ordem das somas, e portanto o resultado, seja sempre
+# a mesma; países grandes como a Índia viram várias partições.
+CHUNK_ROWS = 250_000
+
+# Abaixo deste número de linhas o pool de processos custa mais do que
+# economiza (com 200 mil linhas, 2 processos ainda são mais lentos que 1)
+MIN_PARALLEL_ROWS = int(os.environ.get('ZOMATO_MIN_PARALLEL_ROWS', '500000'))
+
+# Colunas somadas em cada nível de agregação
+SOMAS = ['restaurants', 'votes_sum', 'votes_count', 'cost_sum', 'cost_count',
+         'rating_sum', 'rating_count', 'cuisines_not_informed']
+
+# Esboços usados nas contagens distintas: coluna do agregado -> coluna contada
+ESBOCOS = {'cities': 'city', 'cuisines': 'cuisines'}
+
+# Chave de cada nível de agregação (None = total geral)
+NIVEIS = {
+    'total': None,
+    'country': ['country'],
+    'city': ['country', 'city'],
+}
+
+
+def partition_by_country(raw, chunk_rows=CHUNK_ROWS):
+    """
+    Divide os dados brutos (já sem duplicatas) em partições por `Country Code`.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos sem `Restaurant ID` repetido.
+    chunk_rows : int, optional
+        Tamanho máximo de cada partição; países maiores são divididos em
+        blocos consecutivos.
+
+    Returns
+    -------
+    list of pandas.DataFrame
+        Partições em ordem crescente de código do país (e de bloco); linhas
+        sem `Country Code` ficam nas últimas partições, como um país à parte.
+    """
+    partes = []
+    for _, pais in raw.groupby('Country Code', sort=True, dropna=False):
+        for inicio in range(0, len(pais), chunk_rows):
+            partes.append(pais.iloc[inicio:inicio + chunk_rows].copy())
+    return partes
+
+
+def aggregate_partition(df):
+    """
+    Calcula os agregados parciais de uma partição já tratada.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Partição tratada por `zomato.pipeline.clean_rows`.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Um DataFrame por nível de `NIVEIS`, com as colunas de `SOMAS` e os
+        esboços de `ESBOCOS`.
+    """
+    base = pd.DataFrame({
+        'country': df['country'],
+        'city': df['city'],
+        'restaurants': 1,
+        'votes_sum': df['votes'],
+        'votes_count': df['votes'].notna().astype('int64'),
+        'cost_sum': df['average_cost_for_two'],
+        'cost_count': df['average_cost_for_two'].notna().astype('int64'),
+        'rating_sum': df['aggregate_rating'],
+        'rating_count': df['aggregate_rating'].notna().astype('int64'),
+        'cuisines_not_informed': (df['cuisines'] == 'Not Informed').astype('int64'),
+        'cuisines': df['cuisines'],
+    })
+
+    parciais = {}
+    for nivel, chave in NIVEIS.items():
+        if chave is None:
+            grupos = base.assign(total='total').groupby('total', sort=True)
+        else:
+            grupos = base.groupby(chave, sort=True)
+        somas = grupos[SOMAS].sum()
+        codigos = grupos.ngroup().to_numpy()
+        for coluna, origem in ESBOCOS.items():
+            somas[coluna] = sketches.group_sketches(codigos, base[origem].to_numpy(), len(somas))
+        parciais[nivel] = somas
+    return parciais
+
+
+def merge_aggregates(parciais):
+    """
+    Combina agregados parciais de várias partições.
+
+    Parameters
+    ----------
+    parciais : list of dict
+        Resultados de `aggregate_partition`, na ordem das partições.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Agregados combinados, ainda em forma de somas e esboços.
+    """
+    combinados = {}
+    for nivel in NIVEIS:
+        todos = pd.concat([parcial[nivel] for parcial in parciais])
+        grupos = todos.groupby(level=list(range(todos.index.nlevels)), sort=True)
+        resultado = grupos[SOMAS].sum()
+        for coluna in ESBOCOS:
+            resultado[coluna] = grupos[coluna].agg(sketches.merge_all)
+        combinados[nivel] = resultado
+    return combinados
+
+
+def finalize_aggregates(combinados):
+    """
+    Deriva as métricas finais a partir das somas e esboços combinados.
+
+    Parameters
+    ----------
+    combinados : dict of pandas.DataFrame
+        Resultado de `merge_aggregates`.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Por nível, as colunas de `SOMAS`, as médias `votes_mean`,
+        `cost_mean` e `rating_mean` e as contagens distintas `n_cities` e
+        `n_cuisines` (exatas até `zomato.sketches.EXACT_LIMIT` valores
+        distintos por grupo).
+    """
+    finais = {}
+    for nivel, tabela in combinados.items():
+        tabela = tabela.copy()
+        tabela['votes_mean'] = tabela['votes_sum'] / tabela['votes_count']
+        tabela['cost_mean'] = tabela['cost_sum'] / tabela['cost_count']
+        tabela['rating_mean'] = tabela['rating_sum'] / tabela['rating_count']
+        tabela['n_cities'] = tabela['cities'].map(sketches.DistinctSketch.count)
+        tabela['n_cuisines'] = tabela['cuisines'].map(sketches.DistinctSketch.count)
+        finais[nivel] = tabela
+    return finais
+
+
+def update_aggregates(agregados, novos):
+    """
+    Acrescenta restaurantes novos aos agregados sem reprocessar os antigos.
+
+    As somas e os esboços dos agregados finais são combinados com os da
+    partição nova, como em `merge_aggregates`.
+
+    Parameters
+    ----------
+    agregados : dict of pandas.DataFrame
+        Agregados finais (`finalize_aggregates`).
+    novos : pandas.DataFrame
+        Dados brutos só com restaurantes que ainda não foram contados.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Novos agregados finais.
+    """
+    parcial = aggregate_partition(pipeline.clean_rows(pipeline.drop_duplicate_restaurants(novos)))
+    return finalize_aggregates(merge_aggregates([agregados, parcial]))
+
+
+def _process_partition(parte):
+    """Trata e agrega uma partição (executado dentro de um processo filho)."""
+    tratada = pipeline.clean_rows(parte)
+    return tratada, aggregate_partition(tratada)
+
+
+def clean_and_aggregate(raw, workers=None, min_rows=None):
+    """
+    Trata os dados brutos e calcula as agregações, opcionalmente em paralelo.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos lidos por `zomato.pipeline.read_raw`.
+    workers : int, optional
+        Número de processos. Com 1 tudo roda no processo atual; usa
+        `DEFAULT_WORKERS` quando omitido.
+    min_rows : int, optional
+        Linhas mínimas (sem duplicatas) para usar o pool de processos; usa
+        `MIN_PARALLEL_ROWS` quando omitido. Com 0 o pool é sempre usado.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, dict of pandas.DataFrame)
+        O DataFrame tratado (idêntico a `zomato.pipeline.clean_data`) e os
+        agregados finais por nível.
+    """
+    workers = workers or DEFAULT_WORKERS
+    min_rows = MIN_PARALLEL_ROWS if min_rows is None else min_rows
+    sem_duplicatas = pipeline.drop_duplicate_restaurants(raw)
+    partes = partition_by_country(sem_duplicatas) or [sem_duplicatas.copy()]
+
+    if workers > 1 and len(partes) > 1 and len(sem_duplicatas) >= min_rows:
+        with ProcessPoolExecutor(max_workers=min(workers, len(partes))) as executor:
+            resultados = list(executor.map(_process_partition, partes))
+    else:
+        resultados = [_process_partition(parte) for parte in partes]
+
+    tratadas = [tratada for tratada, _ in resultados]
+    df = pipeline.finalize(pd.concat(tratadas))
+    agregados = finalize_aggregates(merge_aggregates([parcial for _, parcial in resultados]))
+    return df, agregados
+
+
+def load_data(path=None, workers=None, validate=True, quarantine_path=None):
+    """
+    Lê o CSV, valida os dados brutos e executa `clean_and_aggregate`.
+
+    Parameters
+    ----------
+    path : str, optional
+        Caminho do CSV. Usa `zomato.pipeline.DATASET_PATH` quando omitido.
+    workers : int, optional
+        Número de processos. Usa `DEFAULT_WORKERS` quando omitido.
+    validate : bool, optional
+        Se True, aplica as regras de `zomato.validation` e envia as linhas
+        inválidas para o arquivo de quarentena antes do tratamento.
+    quarantine_path : str, optional
+        Caminho do Parquet de quarentena. Usa
+        `zomato.validation.QUARANTINE_PATH` quando omitido.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, dict of pandas.DataFrame, pandas.DataFrame)
+        O DataFrame tratado, os agregados por nível e o relatório de
+        violações por regra (None quando `validate` é False).
+    """
+    raw = pipeline.read_raw(path)
+    relatorio = None
+    if validate:
+        raw, relatorio = validation.quarantine(raw, quarantine_path)
+    df, agregados = clean_and_aggregate(raw, workers=workers)
+    return df, agregados, relatorio
@@ -0,0 +1,296 @@
+"""
+Pipeline de tratamento do dataset do Zomato.
+
+Este módulo concentra as funções de tratamento que antes eram repetidas em
+`Home.py` e em cada página, incluindo:
+- Leitura do arquivo CSV bruto
+- Conversão de códigos (país, faixa de preço, cor) em nomes
+- Limpeza completa do DataFrame (passos 1 a 11)
+
+`clean_data` é a implementação de referência: qualquer caminho alternativo
+(como o modo paralelo de `zomato.parallel`) deve reproduzir exatamente o seu
+resultado.
+"""
+import os
+
+import pandas as pd
+
+from zomato import anomalies, brands
+
+# Caminho padrão do dataset; pode ser trocado pela variável ZOMATO_DATASET
+DATASET_PATH = os.environ.get('ZOMATO_DATASET', 'dataset/zomato.csv')
+
+COUNTRIES = {
+    1: "India", 14: "Australia", 30: "Brazil", 37: "Canada", 94: "Indonesia",
+    148: "New Zeland", 162: "Philippines", 166: "Qatar", 184: "Singapure",
+    189: "South Africa", 191: "Sri Lanka", 208: "Turkey", 214: "United Arab Emirates",
+    215: "England", 216: "United States of America",
+}
+
+COLORS = {
+    "3F7E00": "darkgreen", "5BA829": "green", "9ACD32": "lightgreen",
+    "CDD614": "orange", "FFBA00": "red", "CBCBC8": "darkred", "FF7800": "darkred",
+}
+
+# Colunas descartadas no passo 7
+COLUNAS_PARA_REMOVER = ['country_code', 'rating_color', 'switch_to_order_menu']
+
+
+# Funções de tratamento
+def country_name(country_id):
+    """
+    Converte o código do país em seu nome correspondente.
+
+    Parameters
+    ----------
+    country_id : int
+        Código numérico que identifica o país.
+
+    Returns
+    -------
+    str
+        Nome do país correspondente ao código. Retorna "Unknown" se o código não for encontrado.
+
+    Examples
+    --------
+    >>> country_name(1)
+    'India'
+    >>> country_name(999)
+    'Unknown'
+    """
+    return COUNTRIES.get(country_id, "Unknown")
+
+
+def create_price_type(price_range):
+    """
+    Converte o valor numérico da faixa de preço em uma categoria descritiva.
+
+    Parameters
+    ----------
+    price_range : int
+        Valor numérico de 1 a 4 representando a faixa de preço.
+
+    Returns
+    -------
+    str
+        Categoria de preço correspondente:
+        - 1: "cheap"
+        - 2: "normal"
+        - 3: "expensive"
+        - 4: "gourmet"
+
+    Examples
+    --------
+    >>> create_price_type(1)
+    'cheap'
+    >>> create_price_type(4)
+    'gourmet'
+    """
+    if price_range == 1:
+        return "cheap"
+    elif price_range == 2:
+        return "normal"
+    elif price_range == 3:
+        return "expensive"
+    else:
+        return "gourmet"
+
+
+def color_name(color_code):
+    """
+    Converte o código hexadecimal da cor em um nome descritivo.
+
+    Parameters
+    ----------
+    color_code : str
+        Código hexadecimal da cor (sem o #).
+
+    Returns
+    -------
+    str
+        Nome descritivo da cor. Retorna "unknown" se o código não for encontrado.
+
+    Examples
+    --------
+    >>> color_name("3F7E00")
+    'darkgreen'
+    >>> color_name("INVALID")
+    'unknown'
+    """
+    return COLORS.get(color_code, "unknown")
+
+
+def rename_columns(dataframe):
+    """
+    Renomeia as colunas do DataFrame para o formato snake_case.
+
+    Parameters
+    ----------
+    dataframe : pandas.DataFrame
+        DataFrame cujas colunas serão renomeadas.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Cópia do DataFrame com as colunas renomeadas em formato snake_case.
+
+    Examples
+    --------
+    >>> df = pd.DataFrame(columns=['First Name', 'Last Name'])
+    >>> rename_columns(df).columns
+    Index(['first_name', 'last_name'], dtype='object')
+    """
+    df = dataframe.copy()
+    df.columns = df.columns.str.lower().str.replace(' ', '_')
+    return df
+
+
+def read_raw(path=None):
+    """
+    Lê o arquivo CSV bruto do Zomato.
+
+    Parameters
+    ----------
+    path : str, optional
+        Caminho do CSV. Usa `DATASET_PATH` quando omitido.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados brutos, com os nomes de colunas originais.
+    """
+    return pd.read_csv(path or DATASET_PATH)
+
+
+def drop_duplicate_restaurants(df):
+    """
+    Passo 1: remove restaurantes duplicados, mantendo a primeira ocorrência.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados brutos.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados sem `Restaurant ID` repetido.
+    """
+    return df.drop_duplicates(subset='Restaurant ID')
+
+
+def clean_rows(df):
+    """
+    Passos 2 a 7: tratamentos que dependem apenas de cada linha.
+
+    Como nenhum destes passos olha para outras linhas, eles podem ser
+    aplicados a qualquer partição dos dados e concatenados depois.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados brutos já sem duplicatas.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados tratados, com colunas em snake_case e sem as colunas redundantes.
+    """
+    # 2. Tratamento de valores nulos
+    df['Cuisines'] = df['Cuisines'].fillna('Not Informed')
+    df['Rating text'] = df['Rating text'].fillna('Not Rated')
+    df['Average Cost for two'] = df['Average Cost for two'].fillna(0)
+
+    # 3. Conversão de tipos
+    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
+    df['Average Cost for two'] = pd.to_numeric(df['Average Cost for two'], errors='coerce')
+    df['Aggregate rating'] = pd.to_numeric(df['Aggregate rating'], errors='coerce')
+
+    # 4. Substituição de códigos por nomes
+    df['country_name'] = df['Country Code'].apply(country_name)
+    df['Price Category'] = df['Price range'].apply(create_price_type)
+    df['Color Name'] = df['Rating color'].apply(color_name)
+
+    # 5. Tratamento da coluna Cuisines (pegando apenas a primeira culinária);
+    # a lista completa, normalizada como "A, B, C", fica em All Cuisines
+    df['All Cuisines'] = df['Cuisines'].astype(str).str.replace(r'\s*,\s*', ', ', regex=True).str.strip()
+    df['Cuisines'] = df['Cuisines'].apply(lambda x: str(x).split(',')[0].strip())
+
+    # 6. Renomeação das colunas para snake_case
+    df = rename_columns(df)
+    # Após renomeação, ajuste o nome da coluna 'country_name' para 'country'
+    df.rename(columns={'country_name': 'country'}, inplace=True)
+
+    # 7. Remoção de colunas redundantes ou desnecessárias
+    return df.drop(columns=COLUNAS_PARA_REMOVER)
+
+
+def finalize(df):
+    """
+    Passos 8 a 11: ordena por `restaurant_id`, reinicia o índice, identifica
+    as redes (`brand_id`, ver `zomato.brands`) e marca as anomalias
+    (`anomaly_flags`, ver `zomato.anomalies`).
+
+    Os passos 10 e 11 comparam cada linha com as demais (nomes, grupos de
+    cidade e culinária, coordenadas), por isso ficam aqui e não em
+    `clean_rows`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados tratados por `clean_rows`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados ordenados com índice de 0 a n-1 e as colunas `brand_id` e
+        `anomaly_flags`.
+    """
+    # 8. Ordenação do dataframe
+    df = df.sort_values('restaurant_id')
+
+    # 9. Reset do índice
+    df = df.reset_index(drop=True)
+
+    # 10. Identificação das redes pelo nome
+    df['brand_id'] = brands.assign_brands(df)
+
+    # 11. Anomalias de nota, avaliações e localização (0 = nenhuma)
+    df['anomaly_flags'] = anomalies.flag_anomalies(df)
+    return df
+
+
+def clean_data(raw):
+    """
+    Executa o pipeline completo de tratamento (passos 1 a 11).
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos lidos por `read_raw`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados tratados, prontos para as páginas do dashboard.
+    """
+    df = drop_duplicate_restaurants(raw)
+    df = clean_rows(df)
+    return finalize(df)
+
+
+def load_data(path=None):
+    """
+    Lê o CSV e executa o pipeline de tratamento em um único processo.
+
+    Parameters
+    ----------
+    path : str, optional
+        Caminho do CSV. Usa `DATASET_PATH` quando omitido.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados tratados.
+    """
+    return clean_data(read_raw(path))
@@ -0,0 +1,490 @@
+"""
+Exportação estática das páginas do dashboard, uma por país.
+
+Cada visão (página x opção do seletor de país) é executada sem navegador
+com `streamlit.testing.v1.AppTest` e convertida em um arquivo HTML: textos e
+métricas viram HTML, os gráficos levam a especificação Plotly embutida
+(desenhada no navegador pelo `plotly.min.js` copiado para a saída), as
+tabelas viram `<table>` e os mapas folium são gravados como arquivos à parte
+(`assets/<hash>.html`, reaproveitados entre visões) e abertos em `<iframe>`.
+Widgets ficam de fora: a navegação entre países é feita por links.
+
+As visões são executadas em paralelo em um pool de processos (cada
+processo carrega os dados uma vez, pelo cache em disco). O `manifest.json`
+da saída guarda, por visão, o hash dos dados de que ela depende e a versão
+do código; uma nova execução só refaz as visões cujo hash mudou.
+
+O hash de uma visão combina:
+- o hash das linhas do país (ou de todas as linhas, em "Todos os Países")
+- o hash de cada resumo global que a página também exibe (`ESCOPOS`), de
+  modo que a mudança nos dados de um país refaz as visões dos outros países
+  que mostram rankings ou médias globais
+- o hash do código-fonte da página e do pacote `zomato`
+
+Páginas que ignoram o seletor de país (`PAGINAS_GLOBAIS`) têm uma única
+visão, "Todos os Países", e o hash dela usa só os resumos que exibe.
+
+Uso pela linha de comando:
+    python -m zomato.prerender site --workers 4
+    python -m zomato.prerender site --pages Home.py pages/paises.py --force
+"""
+import hashlib
+import html
+import importlib
+import json
+import os
+import shutil
+import sys
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+# Páginas exportadas: arquivo -> (pasta na saída, título)
+PAGINAS = {
+    'Home.py': ('home', 'Home'),
+    'pages/paises.py': ('paises', 'Países'),
+    'pages/cidades.py': ('cidades', 'Cidades'),
+    'pages/cuisines.py': ('cuisines', 'Cuisines'),
+}
+
+# Resumos globais exibidos por cada página além das linhas do país:
+# - 'totais': totais do dataset (métricas do Home)
+# - 'paises': agregados por país (gráficos top 6 de Países)
+# - 'rankings_cidades': linhas dos rankings por marca e culinárias distintas por cidade (Cidades)
+# - 'culinarias': culinárias selecionadas por padrão (melhor nota de cada culinária, sem anomalias)
+# - 'medias_culinarias': médias por culinária dos tops 10 melhores e piores (Cuisines)
+ESCOPOS = {
+    'Home.py': ('totais',),
+    'pages/paises.py': ('paises',),
+    'pages/cidades.py': ('rankings_cidades',),
+    'pages/cuisines.py': ('culinarias', 'medias_culinarias'),
+}
+
+# Páginas cujo conteúdo não depende do país selecionado: uma única visão
+PAGINAS_GLOBAIS = {'pages/paises.py'}
+
+# Opção "todos" do seletor de país das páginas
+TODOS = 'Todos os Países'
+
+# Tempo máximo de execução de uma visão (segundos)
+TIMEOUT = 600
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ESTILO = """
+body { font-family: 'Source Sans Pro', sans-serif; margin: 0; display: flex; color: #31333f; }
+nav { width: 240px; min-height: 100vh; padding: 1.5rem 1rem; background: #f0f2f6; box-sizing: border-box; }
+nav a { display: block; color: #31333f; text-decoration: none; padding: 0.15rem 0; }
+nav a.atual { font-weight: bold; }
+nav select { width: 100%; margin: 0.5rem 0 1rem; }
+main { flex: 1; padding: 2rem 3rem; min-width: 0; }
+.linha { display: flex; gap: 2rem; }
+.linha > div { flex: 1; min-width: 0; }
+.metrica .rotulo { font-size: 0.9rem; }
+.metrica .valor { font-size: 2.2rem; }
+.metrica .delta { font-size: 0.9rem; color: #09ab3b; }
+.legenda { font-size: 0.85rem; color: #808495; }
+table { border-collapse: collapse; font-size: 0.85rem; margin: 1rem 0; }
+th, td { border: 1px solid #e6e9ef; padding: 0.25rem 0.5rem; text-align: left; }
+iframe { border: none; }
+"""
+
+
+def slugify(texto):
+    """Nome de arquivo a partir de um texto ('Todos os Países' -> 'todos-os-paises')."""
+    sem_acentos = unicodedata.normalize('NFKD', texto).encode('ascii', 'ignore').decode('ascii')
+    partes = ''.join(c if c.isalnum() else ' ' for c in sem_acentos.lower()).split()
+    return '-'.join(partes) or 'vazio'
+
+
+def _sha(*partes):
+    """Hash SHA-256 (hexadecimal) de uma sequência de bytes ou textos."""
+    h = hashlib.sha256()
+    for parte in partes:
+        h.update(parte if isinstance(parte, bytes) else str(parte).encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def partition_hashes(df, agregados):
+    """
+    Hash dos dados de cada partição (país) e dos resumos globais.
+
+    Cada linha recebe um hash (`pd.util.hash_pandas_object`) uma única vez;
+    o hash de um país é o hash da sequência de hashes das suas linhas.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    agregados : dict of pandas.DataFrame
+        Agregados de `zomato.parallel`.
+
+    Returns
+    -------
+    dict
+        País (e `TODOS`) -> hash das linhas, mais as chaves de `ESCOPOS` ->
+        hash do resumo correspondente.
+    """
+    from zomato.sketches import DistinctSketch, merge_all
+
+    linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    paises = df['country'].to_numpy()
+    hashes = {TODOS: _sha(linhas.tobytes())}
+    for pais, posicoes in pd.Series(range(len(df))).groupby(paises, sort=True):
+        hashes[pais] = _sha(linhas[posicoes.to_numpy()].tobytes())
+
+    # As páginas abrem com "Ocultar anomalias" ligado: os rankings globais usam só essas linhas
+    sem_anomalias = df[df['anomaly_flags'] == 0]
+
+    totais = agregados['total'].drop(columns=['cities', 'cuisines'], errors='ignore')
+    hashes['totais'] = _sha(totais.to_json(), sorted(hashes))
+    hashes['paises'] = _sha(agregados['country'][['restaurants', 'n_cities', 'votes_mean', 'cost_mean']].to_json())
+
+    ranqueadas = sem_anomalias[['brand_id', 'restaurant_name', 'city', 'aggregate_rating']]
+    por_cidade = agregados['city'].groupby(level='city', sort=True).agg(
+        {'cuisines': merge_all, 'cuisines_not_informed': 'sum'})
+    distintas = por_cidade['cuisines'].map(DistinctSketch.count) - (por_cidade['cuisines_not_informed'] > 0)
+    hashes['rankings_cidades'] = _sha(pd.util.hash_pandas_object(ranqueadas, index=False).to_numpy().tobytes(),
+                                      distintas.to_json())
+
+    hashes['culinarias'] = _sha(sem_anomalias.groupby('cuisines')['aggregate_rating'].max().to_json())
+    hashes['medias_culinarias'] = _sha(df.groupby('cuisines')['aggregate_rating'].mean().round(1).to_json())
+    return hashes
+
+
+def code_hash(pagina):
+    """Hash do código-fonte de uma página e de todos os módulos de `zomato`."""
+    arquivos = [os.path.join(RAIZ, pagina)]
+    pasta = os.path.join(RAIZ, 'zomato')
+    arquivos += sorted(os.path.join(pasta, nome) for nome in os.listdir(pasta) if nome.endswith('.py'))
+    conteudos = []
+    for caminho in arquivos:
+        with open(caminho, 'rb') as arquivo:
+            conteudos.append(arquivo.read())
+    return _sha(*conteudos)[:16]
+
+
+def view_hash(pagina, pais, hashes, versao):
+    """Hash de uma visão: dados do país, resumos da página e versão do código."""
+    dados = () if pagina in PAGINAS_GLOBAIS else (hashes[pais],)
+    return _sha(pagina, pais, *dados, *(hashes[escopo] for escopo in ESCOPOS[pagina]), versao)
+
+
+def page_countries(pagina, paises):
+    """Opções do seletor de país com visão própria na página (só `TODOS` nas páginas globais)."""
+    return [TODOS] if pagina in PAGINAS_GLOBAIS else paises
+
+
+#==================================
+# Conversão da árvore do AppTest
+#==================================
+
+def _markdown(texto):
+    """Markdown do Streamlit em HTML (CommonMark + tabelas)."""
+    from markdown_it import MarkdownIt
+    return MarkdownIt('commonmark').enable('table').render(texto)
+
+
+def _render_node(no, assets):
+    """HTML de um elemento ou bloco da árvore; iframes vão para `assets`."""
+    filhos = getattr(no, 'children', None)
+    if filhos is not None:
+        conteudo = ''.join(_render_node(filho, assets) for filho in filhos.values())
+        if not conteudo:
+            return ''
+        if no.type == 'horizontal':
+            return f'<div class="linha">{conteudo}</div>'
+        if no.type == 'expandable':
+            return f'<details><summary>{html.escape(no.proto.expandable.label)}</summary>{conteudo}</details>'
+        return f'<div>{conteudo}</div>'
+
+    tipo = no.type
+    if tipo in ('markdown', 'caption'):
+        corpo = _markdown(no.value)
+        return f'<div class="legenda">{corpo}</div>' if tipo == 'caption' else corpo
+    if tipo in ('title', 'header', 'subheader'):
+        nivel = {'title': 1, 'header': 2, 'subheader': 3}[tipo]
+        return f'<h{nivel}>{html.escape(no.value)}</h{nivel}>'
+    if tipo == 'metric':
+        delta = f'<div class="delta">{html.escape(no.delta)}</div>' if no.delta else ''
+        return (f'<div class="metrica"><div class="rotulo">{html.escape(no.label)}</div>'
+                f'<div class="valor">{html.escape(str(no.value))}</div>{delta}</div>')
+    if tipo == 'plotly_chart':
+        # A especificação vai como JSON; '</' escapado para não fechar o <script>
+        spec = no.proto.spec.replace('</', '<\\/')
+        identificador = f'grafico-{len(assets["graficos"])}'
+        assets['graficos'].append(identificador)
+        return (f'<div id="{identificador}"></div><script>(function(){{var s={spec};'
+                f'Plotly.newPlot("{identificador}", s.data, s.layout, {{responsive: true}});}})();</script>')
+    if tipo == 'arrow_data_frame':
+        return no.value.to_html(index=False, border=0, na_rep='', float_format=lambda v: f'{v:.2f}')
+    if tipo == 'iframe':
+        conteudo = no.proto.srcdoc.encode('utf-8')
+        nome = f'{_sha(conteudo)[:16]}.html'
+        assets['arquivos'][nome] = conteudo
+        altura = int(no.proto.height or 600)
+        return f'<iframe src="../assets/{nome}" width="100%" height="{altura}" loading="lazy"></iframe>'
+    # Widgets, imagens e elementos vazios não têm versão estática
+    return ''
+
+
+def render_view(pagina, pais):
+    """
+    Executa uma visão sem navegador e converte o resultado em HTML.
+
+    Parameters
+    ----------
+    pagina : str
+        Arquivo da página (chave de `PAGINAS`).
+    pais : str
+        Opção do seletor de país.
+
+    Returns
+    -------
+    tuple of (str, dict of bytes)
+        O HTML da área principal e os arquivos de `assets/` (nome -> conteúdo).
+
+    Raises
+    ------
+    RuntimeError
+        Quando a página termina com exceção.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(RAIZ, pagina), default_timeout=TIMEOUT).run()
+    if pais != TODOS:
+        app.sidebar.selectbox[0].set_value(pais).run()
+    if app.exception:
+        raise RuntimeError(f'{pagina} ({pais}): {app.exception[0].message}')
+    assets = {'graficos': [], 'arquivos': {}}
+    corpo = _render_node(app.main, assets)
+    return corpo, assets['arquivos']
+
+
+def _render_task(tarefa):
+    """Executa uma visão dentro de um processo do pool."""
+    pagina, pais = tarefa
+    inicio = time.perf_counter()
+    corpo, arquivos = render_view(pagina, pais)
+    return pagina, pais, corpo, arquivos, time.perf_counter() - inicio
+
+
+#==================================
+# Montagem do site
+#==================================
+
+def view_path(pagina, pais):
+    """Caminho relativo do arquivo de uma visão ('home/india.html'); páginas globais têm um só."""
+    return f'{PAGINAS[pagina][0]}/{slugify(TODOS if pagina in PAGINAS_GLOBAIS else pais)}.html'
+
+
+def _page_html(pagina, pais, corpo, paginas, paises):
+    """Documento completo de uma visão, com a navegação entre páginas e países."""
+    links = ''.join(
+        f'<a href="../{view_path(outra, pais)}"{" class=atual" if outra == pagina else ""}>'
+        f'{html.escape(PAGINAS[outra][1])}</a>'
+        for outra in paginas
+    )
+    opcoes = ''.join(
+        f'<option value="../{view_path(pagina, opcao)}"{" selected" if opcao == pais else ""}>'
+        f'{html.escape(opcao)}</option>'
+        for opcao in page_countries(pagina, paises)
+    )
+    titulo = html.escape(f'{PAGINAS[pagina][1]} - {pais}')
+    return f"""<!DOCTYPE html>
+<html lang="pt-br">
+<head>
+<meta charset="utf-8">
+<title>{titulo}</title>
+<style>{_ESTILO}</style>
+<script src="../plotly.min.js"></script>
+</head>
+<body>
+<nav>
+<img src="../logo.jpg" width="120" alt="Elegant Restaurant">
+<h3>Elegant Restaurant</h3>
+<h2>Food Experience</h2>
+<hr>
+<label>Selecione o País</label>
+<select onchange="location.href = this.value">{opcoes}</select>
+{links}
+</nav>
+<main>{corpo}</main>
+</body>
+</html>
+"""
+
+
+def _index_html(paginas, paises):
+    """Página inicial com os links de todas as visões."""
+    linhas = ''.join(
+        f'<tr><td>{html.escape(pais)}</td>'
+        + ''.join(f'<td><a href="{view_path(pagina, pais)}">{html.escape(PAGINAS[pagina][1])}</a></td>'
+                  for pagina in paginas)
+        + '</tr>'
+        for pais in paises
+    )
+    return f"""<!DOCTYPE html>
+<html lang="pt-br">
+<head><meta charset="utf-8"><title>Elegant Restaurant</title><style>{_ESTILO}</style></head>
+<body><main><h1>Elegant Restaurant</h1><table>{linhas}</table></main></body>
+</html>
+"""
+
+
+def _write(caminho, conteudo):
+    """Grava um arquivo de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f'{caminho}.{os.getpid()}.tmp'
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(conteudo if isinstance(conteudo, bytes) else conteudo.encode('utf-8'))
+    os.replace(temporario, caminho)
+
+
+def load_manifest(output):
+    """Lê o `manifest.json` da saída (vazio quando não existe)."""
+    try:
+        with open(os.path.join(output, 'manifest.json'), encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except (OSError, ValueError):
+        return {'views': {}}
+
+
+def build_site(output, paginas=None, workers=None, force=False):
+    """
+    Exporta as visões cujo hash mudou desde a última execução.
+
+    Parameters
+    ----------
+    output : str
+        Pasta de saída.
+    paginas : list of str, optional
+        Páginas exportadas (chaves de `PAGINAS`; todas quando omitido).
+    workers : int, optional
+        Processos do pool. Usa `zomato.parallel.DEFAULT_WORKERS` quando omitido.
+    force : bool, optional
+        Refaz todas as visões.
+
+    Returns
+    -------
+    dict
+        'rendered' e 'skipped': visões refeitas e reaproveitadas;
+        'seconds': tempo de execução de cada visão refeita.
+    """
+    from zomato import parallel
+    from zomato.ui import load_dataset
+
+    paginas = list(paginas or PAGINAS)
+    workers = workers or parallel.DEFAULT_WORKERS
+    df, agregados = load_dataset()
+    hashes = partition_hashes(df, agregados)
+    paises = [TODOS] + sorted(df['country'].unique())
+    versoes = {pagina: code_hash(pagina) for pagina in paginas}
+
+    manifesto = load_manifest(output)
+    visoes = manifesto['views']
+    pendentes = []
+    esperadas = set()
+    for pagina in paginas:
+        for pais in page_countries(pagina, paises):
+            caminho = view_path(pagina, pais)
+            esperadas.add(caminho)
+            atual = visoes.get(caminho, {})
+            if (force or atual.get('hash') != view_hash(pagina, pais, hashes, versoes[pagina])
+                    or not os.path.exists(os.path.join(output, caminho))):
+                pendentes.append((pagina, pais))
+
+    # Arquivos comuns a todas as visões
+    import plotly
+    _write(os.path.join(output, 'logo.jpg'), open(os.path.join(RAIZ, 'logo.jpg'), 'rb').read())
+    plotly_js = os.path.join(os.path.dirname(plotly.__file__), 'package_data', 'plotly.min.js')
+    if not os.path.exists(os.path.join(output, 'plotly.min.js')):
+        shutil.copyfile(plotly_js, os.path.join(output, 'plotly.min.js'))
+
+    tempos = {}
+    # O AppTest troca o módulo `__main__` dentro dos processos: a tarefa vai pelo nome do módulo
+    tarefa = importlib.import_module(__name__ if __name__ != '__main__' else 'zomato.prerender')._render_task
+    if workers > 1 and len(pendentes) > 1:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(pendentes)))
+        resultados = executor.map(tarefa, pendentes)
+    else:
+        executor = None
+        resultados = map(tarefa, pendentes)
+    try:
+        for pagina, pais, corpo, arquivos, segundos in resultados:
+            for nome, conteudo in arquivos.items():
+                destino = os.path.join(output, 'assets', nome)
+                if not os.path.exists(destino):
+                    _write(destino, conteudo)
+            caminho = view_path(pagina, pais)
+            _write(os.path.join(output, caminho), _page_html(pagina, pais, corpo, paginas, paises))
+            visoes[caminho] = {
+                'page': pagina, 'country': pais, 'hash': view_hash(pagina, pais, hashes, versoes[pagina]),
+                'data_hash': hashes[pais], 'code_version': versoes[pagina],
+                'assets': sorted(arquivos), 'rendered_at': time.time(),
+            }
+            tempos[caminho] = segundos
+            # O manifesto é gravado a cada visão: uma execução interrompida não perde o que já foi feito
+            _write(os.path.join(output, 'manifest.json'), json.dumps(manifesto, indent=1, ensure_ascii=False))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # Visões que não existem mais (países removidos, cópias por país de páginas globais)
+    for caminho in [caminho for caminho, visao in visoes.items()
+                    if visao['page'] in paginas and caminho not in esperadas]:
+        del visoes[caminho]
+        if os.path.exists(os.path.join(output, caminho)):
+            os.remove(os.path.join(output, caminho))
+
+    _write(os.path.join(output, 'index.html'), _index_html(paginas, paises))
+    _write(os.path.join(output, 'manifest.json'), json.dumps(manifesto, indent=1, ensure_ascii=False))
+    _remove_orphan_assets(output, visoes)
+    return {
+        'rendered': [view_path(pagina, pais) for pagina, pais in pendentes],
+        'skipped': len(esperadas) - len(pendentes),
+        'seconds': tempos,
+    }
+
+
+def _remove_orphan_assets(output, visoes):
+    """Remove de `assets/` os arquivos que nenhuma visão usa mais."""
+    pasta = os.path.join(output, 'assets')
+    if not os.path.isdir(pasta):
+        return
+    usados = {nome for visao in visoes.values() for nome in visao.get('assets', [])}
+    for nome in os.listdir(pasta):
+        if nome not in usados:
+            os.remove(os.path.join(pasta, nome))
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Exporta as páginas do dashboard como HTML estático.')
+    parser.add_argument('output', help='pasta de saída')
+    parser.add_argument('--pages', nargs='+', choices=list(PAGINAS), default=None, help='páginas exportadas')
+    parser.add_argument('--workers', type=int, default=None, help='processos (padrão: ZOMATO_WORKERS)')
+    parser.add_argument('--force', action='store_true', help='refaz todas as visões')
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    # Fora do `streamlit run` cada leitura do cache avisa que não há sessão
+    from streamlit.logger import set_log_level
+    set_log_level('error')
+    # As páginas abrem `logo.jpg` e o dataset por caminhos relativos à raiz do projeto
+    os.chdir(RAIZ)
+    if RAIZ not in sys.path:
+        sys.path.insert(0, RAIZ)
+    inicio = time.perf_counter()
+    resultado = build_site(output, args.pages, args.workers, args.force)
+    for caminho, segundos in sorted(resultado['seconds'].items()):
+        print(f'{caminho:40s} {segundos:6.1f} s')
+    print(f"{len(resultado['rendered'])} visões geradas, {resultado['skipped']} sem mudanças "
+          f'em {time.perf_counter() - inicio:.1f} s')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+"""
+Regressão e correlação do preço para dois com a nota e as avaliações.
+
+Para cada (país, cidade) e cada métrica y de `METRICAS_Y`, a tabela guarda
+só as estatísticas suficientes, somadas com `np.bincount` em uma passada:
+n, Σx, Σx², Σy, Σy² e Σxy, com x sendo o preço para dois na moeda local
+('linear') ou o seu logaritmo ('log'). Inclinação, intercepto, R² e o r de
+Pearson de qualquer grupo saem dessas somas; os países são a soma das
+suas cidades. Preços nunca são misturados entre países: cada grupo tem uma
+única moeda, e na escala 'log' a inclinação não depende da moeda (é a
+variação de y por unidade de log do preço).
+
+O Spearman é o Pearson dos postos. Para que ele também seja combinável, a
+tabela guarda as contagens conjuntas (bucket do preço, bucket de y) de cada
+cidade, com os buckets de `zomato.distributions`; os postos médios de cada
+bucket vêm da soma acumulada das contagens. A nota é exata e preço e
+avaliações são agrupados em faixas de 2%, então empates dentro de uma faixa
+contam como empates.
+
+Restaurantes novos entram com `update_regression_stats`, que soma as
+tabelas sem reprocessar os antigos.
+"""
+import numpy as np
+import pandas as pd
+
+from zomato import distributions
+
+# Métricas comparadas com o preço: coluna -> nome exibido
+METRICAS_Y = {
+    'aggregate_rating': 'Nota',
+    'votes': 'Avaliações',
+}
+
+# Escalas do preço: nome -> descrição
+ESCALAS_X = {
+    'log': 'Log do preço',
+    'linear': 'Preço na moeda local',
+}
+
+# Chave de cada grupo da tabela
+CHAVE_GRUPOS = ['country', 'city']
+
+# Níveis de consulta: nome -> colunas do agrupamento
+NIVEIS = {
+    'country': ['country'],
+    'city': ['country', 'city'],
+}
+
+
+def _validos(df, y):
+    """Linhas com preço informado e, para a nota, já avaliadas."""
+    mascara = (df['average_cost_for_two'] > 0) & df[y].notna()
+    if y == 'aggregate_rating':
+        mascara &= df[y] > 0
+    return mascara.to_numpy()
+
+
+def build_regression_stats(df):
+    """
+    Monta as estatísticas suficientes e as contagens conjuntas por cidade.
+
+    Preços iguais a zero (não informados) ficam de fora, assim como notas
+    iguais a zero (restaurantes sem avaliação).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+
+    Returns
+    -------
+    dict
+        'sums': uma linha por (país, cidade), com `CHAVE_GRUPOS` e, para cada
+        y de `METRICAS_Y` e x de `ESCALAS_X`, as colunas '<y>_n',
+        '<y>_sy', '<y>_syy', '<y>_sx_<x>', '<y>_sxx_<x>' e '<y>_sxy_<x>';
+        'joint': por y, as contagens 'n' de cada (país, cidade, 'bx', 'by').
+    """
+    grupos = df[CHAVE_GRUPOS].drop_duplicates().sort_values(CHAVE_GRUPOS, ignore_index=True)
+    ids = pd.MultiIndex.from_frame(grupos).get_indexer(pd.MultiIndex.from_frame(df[CHAVE_GRUPOS]))
+    n = len(grupos)
+
+    def somar(pesos):
+        return np.bincount(ids, weights=pesos, minlength=n)
+
+    preco = df['average_cost_for_two'].fillna(0).to_numpy(dtype='float64')
+    escalas = {'linear': preco, 'log': np.log(np.where(preco > 0, preco, 1))}
+    codigos_preco, _ = distributions.bucket_codes(preco, 'log')
+
+    somas = grupos.copy()
+    conjuntas = {}
+    for y in METRICAS_Y:
+        validos = _validos(df, y)
+        valores = np.where(validos, df[y].fillna(0).to_numpy(dtype='float64'), 0)
+        somas[f'{y}_n'] = np.bincount(ids, weights=validos, minlength=n).astype('int64')
+        somas[f'{y}_sy'] = somar(valores)
+        somas[f'{y}_syy'] = somar(valores * valores)
+        for escala, x in escalas.items():
+            x = np.where(validos, x, 0)
+            somas[f'{y}_sx_{escala}'] = somar(x)
+            somas[f'{y}_sxx_{escala}'] = somar(x * x)
+            somas[f'{y}_sxy_{escala}'] = somar(x * valores)
+
+        codigos_y, _ = distributions.bucket_codes(valores, distributions.METRICAS[y][1])
+        pares = pd.DataFrame({'grupo': ids[validos], 'bx': codigos_preco[validos], 'by': codigos_y[validos]})
+        contagens = pares.value_counts(sort=False).rename('n').reset_index()
+        conjunta = grupos.iloc[contagens['grupo']].reset_index(drop=True)
+        conjunta[['bx', 'by', 'n']] = contagens[['bx', 'by', 'n']]
+        conjuntas[y] = conjunta
+    return {'sums': somas, 'joint': conjuntas}
+
+
+def merge_regression_stats(parciais):
+    """
+    Combina estatísticas de partições diferentes (somas de somas).
+
+    Parameters
+    ----------
+    parciais : list of dict
+        Resultados de `build_regression_stats`.
+
+    Returns
+    -------
+    dict
+        Estatísticas combinadas, no formato de `build_regression_stats`.
+    """
+    somas = pd.concat([parcial['sums'] for parcial in parciais])
+    somas = somas.groupby(CHAVE_GRUPOS, sort=True).sum().reset_index()
+    conjuntas = {}
+    for y in METRICAS_Y:
+        todas = pd.concat([parcial['joint'][y] for parcial in parciais])
+        conjuntas[y] = todas.groupby(CHAVE_GRUPOS + ['bx', 'by'], sort=True)['n'].sum().reset_index()
+    return {'sums': somas, 'joint': conjuntas}
+
+
+def update_regression_stats(estatisticas, novos):
+    """
+    Acrescenta restaurantes novos às estatísticas sem reprocessar os antigos.
+
+    Parameters
+    ----------
+    estatisticas : dict
+        Resultado de `build_regression_stats` (ou de uma atualização anterior).
+    novos : pandas.DataFrame
+        Dados tratados só com restaurantes que ainda não foram contados.
+
+    Returns
+    -------
+    dict
+        Estatísticas combinadas.
+    """
+    return merge_regression_stats([estatisticas, build_regression_stats(novos)])
+
+
+def _spearman(conjunta, chave):
+    """Pearson dos postos médios, a partir das contagens conjuntas de cada grupo."""
+    conjunta = conjunta.copy()
+    for bucket, posto in (('bx', 'rx'), ('by', 'ry')):
+        marginal = conjunta.groupby(chave + [bucket], sort=True)['n'].sum()
+        acumulado = marginal.groupby(level=chave, sort=False).cumsum()
+        # Os c empates de um bucket ocupam os postos acumulado - c + 1 ... acumulado
+        postos = (acumulado - (marginal - 1) / 2).rename(posto)
+        conjunta = conjunta.join(postos, on=chave + [bucket])
+
+    n, rx, ry = conjunta['n'], conjunta['rx'], conjunta['ry']
+    somas = pd.DataFrame({
+        'n': n, 'sx': n * rx, 'sy': n * ry, 'sxx': n * rx * rx, 'syy': n * ry * ry, 'sxy': n * rx * ry,
+    }).groupby([conjunta[coluna] for coluna in chave], sort=False).sum()
+    return _fit(somas)['pearson']
+
+
+def _fit(somas):
+    """Inclinação, intercepto, R² e Pearson a partir das colunas n, sx, sy, sxx, syy e sxy."""
+    n = somas['n'].astype('float64')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        covariancia = somas['sxy'] - somas['sx'] * somas['sy'] / n
+        variancia_x = somas['sxx'] - somas['sx'] ** 2 / n
+        variancia_y = somas['syy'] - somas['sy'] ** 2 / n
+        inclinacao = covariancia / variancia_x
+        pearson = covariancia / np.sqrt(variancia_x * variancia_y)
+        resultado = pd.DataFrame({
+            'slope': inclinacao,
+            'intercept': (somas['sy'] - inclinacao * somas['sx']) / n,
+            'pearson': pearson.clip(-1, 1),
+        }, index=somas.index)
+    # Grupos com um só preço (ou um só valor de y) não têm reta/correlação
+    resultado = resultado.replace([np.inf, -np.inf], np.nan)
+    resultado['r2'] = resultado['pearson'] ** 2
+    return resultado
+
+
+def regression_table(estatisticas, nivel, y, escala='log', countries=None, min_restaurants=2):
+    """
+    Regressão de y contra o preço para dois e correlações, por nível.
+
+    Parameters
+    ----------
+    estatisticas : dict
+        Resultado de `build_regression_stats`.
+    nivel : str
+        'country' ou 'city' (ver `NIVEIS`).
+    y : str
+        Coluna de `METRICAS_Y`.
+    escala : str, optional
+        Escala do preço, de `ESCALAS_X`.
+    countries : list of str, optional
+        Países considerados (None ou vazia = todos).
+    min_restaurants : int, optional
+        Descarta grupos com menos restaurantes válidos.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por grupo do nível, com 'restaurants', 'slope',
+        'intercept', 'r2', 'pearson' e 'spearman' (NaN quando o grupo não
+        tem variação).
+    """
+    chave = NIVEIS[nivel]
+    somas = estatisticas['sums']
+    conjunta = estatisticas['joint'][y]
+    if countries:
+        somas = somas[somas['country'].isin(countries)]
+        conjunta = conjunta[conjunta['country'].isin(countries)]
+
+    colunas = {f'{y}_n': 'n', f'{y}_sy': 'sy', f'{y}_syy': 'syy',
+               f'{y}_sx_{escala}': 'sx', f'{y}_sxx_{escala}': 'sxx', f'{y}_sxy_{escala}': 'sxy'}
+    somas = somas.groupby(chave, sort=True)[list(colunas)].sum().rename(columns=colunas)
+    somas = somas[(somas['n'] >= min_restaurants)]
+
+    resultado = _fit(somas)
+    resultado.insert(0, 'restaurants', somas['n'])
+    resultado['spearman'] = _spearman(conjunta, chave).reindex(resultado.index).clip(-1, 1)
+    return resultado[['restaurants', 'slope', 'intercept', 'r2', 'pearson', 'spearman']]
@@ -0,0 +1,139 @@
+"""
+Tabelas hierárquicas país -> cidade -> localidade.
+
+As tabelas são montadas uma única vez na carga, com índices ordenados, de
+modo que cada passo do drill-down da página de localidades é apenas um
+fatiamento do índice (`tabela.loc[pais]`, `tabela.loc[(pais, cidade)]`), sem
+novos groupbys sobre o DataFrame completo.
+
+Para manter os gráficos com tamanho limitado, em cada cidade só as
+`MAX_LOCALITIES` localidades com mais restaurantes (e com pelo menos
+`MIN_RESTAURANTS`) aparecem pelo nome; as demais são somadas em "Outras".
+O mesmo vale para as culinárias de cada localidade (`MAX_CUISINES`).
+
+Restaurantes sem cidade ficam em `SEM_CIDADE` e os groupbys mantêm chaves
+nulas (`dropna=False`), para que a soma das cidades de cada país feche com
+o total do país.
+"""
+import numpy as np
+import pandas as pd
+
+# Limites padrão para colapsar localidades e culinárias pequenas
+MAX_LOCALITIES = 15
+MIN_RESTAURANTS = 3
+MAX_CUISINES = 6
+
+OUTRAS = 'Outras'
+SEM_CIDADE = 'Sem cidade'
+
+# Métricas com média; cada uma tem a soma e a contagem dos valores não nulos
+METRICAS = ['rating', 'cost', 'votes']
+
+# Colunas somadas em todos os níveis; as médias vêm de soma / contagem
+SOMAS = ['restaurants'] + [f'{metrica}_{parte}' for metrica in METRICAS for parte in ('sum', 'count')]
+
+
+def _com_medias(tabela):
+    """
+    Acrescenta as médias de nota, custo e votos a uma tabela de somas.
+
+    Cada média divide pela contagem de valores não nulos da métrica (como o
+    `mean` do pandas), não pelo número de restaurantes.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for metrica in METRICAS:
+            tabela[f'{metrica}_mean'] = tabela[f'{metrica}_sum'] / tabela[f'{metrica}_count']
+    return tabela
+
+
+def _colapsar(contagens, chave, rotulo, max_itens, min_restaurantes):
+    """
+    Troca por `OUTRAS` os itens de `rotulo` fora do top `max_itens` de cada `chave`.
+
+    Parameters
+    ----------
+    contagens : pandas.Series
+        Número de restaurantes indexado por `chave + [rotulo]`.
+    chave : list of str
+        Níveis do grupo pai (por exemplo ['country', 'city']).
+    rotulo : str
+        Nível a ser colapsado (por exemplo 'locality').
+    max_itens : int
+        Quantidade máxima de itens nomeados por grupo pai.
+    min_restaurantes : int
+        Itens com menos restaurantes vão sempre para `OUTRAS`.
+
+    Returns
+    -------
+    pandas.Series
+        Mapeamento de cada item original para o nome final, com o mesmo
+        índice de `contagens`.
+    """
+    ordem = contagens.sort_values(ascending=False, kind='stable')
+    posicao = ordem.groupby(level=chave, sort=False, dropna=False).cumcount()
+    manter = (posicao < max_itens) & (ordem >= min_restaurantes)
+    nomes = ordem.index.get_level_values(rotulo).to_series(index=ordem.index)
+    return nomes.where(manter, OUTRAS).reindex(contagens.index)
+
+
+def build_locality_rollup(df, max_localities=MAX_LOCALITIES, min_restaurants=MIN_RESTAURANTS,
+                          max_cuisines=MAX_CUISINES):
+    """
+    Monta as tabelas de drill-down país -> cidade -> localidade.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados tratados por `zomato.pipeline.clean_data`.
+    max_localities : int, optional
+        Localidades nomeadas por cidade; as demais viram "Outras".
+    min_restaurants : int, optional
+        Localidades com menos restaurantes viram "Outras".
+    max_cuisines : int, optional
+        Culinárias nomeadas por localidade; as demais viram "Outras".
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        - 'country': indexado por país
+        - 'city': indexado por (país, cidade)
+        - 'locality': indexado por (país, cidade, localidade)
+        - 'cuisine': indexado por (país, cidade, localidade, culinária),
+          com a coluna `restaurants`
+        Todos com índice ordenado e, exceto 'cuisine', com as colunas de
+        `SOMAS` (soma e contagem de não nulos de cada métrica) e as médias
+        `rating_mean`, `cost_mean` e `votes_mean`.
+    """
+    base = pd.DataFrame({
+        'country': df['country'],
+        'city': df['city'].fillna(SEM_CIDADE),
+        'locality': df['locality'].fillna(OUTRAS),
+        'cuisine': df['cuisines'],
+        'restaurants': 1,
+    })
+    for metrica, coluna in [('rating', 'aggregate_rating'), ('cost', 'average_cost_for_two'), ('votes', 'votes')]:
+        base[f'{metrica}_sum'] = df[coluna]
+        base[f'{metrica}_count'] = df[coluna].notna().astype('int64')
+
+    # Colapsa as localidades pequenas antes de somar, para que "Outras"
+    # tenha as métricas corretas e a tabela fique limitada por cidade
+    chave_localidade = ['country', 'city', 'locality']
+    por_localidade = base.groupby(chave_localidade, sort=False, dropna=False)['restaurants'].sum()
+    nomes = _colapsar(por_localidade, ['country', 'city'], 'locality', max_localities, min_restaurants)
+    base['locality'] = pd.MultiIndex.from_frame(base[chave_localidade]).map(nomes)
+
+    tabelas = {}
+    for nivel, chave in [('country', ['country']), ('city', ['country', 'city']),
+                         ('locality', chave_localidade)]:
+        tabelas[nivel] = _com_medias(base.groupby(chave, sort=True, dropna=False)[SOMAS].sum())
+
+    chave_culinaria = chave_localidade + ['cuisine']
+    por_culinaria = base.groupby(chave_culinaria, sort=False, dropna=False)['restaurants'].sum()
+    culinarias = _colapsar(por_culinaria, chave_localidade, 'cuisine', max_cuisines, 1)
+    por_culinaria = por_culinaria.groupby(
+        [por_culinaria.index.get_level_values(n) for n in chave_localidade] + [culinarias.to_numpy()],
+        dropna=False
+    ).sum()
+    por_culinaria.index.names = chave_culinaria
+    tabelas['cuisine'] = por_culinaria.sort_index().to_frame('restaurants')
+    return tabelas
@@ -0,0 +1,136 @@
+"""
+Taxas de entrega online e reserva de mesa por país, cidade e culinária.
+
+As três colunas de serviço (`SERVICOS`) são lidas uma única vez como uint8 e
+somadas por grupo (país, cidade, culinária) com `np.bincount`. A tabela
+guarda só numeradores e denominadores inteiros:
+- quantidade de restaurantes e de restaurantes com cada serviço
+- soma das notas (em décimos) e quantidade de restaurantes avaliados, no
+  total e entre os que têm cada serviço
+- soma e quantidade dos preços para dois, idem
+
+As taxas e as médias com e sem o serviço ("sem" = total - "com") de
+qualquer recorte saem da soma das linhas dos grupos selecionados, então
+cada visão custa O(grupos), sem voltar ao DataFrame.
+"""
+import numpy as np
+import pandas as pd
+
+# Colunas de serviço: coluna -> nome exibido
+SERVICOS = {
+    'has_online_delivery': 'Entrega Online',
+    'has_table_booking': 'Reserva de Mesa',
+    'is_delivering_now': 'Entregando Agora',
+}
+
+# Chave de cada grupo da tabela
+CHAVE_GRUPOS = ['country', 'city', 'cuisines']
+
+# Níveis de consulta: nome -> colunas do agrupamento
+NIVEIS = {
+    'country': ['country'],
+    'city': ['country', 'city'],
+    'cuisines': ['cuisines'],
+}
+
+
+def build_rate_tables(df):
+    """
+    Monta os numeradores e denominadores por (país, cidade, culinária).
+
+    Notas iguais a zero (restaurantes sem avaliação) e preços iguais a zero
+    (não informados) ficam fora das médias.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por grupo, com `CHAVE_GRUPOS` e as somas inteiras
+        'restaurants', 'rated', 'rating_sum', 'costed', 'cost_sum' e, para
+        cada serviço `s`, `s`, 'rated_<s>', 'rating_sum_<s>', 'costed_<s>' e
+        'cost_sum_<s>'.
+    """
+    grupos = df[CHAVE_GRUPOS].drop_duplicates().sort_values(CHAVE_GRUPOS, ignore_index=True)
+    ids = pd.MultiIndex.from_frame(grupos).get_indexer(pd.MultiIndex.from_frame(df[CHAVE_GRUPOS]))
+    n = len(grupos)
+
+    def somar(pesos=None):
+        return np.rint(np.bincount(ids, weights=pesos, minlength=n)).astype('int64')
+
+    notas = np.rint(df['aggregate_rating'].fillna(0).to_numpy() * 10).astype('int64')
+    avaliados = (notas > 0).astype('uint8')
+    precos = np.rint(df['average_cost_for_two'].fillna(0).to_numpy()).astype('int64')
+    com_preco = (precos > 0).astype('uint8')
+
+    tabela = grupos.copy()
+    tabela['restaurants'] = np.bincount(ids, minlength=n)
+    tabela['rated'] = somar(avaliados)
+    tabela['rating_sum'] = somar(notas)
+    tabela['costed'] = somar(com_preco)
+    tabela['cost_sum'] = somar(precos)
+
+    servicos = df[list(SERVICOS)].to_numpy(dtype='uint8')
+    for coluna, servico in zip(SERVICOS, servicos.T):
+        tabela[coluna] = somar(servico)
+        tabela[f'rated_{coluna}'] = somar(servico & avaliados)
+        tabela[f'rating_sum_{coluna}'] = somar(servico * notas)
+        tabela[f'costed_{coluna}'] = somar(servico & com_preco)
+        tabela[f'cost_sum_{coluna}'] = somar(servico * precos)
+    return tabela
+
+
+def service_rates(tabela, nivel, servico, countries=None, min_restaurants=1):
+    """
+    Taxa de adoção e médias com/sem um serviço, por nível.
+
+    Parameters
+    ----------
+    tabela : pandas.DataFrame
+        Resultado de `build_rate_tables`.
+    nivel : str
+        'country', 'city' ou 'cuisines' (ver `NIVEIS`), ou None para o total.
+    servico : str
+        Coluna de `SERVICOS`.
+    countries : list of str, optional
+        Países considerados (None ou vazia = todos).
+    min_restaurants : int, optional
+        Descarta grupos com menos restaurantes.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por grupo do nível (uma linha só quando `nivel` é None),
+        com 'restaurants', 'with_service', 'rate', 'rating_with',
+        'rating_without', 'rating_delta', 'cost_with', 'cost_without' e
+        'cost_delta'. Médias sem restaurantes ficam NaN.
+    """
+    if countries:
+        tabela = tabela[tabela['country'].isin(countries)]
+    colunas = ['restaurants', 'rated', 'rating_sum', 'costed', 'cost_sum',
+               servico, f'rated_{servico}', f'rating_sum_{servico}', f'costed_{servico}', f'cost_sum_{servico}']
+    if nivel is None:
+        somas = tabela[colunas].sum().to_frame().T
+    else:
+        somas = tabela.groupby(NIVEIS[nivel], sort=False)[colunas].sum()
+    somas = somas[somas['restaurants'] >= min_restaurants]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        resultado = pd.DataFrame({
+            'restaurants': somas['restaurants'],
+            'with_service': somas[servico],
+            'rate': somas[servico] / somas['restaurants'],
+            'rating_with': somas[f'rating_sum_{servico}'] / somas[f'rated_{servico}'] / 10,
+            'rating_without': (somas['rating_sum'] - somas[f'rating_sum_{servico}'])
+                              / (somas['rated'] - somas[f'rated_{servico}']) / 10,
+            'cost_with': somas[f'cost_sum_{servico}'] / somas[f'costed_{servico}'],
+            'cost_without': (somas['cost_sum'] - somas[f'cost_sum_{servico}'])
+                            / (somas['costed'] - somas[f'costed_{servico}']),
+        }, index=somas.index)
+    resultado = resultado.replace([np.inf, -np.inf], np.nan)
+    resultado['rating_delta'] = resultado['rating_with'] - resultado['rating_without']
+    resultado['cost_delta'] = resultado['cost_with'] - resultado['cost_without']
+    return resultado
@@ -0,0 +1,273 @@
+"""
+Restaurantes semelhantes por culinárias, faixa de preço, nota, custo e local.
+
+Cada restaurante vira um vetor de atributos:
+- culinárias: vetor esparso (todas as culinárias de `all_cuisines`), com
+  norma 1, guardado como pares (linha, código) e só expandido por cidade
+- faixa de preço: one-hot de `price_range`
+- nota e custo: nota / 5 e percentil do custo dentro do país (as moedas
+  não são comparáveis entre países)
+- local: coordenadas em km em torno do centro da cidade, divididas por
+  `DISTANCIA_KM`
+
+A distância entre dois restaurantes é a distância euclidiana ao quadrado
+entre os vetores, com os pesos de `PESOS`. A busca fica restrita à mesma
+cidade ("perto") e é feita em blocos de linhas: cada bloco é uma única
+multiplicação de matriz contra a cidade inteira, seguida de
+`np.argpartition` para os `TOP_K` mais próximos. O resultado (posições e
+distâncias dos vizinhos de cada restaurante) é calculado uma única vez.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Vizinhos guardados por restaurante
+TOP_K = 10
+
+# Tamanho máximo (linhas x colunas) da matriz de distâncias de um bloco
+BLOCK_ELEMENTS = 4_000_000
+
+# Peso de cada grupo de atributos na distância
+PESOS = {
+    'cuisines': 1.0,
+    'price': 0.5,
+    'rating': 0.5,
+    'cost': 0.5,
+    'location': 1.0,
+}
+
+# Distância (km) que pesa o mesmo que `PESOS['location']`
+DISTANCIA_KM = 3.0
+
+# Quilômetros por grau de latitude
+KM_POR_GRAU = 111.32
+
+# Valor de `all_cuisines` sem culinária informada
+SEM_CULINARIA = 'Not Informed'
+
+
+def cuisine_vectors(df):
+    """
+    Vetores esparsos de culinárias, no formato de coordenadas.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado (com `all_cuisines`).
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray, pandas.Index)
+        A posição da linha e o código da culinária de cada entrada (em ordem
+        de linha) e o nome de cada código.
+    """
+    listas = df['all_cuisines'].str.split(', ')
+    tamanhos = listas.str.len().to_numpy()
+    entradas = listas.explode().to_numpy()
+    linhas = np.repeat(np.arange(len(df)), tamanhos)
+    validas = entradas != SEM_CULINARIA
+    codigos, nomes = pd.factorize(entradas[validas])
+    return linhas[validas], codigos, pd.Index(nomes)
+
+
+def _cost_percentile(df):
+    """Percentil (0 a 1) do custo para dois dentro de cada país."""
+    return df.groupby('country')['average_cost_for_two'].rank(pct=True).fillna(0).to_numpy()
+
+
+def city_features(linhas_cidade, entradas, atributos, pesos=None):
+    """
+    Matriz densa de atributos dos restaurantes de uma cidade.
+
+    Parameters
+    ----------
+    linhas_cidade : numpy.ndarray
+        Posições dos restaurantes da cidade.
+    entradas : tuple of (numpy.ndarray, numpy.ndarray)
+        Posição local (0 a m-1) e código da culinária das entradas da cidade.
+    atributos : dict of numpy.ndarray
+        'price_range' (0 = sem faixa), 'rating', 'cost', 'latitude' e
+        'longitude' de todo o dataset.
+    pesos : dict, optional
+        Pesos dos grupos de atributos. Usa `PESOS` quando omitido.
+
+    Returns
+    -------
+    numpy.ndarray
+        Matriz (m x atributos) em float32.
+    """
+    pesos = pesos or PESOS
+    m = len(linhas_cidade)
+    locais, codigos = entradas
+    vocabulario, colunas = np.unique(codigos, return_inverse=True)
+
+    # Culinárias: só as que aparecem na cidade, cada linha com norma 1
+    culinarias = np.zeros((m, len(vocabulario)), dtype='float32')
+    culinarias[locais, colunas] = 1.0
+    normas = np.sqrt(culinarias.sum(axis=1, keepdims=True))
+    culinarias /= np.maximum(normas, 1.0)
+
+    # Faixa de preço: faixas diferentes ficam a distância² = peso; sem faixa (0), linha zerada
+    preco = np.zeros((m, 4), dtype='float32')
+    faixas = np.minimum(atributos['price_range'][linhas_cidade], 4)
+    com_faixa = faixas > 0
+    preco[np.flatnonzero(com_faixa), faixas[com_faixa] - 1] = math.sqrt(0.5)
+
+    latitude = atributos['latitude'][linhas_cidade]
+    longitude = atributos['longitude'][linhas_cidade]
+    lat_centro, lon_centro = np.median(latitude), np.median(longitude)
+    y = (latitude - lat_centro) * KM_POR_GRAU
+    x = (longitude - lon_centro) * KM_POR_GRAU * math.cos(math.radians(lat_centro))
+
+    return np.hstack([
+        math.sqrt(pesos['cuisines']) * culinarias,
+        math.sqrt(pesos['price']) * preco,
+        math.sqrt(pesos['rating']) * (atributos['rating'][linhas_cidade] / 5)[:, None],
+        math.sqrt(pesos['cost']) * atributos['cost'][linhas_cidade][:, None],
+        math.sqrt(pesos['location']) * np.column_stack([x, y]) / DISTANCIA_KM,
+    ]).astype('float32')
+
+
+def nearest_neighbors(matriz, k=TOP_K, block_elements=BLOCK_ELEMENTS):
+    """
+    Os `k` vizinhos mais próximos de cada linha (excluindo a própria linha).
+
+    Parameters
+    ----------
+    matriz : numpy.ndarray
+        Atributos (m x d).
+    k : int, optional
+        Quantidade de vizinhos.
+    block_elements : int, optional
+        Tamanho máximo da matriz de distâncias de cada bloco.
+
+    Returns
+    -------
+    tuple of (numpy.ndarray, numpy.ndarray)
+        Posições locais (m x k, int32, -1 quando a cidade tem menos de k+1
+        restaurantes) e distâncias ao quadrado (m x k, float32, inf idem),
+        do mais próximo para o mais distante.
+    """
+    m = len(matriz)
+    vizinhos = np.full((m, k), -1, dtype='int32')
+    distancias = np.full((m, k), np.inf, dtype='float32')
+    k_cidade = min(k, m - 1)
+    if k_cidade <= 0:
+        return vizinhos, distancias
+
+    quadrados = np.einsum('ij,ij->i', matriz, matriz)
+    bloco = max(1, block_elements // m)
+    for inicio in range(0, m, bloco):
+        fim = min(inicio + bloco, m)
+        # |a - b|² = |a|² + |b|² - 2 a.b, com o produto em uma multiplicação de matriz
+        d2 = quadrados[inicio:fim, None] + quadrados[None, :] - 2 * (matriz[inicio:fim] @ matriz.T)
+        np.maximum(d2, 0, out=d2)
+        d2[np.arange(fim - inicio), np.arange(inicio, fim)] = np.inf
+        candidatos = np.argpartition(d2, k_cidade - 1, axis=1)[:, :k_cidade]
+        d2_candidatos = np.take_along_axis(d2, candidatos, axis=1)
+        ordem = np.argsort(d2_candidatos, axis=1, kind='stable')
+        vizinhos[inicio:fim, :k_cidade] = np.take_along_axis(candidatos, ordem, axis=1)
+        distancias[inicio:fim, :k_cidade] = np.take_along_axis(d2_candidatos, ordem, axis=1)
+    return vizinhos, distancias
+
+
+def build_similarity_index(df, k=TOP_K, block_elements=BLOCK_ELEMENTS, pesos=None):
+    """
+    Pré-calcula os `k` restaurantes mais semelhantes de cada restaurante.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    k : int, optional
+        Vizinhos por restaurante.
+    block_elements : int, optional
+        Tamanho máximo da matriz de distâncias de cada bloco.
+    pesos : dict, optional
+        Pesos dos grupos de atributos. Usa `PESOS` quando omitido.
+
+    Returns
+    -------
+    dict
+        'neighbors': posições dos vizinhos no DataFrame (n x k, -1 = sem
+        vizinho); 'distances': distância ao quadrado de cada um (n x k);
+        'cuisines': nome de cada código de culinária.
+    """
+    n = len(df)
+    linhas, codigos, nomes = cuisine_vectors(df)
+    atributos = {
+        'price_range': df['price_range'].fillna(0).to_numpy(dtype='int64'),
+        'rating': df['aggregate_rating'].fillna(0).to_numpy(dtype='float64'),
+        'cost': _cost_percentile(df),
+        'latitude': df['latitude'].to_numpy(dtype='float64'),
+        'longitude': df['longitude'].to_numpy(dtype='float64'),
+    }
+
+    # Cidades (país + cidade) e as entradas de culinária de cada uma, em ordem
+    # Restaurantes sem cidade formam uma cidade à parte em cada país
+    cidade = df.groupby(['country', 'city'], sort=False, dropna=False).ngroup().to_numpy()
+    ordem = np.argsort(cidade, kind='stable')
+    limites = np.flatnonzero(np.diff(cidade[ordem])) + 1
+    ordem_entradas = np.argsort(cidade[linhas], kind='stable')
+    limites_entradas = np.searchsorted(cidade[linhas][ordem_entradas], cidade[ordem][np.r_[0, limites]])
+    local = np.empty(n, dtype='int64')
+
+    vizinhos = np.full((n, k), -1, dtype='int32')
+    distancias = np.full((n, k), np.inf, dtype='float32')
+    inicios = np.r_[0, limites]
+    fins = np.r_[limites, n]
+    fins_entradas = np.r_[limites_entradas[1:], len(linhas)]
+    for inicio, fim, inicio_entradas, fim_entradas in zip(inicios, fins, limites_entradas, fins_entradas):
+        linhas_cidade = ordem[inicio:fim]
+        local[linhas_cidade] = np.arange(fim - inicio)
+        entradas = ordem_entradas[inicio_entradas:fim_entradas]
+        matriz = city_features(linhas_cidade, (local[linhas[entradas]], codigos[entradas]), atributos, pesos)
+        vizinhos_locais, distancias_cidade = nearest_neighbors(matriz, k, block_elements)
+        vizinhos[linhas_cidade] = np.where(vizinhos_locais >= 0, linhas_cidade[vizinhos_locais], -1)
+        distancias[linhas_cidade] = distancias_cidade
+    return {'neighbors': vizinhos, 'distances': distancias, 'cuisines': nomes}
+
+
+def similar_restaurants(df, indice, posicao, columns):
+    """
+    Tabela dos restaurantes mais semelhantes a um restaurante.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    indice : dict
+        Resultado de `build_similarity_index`.
+    posicao : int
+        Posição do restaurante no DataFrame.
+    columns : list of str
+        Colunas exibidas.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por vizinho (do mais semelhante ao menos), com as colunas
+        pedidas e 'similarity' (1 / (1 + distância²)), 'distance_km' e
+        'shared_cuisines' (culinárias em comum).
+    """
+    vizinhos = indice['neighbors'][posicao]
+    validos = vizinhos >= 0
+    vizinhos = vizinhos[validos]
+    tabela = df.iloc[vizinhos, [df.columns.get_loc(coluna) for coluna in columns]].reset_index(drop=True)
+
+    tabela['similarity'] = 1 / (1 + indice['distances'][posicao][validos].astype('float64'))
+    # Distância pela fórmula de haversine, só para os k vizinhos
+    latitude = np.radians(df['latitude'].to_numpy()[np.r_[posicao, vizinhos]])
+    longitude = np.radians(df['longitude'].to_numpy()[np.r_[posicao, vizinhos]])
+    seno = (np.sin((latitude[1:] - latitude[0]) / 2) ** 2
+            + np.cos(latitude[0]) * np.cos(latitude[1:]) * np.sin((longitude[1:] - longitude[0]) / 2) ** 2)
+    tabela['distance_km'] = 2 * 6371.0088 * np.arcsin(np.sqrt(seno))
+
+    culinarias = set(df['all_cuisines'].iat[posicao].split(', ')) - {SEM_CULINARIA}
+    tabela['shared_cuisines'] = [
+        ', '.join(c for c in lista.split(', ') if c in culinarias)
+        for lista in df['all_cuisines'].to_numpy()[vizinhos]
+    ]
+    return tabela
+
@@ -0,0 +1,202 @@
+"""
+Esboços de contagem distinta (HyperLogLog) combináveis.
+
+Cada esboço guarda os hashes de 64 bits dos valores vistos:
+- enquanto houver até `EXACT_LIMIT` valores distintos, os próprios hashes
+  ficam guardados (modo exato: a contagem só erra em colisões de hash de
+  64 bits, desprezíveis nesse tamanho)
+- acima disso, os hashes viram 2**precision registradores HyperLogLog, com
+  erro padrão de 1.04 / sqrt(2**precision) (cerca de 1.6% com a precisão
+  padrão 12; o erro fica abaixo de 3 erros padrão em 99.7% dos casos)
+
+Esboços com a mesma precisão podem ser combinados (`merge`) em qualquer
+ordem, com o mesmo resultado de um esboço montado com todos os valores.
+Assim os esboços de partições, países ou cidades são somados sem voltar
+aos dados, e uma atualização só precisa adicionar (`add`) os valores novos.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+# Bits usados para escolher o registrador (2**PRECISION registradores)
+PRECISION = 12
+
+# Quantidade máxima de hashes guardados no modo exato
+EXACT_LIMIT = 4096
+
+
+def hash_values(valores):
+    """
+    Calcula o hash de 64 bits de cada valor.
+
+    Parameters
+    ----------
+    valores : array-like
+        Valores (texto ou números).
+
+    Returns
+    -------
+    numpy.ndarray
+        Hashes uint64, na ordem de `valores`.
+    """
+    valores = np.asarray(valores)
+    if valores.dtype.kind not in 'iufb':
+        valores = valores.astype(object)
+    return pd.util.hash_array(valores)
+
+
+def _posicoes(hashes, precision):
+    """Registrador (bits altos) e posição do primeiro bit 1 do restante."""
+    indices = (hashes >> np.uint64(64 - precision)).astype('int64')
+    restante = hashes << np.uint64(precision)
+    # Zeros à esquerda calculados em duas metades de 32 bits (exatas em float64)
+    _, bits_alto = np.frexp((restante >> np.uint64(32)).astype('float64'))
+    _, bits_baixo = np.frexp((restante & np.uint64(0xFFFFFFFF)).astype('float64'))
+    zeros = np.where(bits_alto > 0, 32 - bits_alto, 64 - bits_baixo)
+    return indices, np.minimum(zeros + 1, 64 - precision + 1).astype('uint8')
+
+
+class DistinctSketch:
+    """
+    Esboço de contagem distinta: exato para poucos valores, HyperLogLog acima.
+
+    Parameters
+    ----------
+    precision : int, optional
+        Bits do índice dos registradores. Usa `PRECISION` quando omitido.
+    """
+
+    def __init__(self, precision=PRECISION):
+        self.precision = precision
+        self.hashes = np.empty(0, dtype='uint64')
+        self.registers = None
+
+    @classmethod
+    def from_values(cls, valores, precision=PRECISION):
+        """Monta um esboço com os valores de `valores`."""
+        return cls(precision).add(valores)
+
+    @property
+    def is_exact(self):
+        """True enquanto o esboço guarda os hashes (modo exato)."""
+        return self.registers is None
+
+    def add(self, valores):
+        """Adiciona valores ao esboço (no lugar) e retorna o próprio esboço; nulos são ignorados."""
+        valores = np.asarray(valores)
+        return self.add_hashes(hash_values(valores[pd.notna(valores)]))
+
+    def add_hashes(self, hashes):
+        """Adiciona hashes de `hash_values` ao esboço e retorna o próprio esboço."""
+        hashes = np.asarray(hashes, dtype='uint64')
+        if self.registers is None:
+            self.hashes = np.union1d(self.hashes, hashes)
+            if len(self.hashes) > EXACT_LIMIT:
+                self.registers = np.zeros(2 ** self.precision, dtype='uint8')
+                hashes, self.hashes = self.hashes, np.empty(0, dtype='uint64')
+            else:
+                return self
+        indices, posicoes = _posicoes(hashes, self.precision)
+        np.maximum.at(self.registers, indices, posicoes)
+        return self
+
+    def merge(self, outro):
+        """
+        Combina dois esboços sem alterar nenhum deles.
+
+        Raises
+        ------
+        ValueError
+            Se as precisões forem diferentes.
+        """
+        if outro.precision != self.precision:
+            raise ValueError(f'precisões diferentes: {self.precision} e {outro.precision}')
+        resultado = DistinctSketch(self.precision)
+        if self.registers is None and outro.registers is None:
+            return resultado.add_hashes(np.union1d(self.hashes, outro.hashes))
+        resultado.registers = np.zeros(2 ** self.precision, dtype='uint8')
+        for esboco in (self, outro):
+            if esboco.registers is None:
+                resultado.add_hashes(esboco.hashes)
+            else:
+                np.maximum(resultado.registers, esboco.registers, out=resultado.registers)
+        return resultado
+
+    def count(self):
+        """
+        Estima a quantidade de valores distintos.
+
+        Returns
+        -------
+        int
+            Contagem exata no modo exato; estimativa HyperLogLog (com a
+            correção de contagem linear para valores pequenos) acima dele.
+        """
+        if self.registers is None:
+            return len(self.hashes)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimativa = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype('int64')))
+        vazios = int(np.count_nonzero(self.registers == 0))
+        if estimativa <= 2.5 * m and vazios:
+            estimativa = m * math.log(m / vazios)
+        return int(round(estimativa))
+
+    def relative_error(self):
+        """Erro padrão relativo da contagem (0 no modo exato)."""
+        return 0.0 if self.registers is None else 1.04 / math.sqrt(2 ** self.precision)
+
+    def __eq__(self, outro):
+        if not isinstance(outro, DistinctSketch):
+            return NotImplemented
+        if self.precision != outro.precision or self.is_exact != outro.is_exact:
+            return False
+        if self.is_exact:
+            return np.array_equal(self.hashes, outro.hashes)
+        return np.array_equal(self.registers, outro.registers)
+
+    __hash__ = None
+
+    def __repr__(self):
+        modo = 'exato' if self.is_exact else f'HLL p={self.precision}'
+        return f'DistinctSketch({self.count()}, {modo})'
+
+
+def merge_all(esbocos, precision=PRECISION):
+    """Combina uma sequência de esboços (vazia = esboço vazio)."""
+    resultado = DistinctSketch(precision)
+    for esboco in esbocos:
+        resultado = resultado.merge(esboco)
+    return resultado
+
+
+def group_sketches(codigos, valores, n_grupos, precision=PRECISION):
+    """
+    Monta um esboço por grupo de uma só vez.
+
+    Parameters
+    ----------
+    codigos : numpy.ndarray
+        Id do grupo (0 a n_grupos - 1) de cada valor, como `GroupBy.ngroup`.
+    valores : array-like
+        Valores contados. Nulos não são contados, como em `Series.nunique`.
+    n_grupos : int
+        Quantidade de grupos.
+    precision : int, optional
+        Precisão dos esboços.
+
+    Returns
+    -------
+    list of DistinctSketch
+        O esboço de cada grupo, na ordem dos ids.
+    """
+    valores = np.asarray(valores)
+    validos = pd.notna(valores)
+    pares = pd.DataFrame({'grupo': np.asarray(codigos)[validos], 'hash': hash_values(valores[validos])})
+    pares = pares.drop_duplicates().sort_values(['grupo', 'hash'], kind='stable')
+    grupos = pares['grupo'].to_numpy()
+    hashes = pares['hash'].to_numpy()
+    limites = np.searchsorted(grupos, np.arange(n_grupos + 1))
+    return [DistinctSketch(precision).add_hashes(hashes[inicio:fim])
+            for inicio, fim in zip(limites[:-1], limites[1:])]
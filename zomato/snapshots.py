@@ -0,0 +1,337 @@
+"""
+Versões (snapshots) do dataset tratado e das agregações.
+
+Cada carga dos dados pode ser guardada como uma versão em `SNAPSHOTS_PATH`:
+- `versions.json`: índice das versões (id, data, linhas, linhas novas)
+- `manifests/<versão>.parquet`: `restaurant_id`, o hash do conteúdo de cada
+  restaurante na versão e as colunas de `COLUNAS_DERIVADAS`
+- `rows/<versão>.parquet`: só as linhas cujo hash ainda não existia em
+  nenhuma versão anterior (as demais são reaproveitadas)
+
+As colunas de `COLUNAS_DERIVADAS` dependem das outras linhas do dataset
+(marcas e anomalias), então ficam fora do hash e das linhas guardadas: uma
+linha que não mudou continua com o mesmo hash quando outras entram ou saem.
+- `aggregates/<versão>/<nível>.parquet`: os agregados de `zomato.parallel`
+  (somas, médias e contagens distintas, sem os conjuntos)
+
+Cada réplica do dashboard pode guardar uma versão na carga. A leitura do
+índice, a escolha do id e as gravações de `save_snapshot` ficam dentro de
+um lock de arquivo (`versions.lock`, criado com `O_EXCL`), e os arquivos
+temporários levam o pid e a thread no nome: duas réplicas com os mesmos
+dados geram uma única versão, e com dados diferentes geram ids seguidos.
+
+A comparação entre duas versões (`compare`) lê apenas os agregados, que têm
+uma linha por país ou cidade, então não depende do tamanho do dataset nem
+recarrega os CSVs originais.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+from zomato.parallel import NIVEIS
+
+# Pasta das versões; pode ser trocada pela variável ZOMATO_SNAPSHOTS
+SNAPSHOTS_PATH = os.environ.get('ZOMATO_SNAPSHOTS', 'dataset/snapshots')
+
+# Colunas dos agregados guardadas em cada versão (os conjuntos ficam de fora)
+COLUNAS_AGREGADOS = ['restaurants', 'votes_sum', 'votes_count', 'cost_sum', 'cost_count',
+                     'rating_sum', 'rating_count', 'votes_mean', 'cost_mean', 'rating_mean',
+                     'n_cities', 'n_cuisines']
+
+# Colunas calculadas sobre o dataset inteiro, guardadas no manifesto de cada versão
+COLUNAS_DERIVADAS = ['brand_id', 'anomaly_flags']
+
+# Espera máxima pelo lock do índice, em segundos; um lock mais velho que
+# LOCK_STALE_SECONDS foi deixado por um processo que morreu e é removido
+LOCK_TIMEOUT_SECONDS = 120
+LOCK_STALE_SECONDS = 600
+
+# Métricas exibidas na comparação entre versões
+METRICAS = ['restaurants', 'votes_sum', 'rating_mean', 'cost_mean', 'n_cities', 'n_cuisines']
+
+
+def _caminho(root, *partes):
+    return os.path.join(root or SNAPSHOTS_PATH, *partes)
+
+
+def _temporario(caminho):
+    """Nome temporário único por processo e thread para `caminho`."""
+    return f'{caminho}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def _gravar(tabela, caminho):
+    """Grava um Parquet de forma atômica (arquivo temporário + rename)."""
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = _temporario(caminho)
+    tabela.to_parquet(temporario, index=False)
+    os.replace(temporario, caminho)
+
+
+@contextmanager
+def _bloqueio(root=None):
+    """Lock entre processos do índice de versões (arquivo criado com `O_EXCL`)."""
+    caminho = _caminho(root, 'versions.lock')
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    limite = time.monotonic() + LOCK_TIMEOUT_SECONDS
+    while True:
+        try:
+            os.close(os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            try:
+                if time.time() - os.path.getmtime(caminho) > LOCK_STALE_SECONDS:
+                    os.remove(caminho)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() > limite:
+                raise TimeoutError(f'lock das versões ocupado: {caminho}')
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.remove(caminho)
+
+
+def row_hashes(df):
+    """
+    Calcula o hash do conteúdo de cada restaurante, sem `COLUNAS_DERIVADAS`.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado (com `restaurant_id`).
+
+    Returns
+    -------
+    pandas.Series
+        Hash (uint64) de cada linha, no índice de `df`.
+    """
+    return pd.util.hash_pandas_object(df.drop(columns=COLUNAS_DERIVADAS, errors='ignore'), index=False)
+
+
+def list_versions(root=None):
+    """
+    Lista as versões guardadas, da mais antiga para a mais recente.
+
+    Parameters
+    ----------
+    root : str, optional
+        Pasta das versões. Usa `SNAPSHOTS_PATH` quando omitido.
+
+    Returns
+    -------
+    list of dict
+        Um dicionário por versão, com `version`, `created_at`, `label`,
+        `rows`, `new_rows` e `content_hash`.
+    """
+    try:
+        with open(_caminho(root, 'versions.json'), encoding='utf-8') as arquivo:
+            return json.load(arquivo)
+    except FileNotFoundError:
+        return []
+
+
+def save_snapshot(df, agregados, label=None, root=None):
+    """
+    Guarda o dataset tratado e os agregados como uma nova versão.
+
+    Se o conteúdo for igual ao da última versão, nada é gravado e a última
+    versão é retornada. Pode ser chamada ao mesmo tempo por vários processos
+    (réplicas do dashboard) com a mesma pasta.
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dataset tratado.
+    agregados : dict of pandas.DataFrame
+        Agregados finais de `zomato.parallel.clean_and_aggregate`.
+    label : str, optional
+        Descrição da versão (por exemplo o arquivo de origem).
+    root : str, optional
+        Pasta das versões. Usa `SNAPSHOTS_PATH` quando omitido.
+
+    Returns
+    -------
+    dict
+        A entrada da versão em `versions.json`.
+    """
+    hashes = row_hashes(df)
+    manifesto = pd.DataFrame({'restaurant_id': df['restaurant_id'].to_numpy(),
+                              'row_hash': hashes.to_numpy()})
+    derivadas = [coluna for coluna in COLUNAS_DERIVADAS if coluna in df.columns]
+    manifesto[derivadas] = df[derivadas].to_numpy()
+    manifesto = manifesto.sort_values('restaurant_id', kind='stable', ignore_index=True)
+    conteudo = int(pd.util.hash_pandas_object(manifesto, index=False).sum())
+    conteudo = f'{conteudo & 0xFFFFFFFFFFFFFFFF:016x}'
+    with _bloqueio(root):
+        versoes = list_versions(root)
+        if versoes and versoes[-1]['content_hash'] == conteudo:
+            return versoes[-1]
+
+        # Hashes já guardados em versões anteriores não são gravados de novo
+        conhecidos = set()
+        for versao in versoes:
+            anterior = pd.read_parquet(_caminho(root, 'manifests', f"{versao['version']}.parquet"),
+                                       columns=['row_hash'])
+            conhecidos.update(anterior['row_hash'].tolist())
+        novas = ~hashes.isin(conhecidos).to_numpy()
+
+        versao = f'v{len(versoes) + 1:04d}'
+        linhas_novas = df.loc[novas, df.columns.difference(COLUNAS_DERIVADAS, sort=False)]
+        linhas_novas = linhas_novas.assign(row_hash=hashes[novas].to_numpy())
+        _gravar(linhas_novas, _caminho(root, 'rows', f'{versao}.parquet'))
+        _gravar(manifesto, _caminho(root, 'manifests', f'{versao}.parquet'))
+        for nivel, tabela in agregados.items():
+            _gravar(tabela[COLUNAS_AGREGADOS].reset_index(),
+                    _caminho(root, 'aggregates', versao, f'{nivel}.parquet'))
+
+        entrada = {
+            'version': versao,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'label': label,
+            'rows': len(df),
+            'new_rows': int(novas.sum()),
+            'content_hash': conteudo,
+        }
+        indice = _caminho(root, 'versions.json')
+        temporario = _temporario(indice)
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(versoes + [entrada], arquivo, indent=2, ensure_ascii=False)
+        os.replace(temporario, indice)
+        return entrada
+
+
+def load_aggregates(version, root=None):
+    """
+    Lê os agregados guardados em uma versão.
+
+    Parameters
+    ----------
+    version : str
+        Id da versão (por exemplo 'v0001').
+    root : str, optional
+        Pasta das versões. Usa `SNAPSHOTS_PATH` quando omitido.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Um DataFrame por nível de `zomato.parallel.NIVEIS`, com as colunas
+        de `COLUNAS_AGREGADOS`.
+    """
+    agregados = {}
+    for nivel, chave in NIVEIS.items():
+        tabela = pd.read_parquet(_caminho(root, 'aggregates', version, f'{nivel}.parquet'))
+        agregados[nivel] = tabela.set_index(chave or 'total')
+    return agregados
+
+
+def load_snapshot(version, root=None):
+    """
+    Reconstrói o dataset tratado de uma versão.
+
+    Parameters
+    ----------
+    version : str
+        Id da versão.
+    root : str, optional
+        Pasta das versões. Usa `SNAPSHOTS_PATH` quando omitido.
+
+    Returns
+    -------
+    pandas.DataFrame
+        O dataset tratado da versão, ordenado por `restaurant_id`.
+    """
+    manifesto = pd.read_parquet(_caminho(root, 'manifests', f'{version}.parquet'))
+    blocos = []
+    for versao in list_versions(root):
+        bloco = pd.read_parquet(_caminho(root, 'rows', f"{versao['version']}.parquet"))
+        blocos.append(bloco[bloco['row_hash'].isin(manifesto['row_hash'])])
+        if versao['version'] == version:
+            break
+    linhas = pd.concat(blocos).drop_duplicates('row_hash')
+    linhas = linhas.set_index('row_hash').loc[manifesto['row_hash']].reset_index(drop=True)
+    # As colunas derivadas da versão vêm do manifesto (versões antigas as guardavam nas linhas)
+    derivadas = [coluna for coluna in COLUNAS_DERIVADAS if coluna in manifesto.columns]
+    return linhas.drop(columns=derivadas, errors='ignore').assign(**{
+        coluna: manifesto[coluna].to_numpy() for coluna in derivadas})
+
+
+def compare(antes, depois, nivel='country', root=None):
+    """
+    Compara as métricas de duas versões usando apenas os agregados.
+
+    Parameters
+    ----------
+    antes, depois : str or dict of pandas.DataFrame
+        Ids das versões (ou agregados já lidos por `load_aggregates`).
+    nivel : str, optional
+        'total', 'country' ou 'city'.
+    root : str, optional
+        Pasta das versões. Usa `SNAPSHOTS_PATH` quando omitido.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Para cada métrica de `METRICAS`, as colunas `<métrica>_antes`,
+        `<métrica>_depois` e `<métrica>_delta`. Países ou cidades presentes
+        em só uma das versões ficam com 0 restaurantes na outra.
+    """
+    if isinstance(antes, str):
+        antes = load_aggregates(antes, root)
+    if isinstance(depois, str):
+        depois = load_aggregates(depois, root)
+    tabela_antes = antes[nivel][METRICAS]
+    tabela_depois = depois[nivel][METRICAS]
+    indice = tabela_antes.index.union(tabela_depois.index)
+    tabela_antes = tabela_antes.reindex(indice)
+    tabela_depois = tabela_depois.reindex(indice)
+
+    resultado = pd.DataFrame(index=indice)
+    for metrica in METRICAS:
+        valor_antes = tabela_antes[metrica]
+        valor_depois = tabela_depois[metrica]
+        if metrica not in ('rating_mean', 'cost_mean'):
+            valor_antes = valor_antes.fillna(0)
+            valor_depois = valor_depois.fillna(0)
+        resultado[f'{metrica}_antes'] = valor_antes
+        resultado[f'{metrica}_depois'] = valor_depois
+        resultado[f'{metrica}_delta'] = valor_depois - valor_antes
+    return resultado
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Versões do dataset tratado.')
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('list', help='lista as versões guardadas')
+    salvar = sub.add_parser('save', help='trata um CSV e guarda como nova versão')
+    salvar.add_argument('csv', nargs='?', default=None, help='CSV bruto (padrão: ZOMATO_DATASET)')
+    salvar.add_argument('--label', default=None, help='descrição da versão')
+    comparar = sub.add_parser('compare', help='compara duas versões')
+    comparar.add_argument('antes')
+    comparar.add_argument('depois')
+    comparar.add_argument('--level', default='country', choices=list(NIVEIS))
+    args = parser.parse_args()
+
+    if args.comando == 'list':
+        for versao in list_versions():
+            print(f"{versao['version']}  {versao['created_at']}  {versao['rows']:>10,} linhas "
+                  f"({versao['new_rows']:,} novas)  {versao['label'] or ''}")
+    elif args.comando == 'save':
+        from zomato import parallel
+        df, agregados, _ = parallel.load_data(args.csv)
+        versao = save_snapshot(df, agregados, label=args.label or args.csv)
+        print(f"{versao['version']}: {versao['rows']:,} linhas ({versao['new_rows']:,} novas)")
+    else:
+        with pd.option_context('display.width', 200, 'display.max_columns', 30):
+            print(compare(args.antes, args.depois, args.level))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,526 @@
+"""
+Armazenamento em SQLite, com consultas filtradas no banco.
+
+O dataset tratado (o mesmo de `zomato.parallel.load_data`) é gravado em um
+banco SQLite embutido (`ingest`), com:
+- a tabela `restaurants`, uma linha por restaurante; `position` é a posição
+  no DataFrame tratado (desempate estável das ordenações, como em
+  `zomato.paging`) e `country_code` o código do país
+- índices em restaurant_id, código do país (com a nota), cidade, culinária
+  e nota
+- a tabela `meta`, com o hash do CSV de origem (`zomato.cache.source_hash`)
+  e a versão do esquema (`SCHEMA_VERSION`)
+
+As páginas leem o banco por consultas parametrizadas (filtros de país,
+culinária e nota, ordenação e LIMIT/OFFSET no SQL), por um pool pequeno de
+conexões somente leitura compartilhado entre as sessões do Streamlit. Cada
+consulta traz só as linhas do resultado.
+
+O banco vem da variável ZOMATO_DB (vazia, o padrão, mantém tudo em pandas) e
+o tamanho do pool de ZOMATO_DB_POOL (padrão 4).
+
+Uso pela linha de comando:
+    python -m zomato.storage --db dataset/zomato.sqlite ingest
+    python -m zomato.storage --db dataset/zomato.sqlite info
+"""
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from zomato import cache, pipeline
+
+# Banco SQLite; vazio mantém os dados em pandas
+DB_PATH = os.environ.get('ZOMATO_DB', '')
+
+# Conexões somente leitura por banco
+POOL_SIZE = int(os.environ.get('ZOMATO_DB_POOL', '4'))
+
+# Índices: nome -> (tabela, colunas). Cada chave de ordenação tem um índice
+# global e um por país já na ordem da tabela paginada (chave, position)
+INDICES = {
+    'idx_restaurant_id': ('restaurants', 'restaurant_id'),
+    'idx_country_code': ('restaurants', 'country_code, aggregate_rating DESC, position'),
+    'idx_country_votes': ('restaurants', 'country_code, votes DESC, position'),
+    'idx_country_cost': ('restaurants', 'country_code, average_cost_for_two DESC, position'),
+    'idx_city': ('restaurants', 'country, city'),
+    'idx_cuisines': ('restaurants', 'cuisines, aggregate_rating DESC, position'),
+    'idx_rating': ('restaurants', 'aggregate_rating DESC, position'),
+    'idx_votes': ('restaurants', 'votes DESC, position'),
+    'idx_cost': ('restaurants', 'average_cost_for_two DESC, position'),
+}
+
+# Versão das tabelas gravadas; bancos de outra versão são regravados
+# (2: anomaly_flags; 3: sem a tabela restaurant_cuisines, que nenhuma consulta usava)
+SCHEMA_VERSION = '3'
+
+# Colunas aceitas em ordenações (as demais consultas validam pelas colunas da tabela)
+SORT_COLUMNS = ('aggregate_rating', 'votes', 'average_cost_for_two')
+
+# Código de cada nome de país; os códigos desconhecidos do CSV (país
+# "Unknown") ficam todos com 0, para que o filtro por país os encontre
+CODIGOS_PAISES = {nome: codigo for codigo, nome in pipeline.COUNTRIES.items()}
+CODIGOS_PAISES['Unknown'] = 0
+
+_pools_lock = threading.Lock()
+
+# Pools abertos: caminho -> ConnectionPool
+_pools = {}
+
+
+def ingest(path=None, db_path=None, df=None):
+    """
+    Grava o dataset tratado em um banco SQLite novo.
+
+    O banco é montado em um arquivo temporário e só substitui o anterior
+    quando está completo (índices e estatísticas do planejador incluídos).
+
+    Parameters
+    ----------
+    path : str, optional
+        CSV de origem. Usa `zomato.pipeline.DATASET_PATH` quando omitido.
+    db_path : str, optional
+        Banco de destino. Usa `DB_PATH` quando omitido.
+    df : pandas.DataFrame, optional
+        Dataset já tratado a partir de `path` (evita tratar o CSV de novo).
+
+    Returns
+    -------
+    int
+        Quantidade de restaurantes gravados.
+    """
+    from zomato import parallel
+
+    path = path or pipeline.DATASET_PATH
+    db_path = db_path or DB_PATH
+    if df is None:
+        df, _, _ = parallel.load_data(path)
+
+    tabela = df.assign(position=range(len(df)), country_code=df['country'].map(CODIGOS_PAISES))
+
+    temporario = f'{db_path}.{os.getpid()}.tmp'
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    if os.path.exists(temporario):
+        os.remove(temporario)
+    conexao = sqlite3.connect(temporario)
+    try:
+        tabela.to_sql('restaurants', conexao, index=False, chunksize=50_000)
+        for nome, (alvo, colunas) in INDICES.items():
+            conexao.execute(f'CREATE INDEX {nome} ON {alvo} ({colunas})')
+        pd.DataFrame({
+            'key': ['source', 'source_hash', 'rows', 'created', 'schema'],
+            'value': [path, cache.source_hash(path), str(len(df)), str(time.time()), SCHEMA_VERSION],
+        }).to_sql('meta', conexao, index=False)
+        conexao.execute('ANALYZE')
+        conexao.commit()
+    finally:
+        conexao.close()
+    os.replace(temporario, db_path)
+    return len(df)
+
+
+def metadata(db_path=None):
+    """Conteúdo da tabela `meta` (dicionário vazio quando o banco não existe)."""
+    db_path = db_path or DB_PATH
+    if not db_path or not os.path.exists(db_path):
+        return {}
+    conexao = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+    try:
+        return dict(conexao.execute('SELECT key, value FROM meta').fetchall())
+    except sqlite3.DatabaseError:
+        return {}
+    finally:
+        conexao.close()
+
+
+def is_current(path=None, db_path=None):
+    """True quando o banco foi gerado a partir do conteúdo atual do CSV, com o esquema atual."""
+    path = path or pipeline.DATASET_PATH
+    meta = metadata(db_path)
+    return meta.get('schema') == SCHEMA_VERSION and meta.get('source_hash') == cache.source_hash(path)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões somente leitura com um banco SQLite.
+
+    As conexões são abertas sob demanda, até `size` (contando as
+    emprestadas), e podem ser usadas por qualquer thread (uma de cada vez).
+    Quem pede uma conexão com todas em uso espera até uma ser devolvida.
+
+    Parameters
+    ----------
+    path : str
+        Caminho do banco.
+    size : int, optional
+        Quantidade máxima de conexões.
+    """
+
+    def __init__(self, path, size=POOL_SIZE):
+        self.path = path
+        self.size = size
+        self._livres = []
+        self._abertas = 0
+        # `close` troca a geração: conexões de gerações anteriores são fechadas na devolução
+        self._geracao = 0
+        self._condicao = threading.Condition()
+        self._colunas = None
+
+    def _abrir(self):
+        """Abre uma conexão somente leitura."""
+        conexao = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True, check_same_thread=False)
+        conexao.execute('PRAGMA query_only = 1')
+        return conexao
+
+    def _emprestar(self, timeout):
+        """Retorna (conexão, geração), abrindo uma conexão nova quando há vaga."""
+        fim = None if timeout is None else time.monotonic() + timeout
+        with self._condicao:
+            while not self._livres and self._abertas >= self.size:
+                restante = None if fim is None else fim - time.monotonic()
+                if restante is not None and restante <= 0:
+                    raise TimeoutError(f'nenhuma conexão livre em {timeout} s')
+                self._condicao.wait(restante)
+            geracao = self._geracao
+            if self._livres:
+                return self._livres.pop(), geracao
+            self._abertas += 1
+        try:
+            return self._abrir(), geracao
+        except Exception:
+            with self._condicao:
+                self._abertas -= 1
+                self._condicao.notify()
+            raise
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """Empresta uma conexão do pool (uso: `with pool.connection() as conexao`)."""
+        conexao, geracao = self._emprestar(timeout)
+        try:
+            yield conexao
+        finally:
+            with self._condicao:
+                atual = geracao == self._geracao
+                if atual:
+                    self._livres.append(conexao)
+                else:
+                    self._abertas -= 1
+                self._condicao.notify()
+            if not atual:
+                conexao.close()
+
+    def query(self, sql, params=()):
+        """Executa uma consulta parametrizada e retorna só as linhas do resultado."""
+        with self.connection() as conexao:
+            return pd.read_sql_query(sql, conexao, params=list(params))
+
+    def columns(self):
+        """Colunas da tabela `restaurants`."""
+        if self._colunas is None:
+            with self.connection() as conexao:
+                self._colunas = [linha[1] for linha in conexao.execute('PRAGMA table_info(restaurants)')]
+        return self._colunas
+
+    def close(self):
+        """
+        Fecha as conexões livres; as emprestadas são fechadas quando voltarem.
+
+        O pool continua utilizável: os próximos pedidos abrem conexões novas
+        (por exemplo com o banco regravado), sem passar de `size` no total.
+        """
+        with self._condicao:
+            self._geracao += 1
+            livres, self._livres = self._livres, []
+            self._abertas -= len(livres)
+            self._colunas = None
+            self._condicao.notify_all()
+        for conexao in livres:
+            conexao.close()
+
+
+def get_pool(db_path=None, size=POOL_SIZE):
+    """Pool compartilhado do banco (um por caminho e processo)."""
+    db_path = db_path or DB_PATH
+    with _pools_lock:
+        if db_path not in _pools:
+            _pools[db_path] = ConnectionPool(db_path, size)
+        return _pools[db_path]
+
+
+def _check_columns(pool, columns):
+    """Garante que as colunas existem antes de entrarem no texto do SQL."""
+    desconhecidas = [coluna for coluna in columns if coluna not in pool.columns()]
+    if desconhecidas:
+        raise ValueError(f'Colunas desconhecidas: {desconhecidas}')
+    return ', '.join(f'"{coluna}"' for coluna in columns)
+
+
+def _where(country=None, cuisines=None, min_rating=None, max_rating=None, exclude_anomalies=False):
+    """Cláusula WHERE e parâmetros dos filtros das páginas."""
+    condicoes, parametros = [], []
+    if exclude_anomalies:
+        condicoes.append('anomaly_flags = 0')
+    if country is not None:
+        # País pelo código: usa o índice (country_code, aggregate_rating)
+        condicoes.append('country_code = ?')
+        parametros.append(CODIGOS_PAISES.get(country, -1))
+    if cuisines:
+        condicoes.append(f'cuisines IN ({", ".join("?" * len(cuisines))})')
+        parametros.extend(cuisines)
+    if min_rating is not None:
+        condicoes.append('aggregate_rating >= ?')
+        parametros.append(min_rating)
+    if max_rating is not None:
+        condicoes.append('aggregate_rating <= ?')
+        parametros.append(max_rating)
+    return (' WHERE ' + ' AND '.join(condicoes) if condicoes else ''), parametros
+
+
+def count(pool, country=None, cuisines=None, min_rating=None, max_rating=None):
+    """Quantidade de restaurantes do filtro."""
+    where, parametros = _where(country, cuisines, min_rating, max_rating)
+    with pool.connection() as conexao:
+        return conexao.execute(f'SELECT COUNT(*) FROM restaurants{where}', parametros).fetchone()[0]
+
+
+def distinct(pool, column, country=None):
+    """
+    Valores distintos (não nulos) de uma coluna, em ordem crescente.
+
+    Parameters
+    ----------
+    pool : ConnectionPool
+        Pool do banco.
+    column : str
+        Coluna da tabela `restaurants` (por exemplo 'country' ou 'city').
+    country : str, optional
+        Considera só os restaurantes deste país.
+
+    Returns
+    -------
+    list
+        Os valores distintos.
+    """
+    nome = _check_columns(pool, [column])
+    where, parametros = _where(country)
+    filtro = f'{where} AND {nome} IS NOT NULL' if where else f' WHERE {nome} IS NOT NULL'
+    with pool.connection() as conexao:
+        linhas = conexao.execute(f'SELECT DISTINCT {nome} FROM restaurants{filtro} ORDER BY {nome}', parametros)
+        return [linha[0] for linha in linhas]
+
+
+def count_anomalies(pool):
+    """Quantidade de restaurantes com alguma anomalia (`anomaly_flags` > 0)."""
+    with pool.connection() as conexao:
+        return conexao.execute('SELECT COUNT(*) FROM restaurants WHERE anomaly_flags > 0').fetchone()[0]
+
+
+def anomaly_counts(pool):
+    """
+    Restaurantes por combinação de anomalias, para `zomato.anomalies.summarize`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Colunas 'anomaly_flags' e 'restaurants', uma linha por valor distinto.
+    """
+    return pool.query('SELECT anomaly_flags, COUNT(*) AS restaurants FROM restaurants GROUP BY anomaly_flags')
+
+
+def select(pool, columns, country=None, city=None):
+    """
+    Linhas de um país (e cidade), na ordem do DataFrame tratado.
+
+    Usado pelo mapa da Home no modo banco: só as linhas do filtro são lidas.
+
+    Parameters
+    ----------
+    pool : ConnectionPool
+        Pool do banco.
+    columns : list of str
+        Colunas lidas.
+    country : str, optional
+        País (None = todos).
+    city : str, optional
+        Cidade (None = todas).
+
+    Returns
+    -------
+    pandas.DataFrame
+        As colunas pedidas, indexadas pela posição no DataFrame tratado.
+    """
+    lista = _check_columns(pool, columns)
+    where, parametros = _where(country)
+    if city is not None:
+        where = f'{where} AND city = ?' if where else ' WHERE city = ?'
+        parametros.append(city)
+    resultado = pool.query(f'SELECT position, {lista} FROM restaurants{where} ORDER BY position', parametros)
+    return resultado.set_index('position').rename_axis(None)
+
+
+def cuisine_ratings(pool):
+    """
+    Nota média de cada culinária (notas nulas ficam fora), como no `groupby().mean()` do pandas.
+
+    As notas têm uma casa decimal, então a soma é feita em décimos inteiros:
+    o `AVG` do SQLite soma os floats em outra ordem que o pandas, e a média
+    arredondada para exibição chegava a mudar de 3.9 para 4.0.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Colunas 'cuisines' e 'aggregate_rating', uma linha por culinária, em
+        ordem alfabética.
+    """
+    somas = pool.query('SELECT cuisines, SUM(ROUND(aggregate_rating * 10)) AS decimos, '
+                       'COUNT(aggregate_rating) AS notas FROM restaurants '
+                       'WHERE cuisines IS NOT NULL GROUP BY cuisines ORDER BY cuisines')
+    with np.errstate(invalid='ignore'):
+        medias = somas['decimos'].to_numpy(dtype='float64') / 10 / somas['notas'].to_numpy()
+    return pd.DataFrame({'cuisines': somas['cuisines'], 'aggregate_rating': medias})
+
+
+def empty_frame(pool, columns):
+    """
+    DataFrame vazio com as colunas pedidas e os tipos declarados no banco.
+
+    Os blocos do `read_sql_query` inferem o tipo pelos valores de cada bloco
+    (inteiros com nulos viram float, colunas só com nulos viram object); os
+    tipos declarados na tabela valem para todos os blocos.
+    """
+    _check_columns(pool, columns)
+    with pool.connection() as conexao:
+        declarados = {linha[1]: linha[2] for linha in conexao.execute('PRAGMA table_info(restaurants)')}
+    tipos = {'INTEGER': 'Int64', 'REAL': 'float64'}
+    return pd.DataFrame({coluna: pd.Series(dtype=tipos.get(declarados[coluna], 'object')) for coluna in columns})
+
+
+def iter_chunks(pool, columns, country=None, min_rating=None, max_rating=None, chunk_rows=50_000):
+    """
+    Percorre as linhas do filtro em blocos, da maior nota para a menor.
+
+    A ordem é a da exportação da página (nota decrescente, empates pela
+    posição, notas nulas no final). A conexão fica emprestada até o fim da
+    iteração, e só um bloco fica em memória de cada vez.
+
+    Yields
+    ------
+    pandas.DataFrame
+        Um bloco com no máximo `chunk_rows` linhas e as colunas pedidas.
+    """
+    lista = _check_columns(pool, columns)
+    where, parametros = _where(country, min_rating=min_rating, max_rating=max_rating)
+    with pool.connection() as conexao:
+        yield from pd.read_sql_query(
+            f'SELECT {lista} FROM restaurants{where} ORDER BY aggregate_rating DESC, position',
+            conexao, params=parametros, chunksize=chunk_rows
+        )
+
+
+def top_restaurants(pool, columns, n=10, country=None, cuisines=None, exclude_anomalies=False):
+    """
+    Os `n` restaurantes de maior nota do filtro.
+
+    Empates ficam na ordem do DataFrame tratado, como em `DataFrame.nlargest`.
+    Com `exclude_anomalies`, restaurantes com `anomaly_flags` ficam de fora.
+
+    Returns
+    -------
+    pandas.DataFrame
+        As colunas pedidas, indexadas pela posição no DataFrame tratado.
+    """
+    lista = _check_columns(pool, columns)
+    where, parametros = _where(country, cuisines, exclude_anomalies=exclude_anomalies)
+    resultado = pool.query(
+        f'SELECT position, {lista} FROM restaurants{where} ORDER BY aggregate_rating DESC, position LIMIT ?',
+        parametros + [int(n)]
+    )
+    return resultado.set_index('position').rename_axis(None)
+
+
+def best_by_cuisine(pool, columns, n=5, country=None, cuisines=None, exclude_anomalies=False):
+    """
+    O restaurante de maior nota de cada culinária, para as `n` melhores culinárias.
+
+    Empates de nota entre culinárias ficam em ordem alfabética, como no
+    `groupby` + `nlargest` do pandas. Com `exclude_anomalies`, restaurantes
+    com `anomaly_flags` ficam de fora.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma linha por culinária, da maior nota para a menor.
+    """
+    lista = _check_columns(pool, columns)
+    where, parametros = _where(country, cuisines, exclude_anomalies=exclude_anomalies)
+    return pool.query(
+        f'SELECT {lista} FROM ('
+        f'  SELECT *, ROW_NUMBER() OVER (PARTITION BY cuisines ORDER BY aggregate_rating DESC, position) AS ordem'
+        f'  FROM restaurants{where}'
+        f') WHERE ordem = 1 ORDER BY aggregate_rating DESC, cuisines LIMIT ?',
+        parametros + [int(n)]
+    )
+
+
+def get_page(pool, columns, key, page, page_size, country=None, cuisines=None, ascending=False):
+    """
+    Linhas de uma página da tabela ordenada, com LIMIT/OFFSET no banco.
+
+    A ordem é a mesma de `zomato.paging.filtered_order`: decrescente pela
+    chave com empates pela posição, ou exatamente o inverso quando
+    `ascending`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        No máximo `page_size` linhas, indexadas pela posição no ranking
+        (começando em 1).
+    """
+    if key not in SORT_COLUMNS:
+        raise ValueError(f'Chave de ordenação desconhecida: {key}')
+    lista = _check_columns(pool, columns)
+    where, parametros = _where(country, cuisines)
+    direcao = 'ASC' if ascending else 'DESC'
+    desempate = 'DESC' if ascending else 'ASC'
+    inicio = (page - 1) * page_size
+    pagina = pool.query(
+        f'SELECT {lista} FROM restaurants{where} ORDER BY "{key}" {direcao}, position {desempate} LIMIT ? OFFSET ?',
+        parametros + [int(page_size), int(inicio)]
+    )
+    return pagina.set_axis(pd.RangeIndex(inicio + 1, inicio + 1 + len(pagina)), axis=0)
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Grava e inspeciona o banco SQLite do dashboard.')
+    parser.add_argument('--db', default=DB_PATH or 'dataset/zomato.sqlite', help='banco (padrão: ZOMATO_DB)')
+    comandos = parser.add_subparsers(dest='comando', required=True)
+    gravar = comandos.add_parser('ingest', help='grava o dataset tratado no banco')
+    gravar.add_argument('csv', nargs='?', default=None, help='CSV de origem (padrão: ZOMATO_DATASET)')
+    comandos.add_parser('info', help='mostra a origem e os índices do banco')
+    args = parser.parse_args()
+
+    if args.comando == 'ingest':
+        inicio = time.perf_counter()
+        linhas = ingest(args.csv, args.db)
+        print(f'{linhas} restaurantes gravados em {args.db} em {time.perf_counter() - inicio:.1f} s')
+    else:
+        meta = metadata(args.db)
+        if not meta:
+            print(f'{args.db}: banco inexistente ou inválido')
+            return
+        print(f"{args.db}: {meta['rows']} restaurantes de {meta['source']} "
+              f"({os.path.getsize(args.db) / 1024 ** 2:.1f} MB)")
+        print('atualizado' if is_current(meta['source'], args.db) else 'desatualizado em relação ao CSV')
+        for nome, (tabela, colunas) in INDICES.items():
+            print(f'  {nome}: {tabela} ({colunas})')
+
+
+if __name__ == '__main__':
+    main()
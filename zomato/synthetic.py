@@ -0,0 +1,66 @@
+"""
+Geração de datasets sintéticos a partir do CSV de amostra.
+
+Usado pelos benchmarks para simular arquivos com milhões de linhas mantendo
+a distribuição de países, cidades e culinárias do dataset original.
+"""
+import numpy as np
+
+
+def scale_raw(raw, n_rows, seed=0, duplicate_ratio=0.05):
+    """
+    Gera um DataFrame bruto com `n_rows` linhas sorteadas de `raw`.
+
+    Cada linha recebe um novo `Restaurant ID` único, exceto uma fração
+    `duplicate_ratio` que repete o ID de outra linha (como no CSV original).
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos de amostra.
+    n_rows : int
+        Quantidade de linhas do dataset gerado.
+    seed : int, optional
+        Semente do gerador aleatório.
+    duplicate_ratio : float, optional
+        Fração de linhas com `Restaurant ID` repetido.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Dados brutos sintéticos, com as mesmas colunas de `raw`.
+    """
+    rng = np.random.default_rng(seed)
+    linhas = rng.integers(0, len(raw), size=n_rows)
+    df = raw.iloc[linhas].reset_index(drop=True)
+
+    ids = np.arange(1, n_rows + 1, dtype='int64')
+    duplicadas = rng.random(n_rows) < duplicate_ratio
+    ids[duplicadas] = rng.integers(1, n_rows + 1, size=int(duplicadas.sum()))
+    df['Restaurant ID'] = ids
+    return df
+
+
+def write_scaled_csv(raw, n_rows, path, seed=0):
+    """
+    Grava em `path` um CSV sintético com `n_rows` linhas.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos de amostra.
+    n_rows : int
+        Quantidade de linhas do dataset gerado.
+    path : str
+        Caminho do CSV de saída.
+    seed : int, optional
+        Semente do gerador aleatório.
+
+    Returns
+    -------
+    str
+        O próprio `path`, para encadear chamadas.
+    """
+    scale_raw(raw, n_rows, seed=seed).to_csv(path, index=False)
+    return path
+
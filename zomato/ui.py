@@ -0,0 +1,351 @@
+"""
+Funções do Streamlit compartilhadas entre `Home.py` e as páginas.
+
+Os dados tratados e as agregações são calculados uma única vez por processo
+(`st.cache_resource`) e compartilhados, sem cópias, por todas as sessões e
+páginas. As páginas não devem alterar esses objetos no lugar.
+
+Cada artefato também passa pelo cache em disco de `zomato.cache`, com chave
+pelo hash do CSV e do código que o calcula: um processo reiniciado (ou outra
+réplica com a mesma pasta) carrega os resultados sem recalcular.
+"""
+import os
+import tempfile
+
+import streamlit as st
+
+from zomato import (brands, cache, cooccurrence, distributions, export, features, paging, parallel, pipeline,
+                    regression, rollups, services, similarity, snapshots, storage, validation)
+
+# Guarda cada carga como versão em `zomato.snapshots` (variável ZOMATO_SNAPSHOT_ON_LOAD)
+SNAPSHOT_ON_LOAD = os.environ.get('ZOMATO_SNAPSHOT_ON_LOAD', '1') == '1'
+
+
+# Módulos de que o dataset tratado depende (a lista fica em `zomato.cache`, usada também pelo mapa)
+MODULOS_TRATAMENTO = cache.MODULOS_TRATAMENTO
+
+
+def _cached(nome, construir, *modulos):
+    """Artefato derivado do CSV atual, pelo cache em disco de `zomato.cache`."""
+    versao = cache.code_version(*MODULOS_TRATAMENTO, *modulos)
+    return cache.get_or_build(nome, versao, construir, source=pipeline.DATASET_PATH)
+
+
+@st.cache_resource(show_spinner='Carregando dados...')
+def _load():
+    """Lê, valida e trata os dados uma única vez por processo."""
+    df, agregados, relatorio = _cached('load_data', parallel.load_data)
+    if SNAPSHOT_ON_LOAD:
+        # Sem mudanças no conteúdo, a última versão é reaproveitada
+        snapshots.save_snapshot(df, agregados, label=pipeline.DATASET_PATH)
+    return df, agregados, relatorio
+
+
+def load_dataset():
+    """
+    Carrega o dataset tratado e as agregações por país/cidade.
+
+    O número de processos usados no tratamento vem da variável de ambiente
+    ZOMATO_WORKERS (padrão 1, sem paralelismo).
+
+    O DataFrame fica em memória no processo até ele terminar, também com o
+    banco SQLite (ZOMATO_DB). Com o banco, a Home e as páginas Países e
+    Cuisines não chamam esta função (usam `load_aggregates` e consultas), e
+    os artefatos derivados são montados sem ela; Cidades, Semelhantes e
+    Versões ainda leem o DataFrame inteiro e o mantêm no processo que as
+    exibir.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, dict of pandas.DataFrame)
+        O DataFrame tratado e os agregados de `zomato.parallel`.
+    """
+    df, agregados, _ = _load()
+    return df, agregados
+
+
+@st.cache_resource(show_spinner='Carregando dados...')
+def _load_summaries():
+    """Agregados e relatório de validação sem manter o DataFrame (modo banco)."""
+    _, agregados, relatorio = _cached('load_data', parallel.load_data)
+    return agregados, relatorio
+
+
+def load_aggregates():
+    """
+    Retorna só os agregados por país/cidade de `zomato.parallel`.
+
+    Com o banco SQLite (ZOMATO_DB), o DataFrame lido do cache em disco é
+    descartado e só os agregados ficam em memória.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Os agregados de `zomato.parallel`.
+    """
+    return _load_summaries()[0] if storage.DB_PATH else _load()[1]
+
+
+def _dataset_for_build():
+    """
+    DataFrame tratado para montar um artefato do cache em disco.
+
+    Com o banco SQLite (ZOMATO_DB), as páginas que leem o banco não mantêm o
+    DataFrame em memória: ele é lido do cache em disco só durante a montagem
+    e descartado depois. Sem o banco, usa o DataFrame já carregado.
+    """
+    if storage.DB_PATH:
+        return _cached('load_data', parallel.load_data)[0]
+    return load_dataset()[0]
+
+
+def load_quality_report():
+    """
+    Retorna o relatório de validação da última carga dos dados.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Violações por regra, como em `zomato.validation.summarize`.
+    """
+    return _load_summaries()[1] if storage.DB_PATH else _load()[2]
+
+
+@st.cache_resource(show_spinner=False)
+def load_locality_rollup():
+    """
+    Retorna as tabelas de drill-down país -> cidade -> localidade.
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Resultado de `zomato.rollups.build_locality_rollup`.
+    """
+    return _cached('locality_rollup', lambda: rollups.build_locality_rollup(_dataset_for_build()), rollups)
+
+
+@st.cache_resource(show_spinner=False)
+def load_distributions():
+    """
+    Retorna as contagens por grupo e bucket de nota, preço e avaliações.
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.distributions.build_distributions`.
+    """
+    return _cached('distributions', lambda: distributions.build_distributions(_dataset_for_build()), distributions)
+
+
+@st.cache_resource(show_spinner=False)
+def load_rate_tables():
+    """
+    Retorna os numeradores e denominadores de entrega e reserva por grupo.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Resultado de `zomato.services.build_rate_tables`.
+    """
+    return _cached('rate_tables', lambda: services.build_rate_tables(_dataset_for_build()), services)
+
+
+@st.cache_resource(show_spinner=False)
+def load_country_features():
+    """
+    Retorna a matriz de características por país da página de comparação.
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.features.build_country_features`.
+    """
+    return _cached('country_features', lambda: features.build_country_features(_dataset_for_build()),
+                   features, distributions, services)
+
+
+@st.cache_resource(show_spinner=False)
+def load_regression_stats():
+    """
+    Retorna as estatísticas suficientes de preço x nota/avaliações por cidade.
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.regression.build_regression_stats`.
+    """
+    return _cached('regression_stats', lambda: regression.build_regression_stats(_dataset_for_build()), regression, distributions)
+
+
+@st.cache_resource(show_spinner=False)
+def load_cuisine_incidence():
+    """
+    Retorna a matriz de incidência restaurante x culinária (esparsa).
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.cooccurrence.build_incidence`.
+    """
+    return _cached('cuisine_incidence', lambda: cooccurrence.build_incidence(_dataset_for_build()),
+                   cooccurrence, similarity)
+
+
+@st.cache_resource(show_spinner=False)
+def load_brand_table():
+    """
+    Retorna o resumo das marcas (`brand_id`) por país.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Resultado de `zomato.brands.build_brand_table`.
+    """
+    return _cached('brand_table', lambda: brands.build_brand_table(_dataset_for_build()), brands)
+
+
+@st.cache_resource(show_spinner=False)
+def load_sort_index():
+    """
+    Retorna as ordens pré-calculadas para a tabela paginada.
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.paging.build_sort_index`.
+    """
+    return _cached('sort_index', lambda: paging.build_sort_index(_dataset_for_build()), paging)
+
+
+@st.cache_resource(show_spinner='Calculando restaurantes semelhantes...')
+def load_similarity_index():
+    """
+    Retorna os restaurantes mais semelhantes de cada restaurante.
+
+    Calculado só na primeira visita à página de semelhantes.
+
+    Returns
+    -------
+    dict
+        Resultado de `zomato.similarity.build_similarity_index`.
+    """
+    return _cached('similarity_index', lambda: similarity.build_similarity_index(_dataset_for_build()), similarity)
+
+
+@st.cache_resource(show_spinner='Gravando o banco SQLite...')
+def load_storage():
+    """
+    Retorna o pool de conexões do banco SQLite, quando configurado.
+
+    Com a variável ZOMATO_DB vazia (padrão) as páginas usam o DataFrame em
+    memória. O banco é regravado quando o CSV muda, sem manter o DataFrame
+    usado na gravação; é nesse momento que a versão dos dados é guardada em
+    `zomato.snapshots` (as páginas que leem o banco não passam por `_load`).
+
+    Returns
+    -------
+    zomato.storage.ConnectionPool or None
+        Pool compartilhado por todas as sessões, ou None sem banco.
+    """
+    if not storage.DB_PATH:
+        return None
+    if not storage.is_current():
+        df, agregados, _ = _cached('load_data', parallel.load_data)
+        storage.ingest(df=df)
+        if SNAPSHOT_ON_LOAD:
+            snapshots.save_snapshot(df, agregados, label=pipeline.DATASET_PATH)
+        del df
+        # Conexões abertas antes da regravação ainda apontam para o arquivo antigo
+        storage.get_pool().close()
+    return storage.get_pool()
+
+
+@st.cache_resource(show_spinner=False)
+def load_snapshot_aggregates(version):
+    """
+    Lê os agregados de uma versão guardada (versões não mudam depois de gravadas).
+
+    Returns
+    -------
+    dict of pandas.DataFrame
+        Resultado de `zomato.snapshots.load_aggregates`.
+    """
+    return snapshots.load_aggregates(version)
+
+
+def _download(gerar_blocos, total, nome, key, schema):
+    """
+    Escolha de formato e download dos blocos de `gerar_blocos()`, gerados só a pedido.
+
+    `schema` (`zomato.export.schema_for`) mantém o cabeçalho e os tipos
+    mesmo quando o filtro não tem nenhuma linha.
+
+    O `st.download_button` só aceita o conteúdo inteiro (bytes ou um arquivo
+    que ele lê por completo): o arquivo pronto fica em memória enquanto o
+    botão existir, e o tamanho aparece ao lado do botão.
+    """
+    col1, col2 = st.columns([1, 3])
+    formato = col1.selectbox('Formato', export.available_formats(), key=f'{key}_formato',
+                             label_visibility='collapsed')
+    if col2.button(f'Preparar exportação ({total:,} linhas)', key=f'{key}_preparar'):
+        extensao, mime = export.FORMATOS[formato]
+        with tempfile.TemporaryFile() as arquivo:
+            export.write(gerar_blocos(), formato, arquivo, schema)
+            tamanho = arquivo.tell()
+            arquivo.seek(0)
+            col2.download_button(f'Baixar {nome}.{extensao} ({tamanho / 2**20:,.1f} MB)', data=arquivo.read(),
+                                 file_name=f'{nome}.{extensao}', mime=mime, key=f'{key}_baixar')
+
+
+def download_buttons(df, posicoes, nome, key, columns=None):
+    """
+    Mostra a escolha de formato e o download de um recorte de `df`.
+
+    O arquivo só é gerado quando o usuário pede, em blocos e direto para um
+    arquivo temporário (`zomato.export`), sem montar uma cópia do recorte.
+    O download em si não é em blocos: o Streamlit não transmite arquivos, e
+    o botão guarda o arquivo pronto em memória (o tamanho aparece no botão).
+    Recortes muito grandes devem sair pela linha de comando
+    (`python -m zomato.export`).
+
+    Parameters
+    ----------
+    df : pandas.DataFrame
+        Dados de origem (o DataFrame compartilhado ou uma tabela pequena).
+    posicoes : numpy.ndarray
+        Posições das linhas exportadas, na ordem de saída.
+    nome : str
+        Nome do arquivo, sem extensão.
+    key : str
+        Prefixo das chaves dos widgets.
+    columns : list of str, optional
+        Colunas exportadas. Usa `zomato.export.EXPORT_COLUMNS` quando omitido.
+    """
+    schema = export.schema_for(df.iloc[:0][columns or export.EXPORT_COLUMNS])
+    _download(lambda: export.iter_chunks(df, posicoes, columns), len(posicoes), nome, key, schema)
+
+
+def download_query_buttons(pool, nome, key, columns, country=None, min_rating=None, max_rating=None):
+    """
+    Como `download_buttons`, com as linhas lidas do banco SQLite em blocos.
+
+    As linhas saem na ordem de `zomato.storage.iter_chunks` (maiores notas
+    primeiro), sem passar pelo DataFrame em memória.
+
+    Parameters
+    ----------
+    pool : zomato.storage.ConnectionPool
+        Pool do banco.
+    nome, key : str
+        Nome do arquivo (sem extensão) e prefixo das chaves dos widgets.
+    columns : list of str
+        Colunas exportadas.
+    country : str, optional
+        País do filtro (None = todos).
+    min_rating, max_rating : float, optional
+        Limites (inclusivos) da nota.
+    """
+    total = storage.count(pool, country, min_rating=min_rating, max_rating=max_rating)
+    schema = export.schema_for(storage.empty_frame(pool, columns))
+    _download(lambda: storage.iter_chunks(pool, columns, country, min_rating, max_rating), total, nome, key,
+              schema)
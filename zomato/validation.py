@@ -0,0 +1,172 @@
+"""
+Validação de qualidade dos dados brutos antes do tratamento.
+
+Cada regra é uma verificação vetorizada sobre o DataFrame bruto que devolve
+uma máscara booleana com as linhas que a violam. As linhas com pelo menos
+uma violação são removidas do dashboard e gravadas em um arquivo Parquet de
+quarentena, junto com a lista de regras violadas.
+
+Regras:
+- latitude entre -90 e 90 e longitude entre -180 e 180
+- nota (`Aggregate rating`) numérica entre 0 e 5
+- `Rating color` coerente com `Rating text`
+- `Country Code` conhecido
+- custo para dois (`Average Cost for two`) numérico e não negativo
+"""
+import os
+
+import numpy as np
+import pandas as pd
+
+from zomato.pipeline import COUNTRIES
+
+# Caminho padrão do arquivo de quarentena; pode ser trocado pela variável ZOMATO_QUARANTINE
+QUARANTINE_PATH = os.environ.get('ZOMATO_QUARANTINE', 'dataset/quarantine.parquet')
+
+# Cor esperada para cada texto de avaliação (o Zomato traduz o texto por país)
+RATING_TEXT_COLORS = {
+    'Excellent': '3F7E00', 'Excelente': '3F7E00', 'Eccellente': '3F7E00', 'Harika': '3F7E00',
+    'Skvělé': '3F7E00', 'Terbaik': '3F7E00', 'Vynikajúce': '3F7E00', 'Wybitnie': '3F7E00',
+    'Very Good': '5BA829', 'Muito Bom': '5BA829', 'Muito bom': '5BA829', 'Muy Bueno': '5BA829',
+    'Bardzo dobrze': '5BA829', 'Sangat Baik': '5BA829', 'Velmi dobré': '5BA829',
+    'Veľmi dobré': '5BA829', 'Çok iyi': '5BA829',
+    'Good': '9ACD32', 'Baik': '9ACD32', 'Bom': '9ACD32', 'Bueno': '9ACD32', 'Buono': '9ACD32',
+    'Skvělá volba': '9ACD32', 'İyi': '9ACD32',
+    'Average': ('CDD614', 'FFBA00'), 'Biasa': ('CDD614', 'FFBA00'),
+    'Poor': 'FF7800',
+    'Not rated': 'CBCBC8', 'Not Rated': 'CBCBC8',
+}
+
+
+def _numeric(coluna):
+    """Converte a coluna para número sem copiar quando ela já é numérica."""
+    if pd.api.types.is_numeric_dtype(coluna):
+        return coluna
+    return pd.to_numeric(coluna, errors='coerce')
+
+
+def _latitude(raw):
+    latitude = _numeric(raw['Latitude'])
+    return ~latitude.between(-90, 90)
+
+
+def _longitude(raw):
+    longitude = _numeric(raw['Longitude'])
+    return ~longitude.between(-180, 180)
+
+
+def _rating(raw):
+    rating = _numeric(raw['Aggregate rating'])
+    return ~rating.between(0, 5)
+
+
+def _rating_color(raw):
+    # Compara só os pares distintos (texto, cor): fatoriza as duas colunas e
+    # consulta uma pequena tabela de pares aceitos em vez de comparar strings
+    codigos_texto, textos = pd.factorize(raw['Rating text'])
+    codigos_cor, cores = pd.factorize(raw['Rating color'])
+    aceitos = np.ones((len(textos) + 1, len(cores) + 1), dtype=bool)
+    for i, texto in enumerate(textos):
+        esperadas = RATING_TEXT_COLORS.get(texto)
+        if esperadas is not None:
+            aceitos[i, :] = False
+            aceitos[i, :-1] = cores.isin(np.atleast_1d(esperadas))
+    # Código -1 (valor ausente) cai na última linha/coluna, sempre aceita
+    return pd.Series(~aceitos[codigos_texto, codigos_cor], index=raw.index)
+
+
+def _country_code(raw):
+    return ~raw['Country Code'].isin(list(COUNTRIES))
+
+
+def _cost(raw):
+    # Custo ausente vira 0 no tratamento; só é violação se for inválido ou negativo
+    bruto = raw['Average Cost for two']
+    custo = _numeric(bruto)
+    return (custo < 0) | (custo.isna() & bruto.notna())
+
+
+# Nome da regra -> (descrição, função que devolve a máscara de violações)
+RULES = {
+    'latitude_range': ('Latitude fora do intervalo [-90, 90]', _latitude),
+    'longitude_range': ('Longitude fora do intervalo [-180, 180]', _longitude),
+    'rating_range': ('Nota ausente ou fora do intervalo [0, 5]', _rating),
+    'rating_color_text': ('Cor da avaliação incoerente com o texto da avaliação', _rating_color),
+    'country_code': ('Código de país desconhecido', _country_code),
+    'cost_non_negative': ('Custo para dois inválido ou negativo', _cost),
+}
+
+
+def check(raw):
+    """
+    Executa todas as regras sobre os dados brutos.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos lidos por `zomato.pipeline.read_raw`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Uma coluna booleana por regra de `RULES`, com o mesmo índice de
+        `raw`; True indica violação.
+    """
+    return pd.DataFrame({nome: regra(raw) for nome, (_, regra) in RULES.items()}, index=raw.index)
+
+
+def summarize(violacoes):
+    """
+    Conta as violações de cada regra.
+
+    Parameters
+    ----------
+    violacoes : pandas.DataFrame
+        Resultado de `check`.
+
+    Returns
+    -------
+    pandas.DataFrame
+        Indexado pelo nome da regra, com as colunas `description` e
+        `violations`.
+    """
+    return pd.DataFrame({
+        'description': [descricao for descricao, _ in RULES.values()],
+        'violations': violacoes.sum().to_numpy(),
+    }, index=pd.Index(list(RULES), name='rule'))
+
+
+def quarantine(raw, path=None):
+    """
+    Separa as linhas inválidas e grava essas linhas no arquivo de quarentena.
+
+    O arquivo é sempre regravado, para refletir a última carga (mesmo que
+    vazio). A coluna `violations` lista as regras violadas por cada linha.
+
+    Parameters
+    ----------
+    raw : pandas.DataFrame
+        Dados brutos lidos por `zomato.pipeline.read_raw`.
+    path : str, optional
+        Caminho do Parquet de quarentena. Usa `QUARANTINE_PATH` quando omitido.
+
+    Returns
+    -------
+    tuple of (pandas.DataFrame, pandas.DataFrame)
+        As linhas válidas de `raw` e o relatório de `summarize`.
+    """
+    violacoes = check(raw)
+    invalidas = violacoes.any(axis=1).to_numpy()
+
+    quarentena = raw[invalidas].copy()
+    nomes = np.array(list(RULES), dtype=object)
+    quarentena['violations'] = [
+        ','.join(nomes[linha]) for linha in violacoes[invalidas].to_numpy()
+    ]
+    # Colunas object podem misturar textos e números nos dados corrompidos
+    for coluna in quarentena.columns[quarentena.dtypes == object]:
+        quarentena[coluna] = quarentena[coluna].astype('string')
+    quarentena.to_parquet(path or QUARANTINE_PATH, index=False)
+
+    validas = raw[~invalidas] if invalidas.any() else raw
+    return validas, summarize(violacoes)